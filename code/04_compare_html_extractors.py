@@ -0,0 +1,73 @@
+"""
+Compare HTML Text Extraction Backends
+Time BeautifulSoup (html.parser) against the single-pass lxml extractor on a
+fixture set of saved HTML pages, and check that both produce the same text
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from scrape_webpages_to_corpus import EXTRACTORS, extract_text
+
+FIXTURE_PATH = Path(__file__).resolve().parent / 'fixtures' / 'html'
+REPEATS = 200
+
+
+print("HTML EXTRACTION BACKEND COMPARISON")
+
+print()
+
+pages = {f.name: f.read_text(encoding='utf-8') for f in sorted(FIXTURE_PATH.glob('*.html'))}
+total_kb = sum(len(html.encode('utf-8')) for html in pages.values()) / 1024
+
+print(f"Fixture pages: {len(pages)} ({total_kb:.1f} KB) from {FIXTURE_PATH}")
+print(f"Repeats: {REPEATS} passes over every page")
+print()
+
+# CHECK OUTPUT
+print("-" * 80)
+print("OUTPUT CHECK: every backend should extract the same title and text")
+print("-" * 80)
+
+reference = None
+for name in EXTRACTORS:
+    results = {page: extract_text(html, extractor=name) for page, html in pages.items()}
+    if reference is None:
+        reference_name, reference = name, results
+        continue
+    for page in pages:
+        same = results[page] == reference[page]
+        print(f"{page:<24} {name} vs {reference_name}: {'identical' if same else 'DIFFERENT'}")
+print()
+
+# TIMING
+print("-" * 80)
+print("TIMING")
+print("-" * 80)
+
+timings = {}
+for name in EXTRACTORS:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for html in pages.values():
+            extract_text(html, extractor=name)
+    timings[name] = time.perf_counter() - start
+
+    n_pages = REPEATS * len(pages)
+    print(f"{name:<6} {timings[name]:.3f} seconds | "
+          f"{1000 * timings[name] / n_pages:.3f} ms/page | "
+          f"{n_pages / timings[name]:,.0f} pages/s | "
+          f"{REPEATS * total_kb / 1024 / timings[name]:.1f} MB/s")
+print()
+
+fastest = min(timings, key=timings.get)
+slowest = max(timings, key=timings.get)
+print(f"{fastest} is {timings[slowest] / timings[fastest]:.1f}x faster than {slowest}")
+print()
+
+print("KEY INSIGHT:")
+print("- html.parser is pure Python; lxml parses in C")
+print("- Skipping unwanted elements during one tree walk avoids a find_all pass per tag")
+print("- For large scrapes, extraction (not the network) can become the bottleneck")
@@ -6,7 +6,7 @@ Purpose:
     All functions take a Corpus object as input and return structured results.
 
 Requirements:
-    pip install conc pandas
+    pip install conc pandas polars numpy
 
 Usage:
     from conc.corpus import Corpus
@@ -24,30 +24,418 @@ Author: DIGI405 Course Materials
 Date: 2026-02-24
 """
 
+import numpy as np
 import pandas as pd
-from typing import Optional, List, Dict, Union
+import polars as pl
+from typing import Optional, List, Dict, Union, Any, Tuple, Callable, Iterator
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
 import logging
 from pathlib import Path
 
+try:
+    from .corpus_store import CorpusScan, load_frequency_table, load_postings, load_token_array
+except ImportError:
+    from corpus_store import CorpusScan, load_frequency_table, load_postings, load_token_array
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
-def get_basic_metrics(corpus) -> Dict[str, Union[int, float, str]]:
+# ============================================================================
+# Cache of data derived from each corpus
+# ============================================================================
+#
+# Data derived from a corpus (token arrays, postings, lookups) is kept in a
+# small session-level LRU cache keyed by corpus path + date_created, and
+# shared by all analysis functions.  A corpus that is rebuilt gets a new
+# date_created and therefore a fresh entry.
+
+DERIVED_CACHE_SIZE = 4
+
+_derived_cache: 'OrderedDict[Tuple[str, str], Dict[str, Any]]' = OrderedDict()
+_derived_cache_lock = threading.RLock()
+_derived_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def _derived_key(corpus) -> Tuple[str, str]:
+    """Cache key for a corpus: (corpus_path, date_created from corpus.json)."""
+    path = getattr(corpus, 'corpus_path', None)
+    path = str(Path(path).resolve()) if path else str(id(corpus))
+    date_created = getattr(corpus, 'date_created', None) or ''
+    return (path, str(date_created))
+
+
+def _derived_entry(corpus) -> Dict[str, Any]:
+    """
+    Get (or create) the cache entry for a corpus.
+    
+    Each entry holds the finished values under 'values' and a Future under
+    'building' for every value that is being built.
+    """
+    key = _derived_key(_parent(corpus))
+    
+    with _derived_cache_lock:
+        entry = _derived_cache.get(key)
+        if entry is not None:
+            _derived_cache.move_to_end(key)
+            return entry
+        
+        entry = {'values': {}, 'building': {}}
+        _derived_cache[key] = entry
+        
+        while len(_derived_cache) > max(DERIVED_CACHE_SIZE, 1):
+            evicted_key, _ = _derived_cache.popitem(last=False)
+            _derived_cache_stats['evictions'] += 1
+            logger.info(f"Evicted cached data for {Path(evicted_key[0]).name}")
+        
+        return entry
+
+
+def _derived(corpus, name: str, builder: Callable[[], Any]) -> Any:
+    """
+    Get a value derived from the corpus, building it once per cache entry.
+    
+    The value is built outside the cache lock, so stages that need different
+    values (e.g. postings and token arrays) build them at the same time;
+    callers asking for a value that is already being built wait for it.
+    """
+    entry = _derived_entry(corpus)
+    
+    with _derived_cache_lock:
+        if name in entry['values']:
+            _derived_cache_stats['hits'] += 1
+            return entry['values'][name]
+        future = entry['building'].get(name)
+        is_builder = future is None
+        if is_builder:
+            future = entry['building'][name] = Future()
+            future.set_running_or_notify_cancel()
+        _derived_cache_stats['misses' if is_builder else 'hits'] += 1
+    
+    if not is_builder:
+        return future.result()
+    
+    try:
+        value = builder()
+    except BaseException as e:
+        with _derived_cache_lock:
+            entry['building'].pop(name, None)
+        future.set_exception(e)
+        raise
+    
+    with _derived_cache_lock:
+        entry['values'][name] = value
+        entry['building'].pop(name, None)
+    future.set_result(value)
+    return value
+
+
+def derived_cache_info() -> Dict[str, int]:
+    """
+    Get statistics of the derived data cache.
+    
+    Returns:
+        Dictionary with hits and misses (per derived value), evictions
+        (per corpus), size (corpora cached) and max_size
+    
+    Example:
+        >>> export_full_analysis(corpus, 'analysis_output/')
+        >>> print(derived_cache_info())
+    """
+    with _derived_cache_lock:
+        return {**_derived_cache_stats, 'size': len(_derived_cache), 'max_size': DERIVED_CACHE_SIZE}
+
+
+def clear_derived_cache():
+    """Drop all cached derived data and reset the hit/miss counters."""
+    with _derived_cache_lock:
+        _derived_cache.clear()
+        for k in _derived_cache_stats:
+            _derived_cache_stats[k] = 0
+
+
+# ============================================================================
+# Token arrays read directly from the .corpus parquet files
+# ============================================================================
+
+# Use memory-mapped token arrays (see corpus_store.py), converting the corpus
+# on first use, so token data is paged in from disk rather than loaded into RAM
+MEMORY_MAP_TOKENS = True
+
+# Token arrays are processed in slices of this many tokens, so working memory
+# does not grow with corpus size
+TOKEN_CHUNK_SIZE = 1_000_000
+
+
+def _token_column(corpus, column: str) -> np.ndarray:
+    """
+    Get one column of tokens.parquet (e.g. 'orth_index', 'token2doc_index') as a NumPy array.
+    
+    Returns a read-only memory-mapped array when MEMORY_MAP_TOKENS is set,
+    otherwise reads only the requested column from tokens.parquet.
+    """
+    def build():
+        if MEMORY_MAP_TOKENS:
+            array = load_token_array(corpus.corpus_path, column, build=True)
+            if array is not None:
+                return array
+        path = Path(corpus.corpus_path) / 'tokens.parquet'
+        return pl.scan_parquet(path).select(column).collect().to_series().to_numpy()
+    
+    return _derived(corpus, f'column:{column}', build)
+
+
+# Build the postings index (token -> positions, see corpus_store.py) the
+# first time a corpus is queried, so node lookups cost O(hits) afterwards
+BUILD_POSTINGS = True
+
+
+def _postings(corpus):
+    """Postings index for lower_index, or None if it cannot be used for this corpus."""
+    return _derived(corpus, 'postings', lambda: load_postings(corpus.corpus_path, 'lower_index', build=BUILD_POSTINGS))
+
+
+def _vocab_tokens(corpus) -> pl.Series:
+    """Token strings indexed by token_id (index 0 is an empty placeholder)."""
+    def build():
+        vocab = pl.scan_parquet(Path(corpus.corpus_path) / 'vocab.parquet').select('token_id', 'token').collect()
+        tokens = np.full(int(vocab['token_id'].max()) + 1, '', dtype=object)
+        tokens[vocab['token_id'].to_numpy()] = vocab['token'].to_numpy()
+        return pl.Series('token', tokens, dtype=pl.String)
+    
+    return _derived(corpus, 'vocab_tokens', build)
+
+
+def _punct_lookup(corpus) -> np.ndarray:
+    """Boolean array indexed by token_id, True for punctuation tokens (corpus.json punct_tokens)."""
+    def build():
+        is_punct = np.zeros(len(_vocab_tokens(corpus)), dtype=bool)
+        is_punct[[t for t in (corpus.punct_tokens or []) if t < len(is_punct)]] = True
+        return is_punct
+    
+    return _derived(corpus, 'punct_lookup', build)
+
+
+def _token_mask(corpus, start: int, stop: int, exclude_punctuation: bool = True) -> np.ndarray:
+    """
+    Boolean mask for token positions [start, stop) marking tokens that belong to a document.
+    
+    End-of-file separators and the index headers (token2doc_index == -1) are
+    always masked out; punctuation tokens are masked out when
+    exclude_punctuation is True. For a SubcorpusView, tokens of documents
+    outside the view are masked out too.
+    """
+    token2doc_index = _token_column(corpus, 'token2doc_index')[start:stop]
+    mask = token2doc_index >= 0
+    if exclude_punctuation:
+        mask &= ~_punct_lookup(corpus)[_token_column(corpus, 'orth_index')[start:stop]]
+    if isinstance(corpus, SubcorpusView):
+        mask[mask] = corpus.doc_mask[token2doc_index[mask]]
+    return mask
+
+
+def _token_ids(corpus, tokens: List[str]) -> Dict[str, int]:
+    """Look up token ids for (lower-cased) token strings; unknown tokens are left out."""
+    lookup = (
+        pl.scan_parquet(Path(corpus.corpus_path) / 'vocab.parquet')
+        .filter(pl.col('token').is_in([t.lower() for t in tokens]))
+        .select('token', 'token_id')
+        .collect()
+    )
+    return dict(zip(lookup['token'].to_list(), lookup['token_id'].to_list()))
+
+
+def _scan(corpus) -> CorpusScan:
+    """Lazy, column-projected view of the corpus files (see corpus_store.CorpusScan)."""
+    return _derived(corpus, 'scan', lambda: CorpusScan(corpus.corpus_path))
+
+
+def _vocab_frame(corpus) -> pl.LazyFrame:
+    """Lazy scan of vocab.parquet (token_id, token, frequency_lower, frequency_orth, is_punct, is_space, ...)."""
+    return pl.scan_parquet(Path(corpus.corpus_path) / 'vocab.parquet')
+
+
+def _to_pandas(df: pl.DataFrame) -> pd.DataFrame:
+    """Convert a polars result to an Arrow-backed pandas DataFrame without copying column data."""
+    return df.to_pandas(use_pyarrow_extension_array=True)
+
+
+def _top_k(values: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of the k largest values, largest first.
+    
+    Uses np.argpartition so only the selected k values are sorted - selecting
+    the top 100 of 500K types is O(n) rather than O(n log n). With k=None all
+    indices are returned in descending order.
+    """
+    keys = -np.asarray(values, dtype=np.float64)
+    if k is None or k >= len(keys):
+        return np.argsort(keys, kind='stable')
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    
+    top = np.argpartition(keys, k - 1)[:k]
+    return top[np.argsort(keys[top], kind='stable')]
+
+
+# ============================================================================
+# Subcorpus views
+# ============================================================================
+#
+# A subcorpus view selects documents of a built corpus by a predicate over
+# metadata.parquet.  It holds nothing but a boolean mask over document ids;
+# token data is read from the parent's memory-mapped arrays, so slicing a
+# corpus by year or category needs no rebuild.
+
+class SubcorpusView:
+    """
+    Documents of a corpus matching a metadata predicate.
+    
+    Can be passed to the analysis functions in place of a Corpus. Created
+    with subcorpus(); counts (token_count, word_token_count, unique_tokens,
+    unique_word_tokens, as on a Conc Corpus) are computed on first use from
+    the parent's token arrays.
+    """
+    
+    def __init__(self, parent, where: pl.Expr, name: Optional[str] = None):
+        self.parent = parent
+        self.where = where
+        self.name = name or f"{getattr(parent, 'name', parent.slug)} (subcorpus)"
+        self.description = getattr(parent, 'description', '')
+        self.slug = parent.slug
+        self.corpus_path = parent.corpus_path
+        self.date_created = parent.date_created
+        self.punct_tokens = parent.punct_tokens
+        self.EOF_TOKEN = parent.EOF_TOKEN
+        
+        documents = _scan(parent).documents(where).select('document').collect()['document'].to_numpy()
+        self.doc_mask = np.zeros(parent.document_count + 1, dtype=bool)
+        self.doc_mask[documents[documents <= parent.document_count]] = True
+        self.document_count = int(self.doc_mask.sum())
+        self._frequencies = None
+    
+    def frequencies(self) -> np.ndarray:
+        """Token counts of the selected documents indexed by lower_index token id."""
+        if self._frequencies is None:
+            lower_index = _token_column(self.parent, 'lower_index')
+            counts = np.zeros(len(_vocab_tokens(self.parent)), dtype=np.int64)
+            for start in range(0, len(lower_index), TOKEN_CHUNK_SIZE):
+                stop = min(start + TOKEN_CHUNK_SIZE, len(lower_index))
+                mask = _token_mask(self, start, stop, exclude_punctuation=False)
+                counts += np.bincount(lower_index[start:stop][mask], minlength=len(counts))
+            self._frequencies = counts
+        return self._frequencies
+    
+    @property
+    def token_count(self) -> int:
+        return int(self.frequencies().sum())
+    
+    @property
+    def word_token_count(self) -> int:
+        return int(self.frequencies()[~_punct_lookup(self.parent)].sum())
+    
+    @property
+    def unique_tokens(self) -> int:
+        return int(np.count_nonzero(self.frequencies()))
+    
+    @property
+    def unique_word_tokens(self) -> int:
+        return int(np.count_nonzero(self.frequencies()[~_punct_lookup(self.parent)]))
+    
+    def __repr__(self) -> str:
+        return f"SubcorpusView({self.name!r}, documents={self.document_count})"
+
+
+def subcorpus(corpus,
+              where: Optional[pl.Expr] = None,
+              year: Optional[Union[int, List[int]]] = None,
+              category: Optional[Union[str, List[str]]] = None,
+              date_from: Optional[str] = None,
+              date_to: Optional[str] = None,
+              url_pattern: Optional[str] = None,
+              name: Optional[str] = None) -> SubcorpusView:
+    """
+    Create a subcorpus view from metadata predicates.
+    
+    All given conditions must match. Dates are compared on their ISO
+    YYYY-MM-DD prefix, both ends inclusive. url_pattern is a regular
+    expression matched against the 'url' or 'source_url' column.
+    
+    Arguments:
+        corpus: Conc Corpus object (or another SubcorpusView to narrow down)
+        where: Any predicate over metadata.parquet columns
+        year: Year or list of years ('year' column)
+        category: Category or list of categories ('category' column)
+        date_from: First date to include (e.g., '2019-01-01')
+        date_to: Last date to include (e.g., '2019-06-30')
+        url_pattern: Regular expression for the document URL
+        name: Name reported by get_basic_metrics()
+    
+    Returns:
+        SubcorpusView that the analysis functions accept in place of a Corpus
+    
+    Example:
+        >>> corpus = Corpus().load('corpora/rnz-climate-national.corpus')
+        >>> recent = subcorpus(corpus, date_from='2020-01-01', category='Politics')
+        >>> get_frequency_table(recent, top_n=50)
+        >>> get_ngrams(subcorpus(corpus, year=2019), n=2, top_n=50)
+    """
+    conditions = [] if where is None else [where]
+    if isinstance(corpus, SubcorpusView):
+        conditions.insert(0, corpus.where)
+        corpus = corpus.parent
+    
+    if year is not None:
+        conditions.append(pl.col('year').is_in(year if isinstance(year, list) else [year]))
+    if category is not None:
+        conditions.append(pl.col('category').is_in(category if isinstance(category, list) else [category]))
+    if date_from is not None:
+        conditions.append(pl.col('date').cast(pl.String).str.slice(0, 10) >= str(date_from)[:10])
+    if date_to is not None:
+        conditions.append(pl.col('date').cast(pl.String).str.slice(0, 10) <= str(date_to)[:10])
+    if url_pattern is not None:
+        schema = _scan(corpus).documents().collect_schema()
+        url_column = next((c for c in ('url', 'source_url') if c in schema), None)
+        if url_column is None:
+            raise ValueError(f"No url or source_url column in metadata ({list(schema)})")
+        conditions.append(pl.col(url_column).str.contains(url_pattern))
+    
+    view = SubcorpusView(corpus, pl.all_horizontal(conditions) if conditions else pl.lit(True), name=name)
+    logger.info(f"Created {view}")
+    return view
+
+
+def _parent(corpus):
+    """The Corpus behind a SubcorpusView (or the corpus itself)."""
+    return corpus.parent if isinstance(corpus, SubcorpusView) else corpus
+
+
+def _where(corpus, where: Optional[pl.Expr]) -> Optional[pl.Expr]:
+    """Combine a where= predicate with the predicate of a SubcorpusView."""
+    if isinstance(corpus, SubcorpusView):
+        return corpus.where if where is None else corpus.where & where
+    return where
+
+
+def get_basic_metrics(corpus, where: Optional[pl.Expr] = None) -> Dict[str, Union[int, float, str]]:
     """
     Get basic corpus metrics.
     
     Arguments:
         corpus: Conc Corpus object
+        where: Optional predicate over metadata.parquet columns
+               (e.g., pl.col('year') == 2019) to measure matching documents only
     
     Returns:
         Dictionary with basic metrics:
         - name: Corpus name
         - description: Corpus description
         - num_documents: Number of documents
-        - total_tokens: Total word count
-        - total_types: Number of unique words
+        - total_tokens: Total word count (punctuation excluded)
+        - total_types: Number of unique words (punctuation excluded)
         - avg_tokens_per_doc: Average document length
         - type_token_ratio: Lexical diversity (types/tokens)
     
@@ -57,29 +445,49 @@ def get_basic_metrics(corpus) -> Dict[str, Union[int, float, str]]:
         >>> print(f"TTR: {metrics['type_token_ratio']:.4f}")
     """
     try:
-        metrics = {
-            'name': corpus.name,
-            'description': corpus.description,
-            'num_documents': corpus.num_documents,
-            'total_tokens': corpus.total_tokens,
-            'total_types': corpus.total_types,
-            'avg_tokens_per_doc': corpus.total_tokens / corpus.num_documents if corpus.num_documents > 0 else 0,
-            'type_token_ratio': corpus.total_types / corpus.total_tokens if corpus.total_tokens > 0 else 0
-        }
-        
-        logger.info(f"Corpus: {metrics['name']}")
-        logger.info(f"Documents: {metrics['num_documents']:,}")
-        logger.info(f"Tokens: {metrics['total_tokens']:,}")
-        logger.info(f"Types: {metrics['total_types']:,}")
-        logger.info(f"TTR: {metrics['type_token_ratio']:.4f}")
-        
-        return metrics
+        return _basic_metrics(corpus, where)
         
     except Exception as e:
         logger.error(f"Error getting basic metrics: {e}")
         return {}
 
 
+def _basic_metrics(corpus, where: Optional[pl.Expr] = None) -> Dict[str, Union[int, float, str]]:
+    """get_basic_metrics() without the error handling: failures raise instead of returning an empty result."""
+    if where is not None:
+        scanned = _scan(corpus).metrics(where=_where(corpus, where)).collect().row(0, named=True)
+        counts = {
+            'num_documents': scanned['num_documents'],
+            'total_tokens': scanned['word_tokens'],
+            'total_types': scanned['total_types']
+        }
+    else:
+        # Same counts for a Corpus and a SubcorpusView
+        counts = {
+            'num_documents': corpus.document_count,
+            'total_tokens': corpus.word_token_count,
+            'total_types': corpus.unique_word_tokens
+        }
+    
+    metrics = {
+        'name': corpus.name,
+        'description': corpus.description,
+        'num_documents': counts['num_documents'],
+        'total_tokens': counts['total_tokens'],
+        'total_types': counts['total_types'],
+        'avg_tokens_per_doc': counts['total_tokens'] / counts['num_documents'] if counts['num_documents'] > 0 else 0,
+        'type_token_ratio': counts['total_types'] / counts['total_tokens'] if counts['total_tokens'] > 0 else 0
+    }
+    
+    logger.info(f"Corpus: {metrics['name']}")
+    logger.info(f"Documents: {metrics['num_documents']:,}")
+    logger.info(f"Tokens: {metrics['total_tokens']:,}")
+    logger.info(f"Types: {metrics['total_types']:,}")
+    logger.info(f"TTR: {metrics['type_token_ratio']:.4f}")
+    
+    return metrics
+
+
 def calculate_ttr(corpus, first_n_tokens: Optional[int] = None) -> float:
     """
     Calculate Type-Token Ratio (lexical diversity).
@@ -102,7 +510,7 @@ def calculate_ttr(corpus, first_n_tokens: Optional[int] = None) -> float:
             # (TTR increases with corpus size, so standardize)
             logger.warning("first_n_tokens standardization not fully implemented - using full corpus")
         
-        ttr = corpus.total_types / corpus.total_tokens if corpus.total_tokens > 0 else 0.0
+        ttr = corpus.unique_word_tokens / corpus.word_token_count if corpus.word_token_count > 0 else 0.0
         
         logger.info(f"Type-Token Ratio: {ttr:.4f} ({ttr*100:.2f}%)")
         
@@ -119,7 +527,8 @@ def get_frequency_table(corpus,
                        restrict_tokens: Optional[List[str]] = None,
                        min_freq: int = 1,
                        normalize_by: int = 1000,
-                       top_n: Optional[int] = None) -> pd.DataFrame:
+                       top_n: Optional[int] = None,
+                       where: Optional[pl.Expr] = None) -> pd.DataFrame:
     """
     Get frequency table as pandas DataFrame.
     
@@ -131,6 +540,8 @@ def get_frequency_table(corpus,
         min_freq: Minimum frequency threshold
         normalize_by: Normalize frequencies per N tokens (e.g., 1000)
         top_n: Return only top N most frequent tokens
+        where: Optional predicate over metadata.parquet columns
+               (e.g., pl.col('year') == 2019) to count matching documents only
     
     Returns:
         DataFrame with columns: rank, token, frequency, normalized_frequency
@@ -140,49 +551,254 @@ def get_frequency_table(corpus,
         >>> df.to_csv('frequencies.csv', index=False)
     """
     try:
-        from conc.conc import Conc
-        
-        conc = Conc(corpus)
+        return _frequency_table(corpus, exclude_punctuation, exclude_tokens, restrict_tokens,
+                                min_freq, normalize_by, top_n, where)
         
-        # Get frequency data
-        freq_result = conc.frequencies(
-            exclude_punctuation=exclude_punctuation,
-            exclude_tokens=exclude_tokens or [],
-            restrict_tokens=restrict_tokens or [],
-            normalize_by=normalize_by
+    except Exception as e:
+        logger.error(f"Error generating frequency table: {e}")
+        return pd.DataFrame()
+
+
+def _frequency_table(corpus,
+                     exclude_punctuation: bool = True,
+                     exclude_tokens: Optional[List[str]] = None,
+                     restrict_tokens: Optional[List[str]] = None,
+                     min_freq: int = 1,
+                     normalize_by: int = 1000,
+                     top_n: Optional[int] = None,
+                     where: Optional[pl.Expr] = None) -> pd.DataFrame:
+    """get_frequency_table() without the error handling: failures raise instead of returning an empty result."""
+    if where is not None:
+        # Count matching documents with a single lazy query over tokens.parquet
+        freq = _scan(corpus).frequencies(where=_where(corpus, where), exclude_punctuation=exclude_punctuation)
+        total_tokens = freq.select(pl.col('frequency').sum()).collect().item() or 0
+    else:
+        # Frequencies are stored per type in vocab.parquet, so the table is
+        # built column-wise from there rather than row by row
+        if isinstance(corpus, SubcorpusView):
+            # Counts of the view's documents, taken from the token arrays
+            frequency = pl.lit(pl.Series(corpus.frequencies())).gather(pl.col('token_id'))
+        else:
+            frequency = pl.col('frequency_lower')
+        freq = (
+            _vocab_frame(corpus)
+            .filter(pl.col('frequency_lower').is_not_null() & ~pl.col('is_space'))
+            .select('token_id', 'is_punct', frequency.alias('frequency'))
+            .filter(pl.col('frequency') > 0)
         )
+        if exclude_punctuation:
+            freq = freq.filter(~pl.col('is_punct'))
+        total_tokens = corpus.word_token_count if exclude_punctuation else corpus.token_count
+    
+    if exclude_tokens:
+        freq = freq.filter(~pl.col('token_id').is_in(list(_token_ids(corpus, exclude_tokens).values())))
+    if restrict_tokens:
+        freq = freq.filter(pl.col('token_id').is_in(list(_token_ids(corpus, restrict_tokens).values())))
+    if min_freq > 1:
+        freq = freq.filter(pl.col('frequency') >= min_freq)
+    
+    # Only ids and counts are collected; token strings are looked up for
+    # the selected top_n rows alone
+    counts = freq.select('token_id', 'frequency').collect()
+    counts = counts[_top_k(counts['frequency'].to_numpy(), top_n)]
+    
+    df = _to_pandas(counts.select(
+        pl.int_range(1, pl.len() + 1).alias('rank'),
+        pl.lit(_vocab_tokens(corpus)).gather(pl.col('token_id')).alias('token'),
+        pl.col('frequency'),
+        (pl.col('frequency') / max(total_tokens, 1) * normalize_by).alias('normalized_frequency')
+    ))
+    
+    logger.info(f"Generated frequency table: {len(df)} tokens")
+    
+    return df
+
+
+def _query_positions(corpus, token_ids: List[int]) -> Iterator[np.ndarray]:
+    """
+    Yield positions where a token sequence starts, in corpus order, chunk by chunk.
+    
+    Matching is on lower_index (case-insensitive). With a postings index the
+    positions of the first token are read directly (O(hits)); otherwise the
+    token array is scanned in TOKEN_CHUNK_SIZE slices. Either way a
+    consumer that stops early never pays for the rest of the corpus.
+    For a SubcorpusView, hits outside the view's documents are dropped.
+    """
+    for hits in _scan_positions(corpus, token_ids):
+        if isinstance(corpus, SubcorpusView):
+            doc = _token_column(corpus, 'token2doc_index')[hits]
+            hits = hits[(doc >= 0) & corpus.doc_mask[doc]]
+        if len(hits):
+            yield hits
+
+
+def _scan_positions(corpus, token_ids: List[int]) -> Iterator[np.ndarray]:
+    """Positions matching token_ids in the whole token stream (see _query_positions)."""
+    n = len(token_ids)
+    postings = _postings(corpus)
+    
+    if postings is not None:
+        candidates = postings.positions(token_ids[0])
+        lower_index = _token_column(corpus, 'lower_index') if n > 1 else None
+        for start in range(0, len(candidates), TOKEN_CHUNK_SIZE):
+            hits = np.asarray(candidates[start:start + TOKEN_CHUNK_SIZE], dtype=np.int64)
+            for k in range(1, n):
+                hits = hits[hits + k < len(lower_index)]
+                hits = hits[lower_index[hits + k] == token_ids[k]]
+            if len(hits):
+                yield hits
+        return
+    
+    lower_index = _token_column(corpus, 'lower_index')
+    
+    for start in range(0, len(lower_index), TOKEN_CHUNK_SIZE):
+        stop = min(start + TOKEN_CHUNK_SIZE, len(lower_index) - n + 1)
+        if stop <= start:
+            break
+        hits = np.flatnonzero(lower_index[start:stop] == token_ids[0]) + start
+        for k in range(1, n):
+            hits = hits[lower_index[hits + k] == token_ids[k]]
+        if len(hits):
+            yield hits
+
+
+def _batch_positions(corpus, sequences: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions of many token sequences at once.
+    
+    With a postings index each sequence costs O(its hits); otherwise the
+    token array is scanned once in TOKEN_CHUNK_SIZE slices for all first
+    tokens together, so the cost does not multiply with the number of
+    sequences. For a SubcorpusView, hits outside the view are dropped.
+    
+    Returns:
+        (positions, sequence) arrays, ordered by sequence and then position
+    """
+    lower_index = _token_column(corpus, 'lower_index')
+    postings = _postings(corpus)
+    found = [[] for _ in sequences]
+    
+    if postings is not None:
+        for i, token_ids in enumerate(sequences):
+            found[i].append(np.asarray(postings.positions(token_ids[0]), dtype=np.int64))
+    else:
+        firsts = np.unique([token_ids[0] for token_ids in sequences])
+        for start in range(0, len(lower_index), TOKEN_CHUNK_SIZE):
+            chunk = lower_index[start:start + TOKEN_CHUNK_SIZE]
+            candidates = np.flatnonzero(np.isin(chunk, firsts))
+            # Candidates grouped by token id, still in corpus order within each id
+            order = np.argsort(chunk[candidates], kind='stable')
+            candidate_ids = chunk[candidates][order]
+            for i, token_ids in enumerate(sequences):
+                lo, hi = np.searchsorted(candidate_ids, [token_ids[0], token_ids[0] + 1])
+                if hi > lo:
+                    found[i].append(candidates[order[lo:hi]].astype(np.int64) + start)
+    
+    positions, sequence = [np.array([], dtype=np.int64)], [np.array([], dtype=np.int64)]
+    for i, token_ids in enumerate(sequences):
+        hits = np.concatenate(found[i]) if found[i] else np.array([], dtype=np.int64)
+        for k in range(1, len(token_ids)):
+            hits = hits[hits + k < len(lower_index)]
+            hits = hits[lower_index[hits + k] == token_ids[k]]
+        positions.append(hits)
+        sequence.append(np.full(len(hits), i, dtype=np.int64))
+    positions, sequence = np.concatenate(positions), np.concatenate(sequence)
+    
+    if isinstance(corpus, SubcorpusView):
+        doc = _token_column(corpus, 'token2doc_index')[positions]
+        keep = (doc >= 0) & corpus.doc_mask[doc]
+        positions, sequence = positions[keep], sequence[keep]
+    return positions, sequence
+
+
+def iter_concordance(corpus,
+                     query: str,
+                     context_length: int = 8,
+                     max_results: Optional[int] = None,
+                     random_sample: bool = False,
+                     seed: Optional[int] = None) -> Iterator[Dict[str, Union[str, int]]]:
+    """
+    Stream concordance (KWIC) lines for a query.
+    
+    Lines are produced lazily in corpus order and the scan stops as soon as
+    max_results lines have been produced. With random_sample=True, a uniform
+    random sample of max_results hits is drawn with reservoir sampling
+    (reproducible with seed). Context is only built for the hits that are
+    returned.
+    
+    Arguments:
+        corpus: Conc Corpus object
+        query: Search term (a single token or a space-separated phrase)
+        context_length: Number of words before/after to show
+        max_results: Maximum number of concordance lines
+        random_sample: Return a random sample of max_results hits instead of the first ones
+        seed: Random seed for random_sample
+    
+    Yields:
+        Dictionaries with keys: left_context, node, right_context, document
+    
+    Example:
+        >>> for line in iter_concordance(corpus, 'climate', max_results=5):
+        ...     print(line['left_context'], '|', line['node'], '|', line['right_context'])
+    """
+    import random
+    
+    words = query.split()
+    ids = _token_ids(corpus, words)
+    if not words or any(w.lower() not in ids for w in words):
+        logger.info(f"'{query}' not found in corpus")
+        return
+    token_ids = [ids[w.lower()] for w in words]
+    
+    if random_sample and max_results:
+        # Reservoir sampling (Algorithm R) over the stream of hit positions
+        rng = random.Random(seed)
+        reservoir = []
+        seen = 0
+        for hits in _query_positions(corpus, token_ids):
+            for position in hits:
+                if seen < max_results:
+                    reservoir.append(position)
+                else:
+                    j = rng.randint(0, seen)
+                    if j < max_results:
+                        reservoir[j] = position
+                seen += 1
+        positions = iter(sorted(reservoir))
+    else:
+        positions = (p for hits in _query_positions(corpus, token_ids) for p in hits)
+    
+    orth_index = _token_column(corpus, 'orth_index')
+    token2doc_index = _token_column(corpus, 'token2doc_index')
+    tokens = _vocab_tokens(corpus).to_numpy()
+    
+    for count, position in enumerate(positions):
+        if max_results and count >= max_results:
+            return
         
-        # Convert to DataFrame
-        data = []
-        rank = 1
-        for item in freq_result.results:
-            if item['frequency'] >= min_freq:
-                data.append({
-                    'rank': rank,
-                    'token': item['token'],
-                    'frequency': item['frequency'],
-                    'normalized_frequency': item['normalized_frequency']
-                })
-                rank += 1
-        
-        df = pd.DataFrame(data)
-        
-        if top_n:
-            df = df.head(top_n)
-        
-        logger.info(f"Generated frequency table: {len(df)} tokens")
+        node_end = position + len(token_ids)
+        doc = token2doc_index[position]
         
-        return df
+        # Context stops at document boundaries
+        left = np.arange(max(position - context_length, 0), position)
+        left = left[token2doc_index[left] == doc]
+        right = np.arange(node_end, min(node_end + context_length, len(orth_index)))
+        right = right[token2doc_index[right] == doc]
         
-    except Exception as e:
-        logger.error(f"Error generating frequency table: {e}")
-        return pd.DataFrame()
+        yield {
+            'left_context': ' '.join(tokens[orth_index[left]]),
+            'node': ' '.join(tokens[orth_index[position:node_end]]),
+            'right_context': ' '.join(tokens[orth_index[right]]),
+            'document': int(doc)
+        }
 
 
 def get_concordance(corpus, 
                    query: str,
                    context_length: int = 8,
-                   max_results: Optional[int] = None) -> pd.DataFrame:
+                   max_results: Optional[int] = None,
+                   random_sample: bool = False,
+                   seed: Optional[int] = None) -> pd.DataFrame:
     """
     Get concordance (KWIC) results as DataFrame.
     
@@ -191,6 +807,8 @@ def get_concordance(corpus,
         query: Search term
         context_length: Number of words before/after to show
         max_results: Maximum number of concordance lines
+        random_sample: Return a random sample of max_results lines (see iter_concordance)
+        seed: Random seed for random_sample
     
     Returns:
         DataFrame with columns: left_context, node, right_context, document
@@ -200,31 +818,17 @@ def get_concordance(corpus,
         >>> conc_df.to_csv('earthquake_concordance.csv', index=False)
     """
     try:
-        from conc.conc import Conc
-        
-        conc = Conc(corpus)
+        lines = iter_concordance(corpus, query,
+                                 context_length=context_length,
+                                 max_results=max_results,
+                                 random_sample=random_sample,
+                                 seed=seed)
         
-        # Get concordance
-        conc_result = conc.concordance(
-            query=query,
-            context_length=context_length
+        df = pd.DataFrame.from_records(
+            list(lines),
+            columns=['left_context', 'node', 'right_context', 'document']
         )
         
-        # Convert to DataFrame
-        data = []
-        for i, item in enumerate(conc_result.results):
-            if max_results and i >= max_results:
-                break
-                
-            data.append({
-                'left_context': ' '.join(item['left']),
-                'node': query,
-                'right_context': ' '.join(item['right']),
-                'document': item.get('doc_id', '')
-            })
-        
-        df = pd.DataFrame(data)
-        
         logger.info(f"Generated concordance for '{query}': {len(df)} hits")
         
         return df
@@ -234,8 +838,325 @@ def get_concordance(corpus,
         return pd.DataFrame()
 
 
+def _context_strings(corpus,
+                     starts: np.ndarray,
+                     docs: np.ndarray,
+                     step: int,
+                     length: Union[int, np.ndarray]) -> pl.Series:
+    """
+    Text for many positions at once: up to `length` tokens (one length, or
+    one per position) from each start, moving by step (-1 left, +1 right),
+    within the same document. Tokens are always joined in reading order.
+    """
+    orth_index = _token_column(corpus, 'orth_index')
+    token2doc_index = _token_column(corpus, 'token2doc_index')
+    
+    lengths = np.broadcast_to(length, starts.shape)
+    columns = np.arange(int(lengths.max()) if len(lengths) else 0)
+    offsets = starts[:, None] + step * columns
+    inside = (offsets >= 0) & (offsets < len(orth_index)) & (columns < lengths[:, None])
+    offsets = np.clip(offsets, 0, len(orth_index) - 1)
+    keep = inside & (token2doc_index[offsets] == docs[:, None])
+    if step < 0:
+        offsets, keep = offsets[:, ::-1], keep[:, ::-1]
+    
+    rows, columns = np.nonzero(keep)
+    words = (
+        pl.DataFrame({'row': rows, 'token': _vocab_tokens(corpus).gather(orth_index[offsets[rows, columns]])})
+        .group_by('row', maintain_order=True)
+        .agg(pl.col('token').str.join(' '))
+    )
+    return (
+        pl.DataFrame({'row': np.arange(len(starts))})
+        .join(words, on='row', how='left')
+        .sort('row')['token']
+        .fill_null('')
+    )
+
+
+def get_concordances(corpus,
+                     queries: List[str],
+                     context_length: int = 8,
+                     max_results: Optional[int] = None,
+                     random_sample: bool = False,
+                     seed: Optional[int] = None) -> pd.DataFrame:
+    """
+    Get concordance (KWIC) lines for many queries in one pass.
+    
+    All queries are resolved to token ids up front and their hits are
+    collected together, from the postings index or in a single scan of
+    the token array, so the cost grows with the total number of hits
+    rather than with the number of queries times the corpus size.
+    Context is built for all selected hits at once.
+    
+    Arguments:
+        corpus: Conc Corpus object or SubcorpusView
+        queries: Search terms (single tokens or space-separated phrases)
+        context_length: Number of words before/after to show
+        max_results: Maximum number of concordance lines per query
+        random_sample: Return a random sample of max_results lines per query instead of the first ones
+        seed: Random seed for random_sample
+    
+    Returns:
+        Long-format DataFrame with columns: term, left_context, node,
+        right_context, document (ordered by query, then corpus position)
+    
+    Example:
+        >>> terms = ['climate', 'emissions', 'carbon', 'zero carbon']
+        >>> conc_df = get_concordances(corpus, terms, max_results=50)
+        >>> conc_df[conc_df['term'] == 'emissions'].to_csv('emissions_concordance.csv', index=False)
+    """
+    try:
+        words = [query.split() for query in queries]
+        ids = _token_ids(corpus, [w for query_words in words for w in query_words])
+        sequences, terms = [], []
+        for query, query_words in zip(queries, words):
+            if not query_words or any(w.lower() not in ids for w in query_words):
+                logger.info(f"'{query}' not found in corpus")
+                continue
+            sequences.append([ids[w.lower()] for w in query_words])
+            terms.append(query)
+        
+        positions, sequence = _batch_positions(corpus, sequences)
+        
+        if max_results:
+            # First (or a random sample of) max_results hits of each query
+            starts = np.searchsorted(sequence, np.arange(len(sequences)))
+            stops = np.searchsorted(sequence, np.arange(len(sequences)), side='right')
+            if random_sample:
+                rng = np.random.default_rng(seed)
+                selected = [np.sort(rng.choice(np.arange(lo, hi), size=min(max_results, hi - lo), replace=False))
+                            for lo, hi in zip(starts, stops)]
+            else:
+                selected = [np.arange(lo, min(hi, lo + max_results)) for lo, hi in zip(starts, stops)]
+            selected = np.concatenate(selected) if selected else np.array([], dtype=np.int64)
+            positions, sequence = positions[selected], sequence[selected]
+        
+        token2doc_index = _token_column(corpus, 'token2doc_index')
+        node_length = np.array([len(t) for t in sequences], dtype=np.int64)
+        
+        # Hits are processed in batches so the context matrices stay around TOKEN_CHUNK_SIZE entries
+        batch_size = max(TOKEN_CHUNK_SIZE // max(2 * context_length, 1), 1)
+        frames = [pl.DataFrame(schema={'term': pl.String, 'left_context': pl.String, 'node': pl.String,
+                                       'right_context': pl.String, 'document': pl.Int64})]
+        for start in range(0, len(positions), batch_size):
+            hits = positions[start:start + batch_size]
+            hit_sequence = sequence[start:start + batch_size]
+            docs = token2doc_index[hits].astype(np.int64)
+            lengths = node_length[hit_sequence]
+            frames.append(pl.DataFrame({
+                'term': pl.Series(terms, dtype=pl.String).gather(hit_sequence),
+                'left_context': _context_strings(corpus, hits - 1, docs, -1, context_length),
+                'node': _context_strings(corpus, hits, docs, 1, lengths),
+                'right_context': _context_strings(corpus, hits + lengths, docs, 1, context_length),
+                'document': docs,
+            }))
+        
+        df = _to_pandas(pl.concat(frames))
+        
+        logger.info(f"Generated concordances for {len(terms)} of {len(queries)} queries: {len(df)} hits")
+        
+        return df
+        
+    except Exception as e:
+        logger.error(f"Error generating concordances: {e}")
+        return pd.DataFrame()
+
+
+# ============================================================================
+# Collocations
+# ============================================================================
+#
+# Collocates are counted straight from the token arrays: for every node hit
+# a window of positions is gathered as one (hits x offsets) matrix, masked at
+# document boundaries (token2doc_index) and on punctuation, and the
+# collocate ids are counted with NumPy. All nodes of a batch share one
+# position lookup, and every measure is computed column-wise from the counts.
+
+# get_collocations() measure -> column the results are ordered by
+COLLOCATION_MEASURES = {
+    'MI': 'mutual_information',
+    'LLR': 'log_likelihood',
+    'T': 't_score',
+    'Dice': 'dice',
+    'logDice': 'log_dice',
+}
+
+
+def _lower_frequencies(corpus) -> np.ndarray:
+    """Token counts indexed by lower_index token id (a SubcorpusView counts its own documents)."""
+    if isinstance(corpus, SubcorpusView):
+        return corpus.frequencies()
+    
+    def build():
+        vocab = _vocab_frame(corpus).select('token_id', 'frequency_lower').collect()
+        counts = np.zeros(len(_vocab_tokens(corpus)), dtype=np.int64)
+        counts[vocab['token_id'].to_numpy()] = vocab['frequency_lower'].fill_null(0).to_numpy()
+        return counts
+    
+    return _derived(corpus, 'lower_frequencies', build)
+
+
+def _window_tokens(corpus,
+                   starts: np.ndarray,
+                   docs: np.ndarray,
+                   step: int,
+                   window: int,
+                   exclude_punctuation: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Token ids in a one-sided window for many positions at once.
+    
+    From each start position, moving by step (-1 left, +1 right), the first
+    `window` tokens of the same document are taken, skipping punctuation
+    when exclude_punctuation is True (as Conc does). Offsets are gathered
+    as a (positions x offsets) matrix; rows that run into punctuation are
+    widened and gathered again.
+    
+    Returns:
+        (row, token_id) arrays: the row of starts each window token belongs to, and its lower_index id
+    """
+    lower_index = _token_column(corpus, 'lower_index')
+    token2doc_index = _token_column(corpus, 'token2doc_index')
+    is_punct = _punct_lookup(corpus)
+    
+    rows = np.arange(len(starts))
+    found_rows, found_ids = [], []
+    width = window
+    while len(rows) and window > 0:
+        offsets = starts[rows, None] + step * np.arange(width)
+        inside = (offsets >= 0) & (offsets < len(lower_index))
+        offsets = np.clip(offsets, 0, len(lower_index) - 1)
+        same_doc = inside & (token2doc_index[offsets] == docs[rows, None])
+        ids = lower_index[offsets]
+        valid = same_doc & ~is_punct[ids] if exclude_punctuation else same_doc
+        
+        # A row is complete once it has `window` tokens or has left its document
+        done = (valid.sum(axis=1) >= window) | ~same_doc[:, -1]
+        keep = valid[done] & (np.cumsum(valid[done], axis=1) <= window)
+        r, c = np.nonzero(keep)
+        found_rows.append(rows[done][r])
+        found_ids.append(ids[done][r, c])
+        
+        rows = rows[~done]
+        width *= 2
+    
+    if not found_rows:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    return np.concatenate(found_rows), np.concatenate(found_ids).astype(np.int64)
+
+
+def collocation_table(corpus,
+                      nodes: List[str],
+                      window: int = 5,
+                      min_freq: int = 5,
+                      exclude_punctuation: bool = True) -> pl.DataFrame:
+    """
+    Count window co-occurrences for one or more nodes and score every collocate.
+    
+    Each node is a token or a space-separated phrase (case-insensitive).
+    The window covers `window` word tokens on each side of the node within
+    its document. Measures, with f_node the node's hits, f_coll the
+    collocate's frequency, a the co-occurrences, W the tokens in the node's
+    windows and N the word tokens in the corpus:
+    - mutual_information: log2(N * a / (f_node * f_coll)), as in Conc
+    - log_likelihood: G2 of a in W against the collocate's other
+      occurrences in the rest of the corpus, as in Conc
+    - t_score: (a - E) / sqrt(a) with E = W * f_coll / N
+    - dice: 2a / (f_node + f_coll), and log_dice: 14 + log2(dice)
+    
+    Arguments:
+        corpus: Conc Corpus object or SubcorpusView
+        nodes: Node words or phrases
+        window: Context window size (words before/after)
+        min_freq: Minimum collocation frequency
+        exclude_punctuation: Skip punctuation in windows and totals
+    
+    Returns:
+        polars DataFrame with node, collocate, collocate_frequency,
+        total_frequency, mutual_information, log_likelihood, t_score,
+        dice, log_dice (unordered)
+    
+    Example:
+        >>> table = collocation_table(corpus, ['climate', 'emissions', 'carbon tax'])
+        >>> table.filter(pl.col('node') == 'climate').sort('log_dice', descending=True)
+    """
+    sequences, labels = [], []
+    for node in nodes:
+        words = node.split()
+        ids = _token_ids(corpus, words)
+        if not words or any(w.lower() not in ids for w in words):
+            logger.info(f"'{node}' not found in corpus")
+            continue
+        sequences.append([ids[w.lower()] for w in words])
+        labels.append(node)
+    
+    frequencies = _lower_frequencies(corpus)
+    n_tokens = corpus.word_token_count if exclude_punctuation else corpus.token_count
+    token2doc_index = _token_column(corpus, 'token2doc_index')
+    positions, sequence = _batch_positions(corpus, sequences)
+    node_length = np.array([len(t) for t in sequences], dtype=np.int64)
+    
+    # Hits are processed in batches so the window matrices stay around TOKEN_CHUNK_SIZE entries
+    batch_size = max(TOKEN_CHUNK_SIZE // max(2 * window, 1), 1)
+    keys = [np.array([], dtype=np.int64)]
+    for start in range(0, len(positions), batch_size):
+        hits = positions[start:start + batch_size]
+        hit_sequence = sequence[start:start + batch_size]
+        docs = token2doc_index[hits]
+        lengths = node_length[hit_sequence]
+        for starts, step in ((hits - 1, -1), (hits + lengths, 1)):
+            rows, ids = _window_tokens(corpus, starts, docs, step, window, exclude_punctuation)
+            keys.append(hit_sequence[rows] * len(frequencies) + ids)
+    
+    # Co-occurrence counts per (node, collocate) pair
+    keys, counts = np.unique(np.concatenate(keys), return_counts=True)
+    node_index, collocate_id = keys // len(frequencies), keys % len(frequencies)
+    node_hits = np.bincount(sequence, minlength=len(sequences))
+    window_tokens = np.bincount(node_index, weights=counts, minlength=len(sequences))
+    # Occurrences of the collocate inside the node itself, excluded from the rest of the corpus
+    node_keys, node_counts = np.unique(
+        np.array([i * len(frequencies) + t for i, token_ids in enumerate(sequences) for t in token_ids], dtype=np.int64),
+        return_counts=True
+    )
+    found = np.minimum(np.searchsorted(node_keys, keys), len(node_keys) - 1)
+    in_node = np.where(node_keys[found] == keys, node_counts[found], 0) if len(node_keys) else np.zeros_like(keys)
+    
+    df = pl.DataFrame({
+        'node': pl.Series(labels, dtype=pl.String).gather(node_index),
+        'collocate': _vocab_tokens(corpus).gather(collocate_id),
+        'collocate_frequency': counts.astype(np.int64),
+        'total_frequency': frequencies[collocate_id].astype(np.int64),
+        '_node_hits': node_hits[node_index].astype(np.float64),
+        '_window_tokens': window_tokens[node_index],
+        '_node_tokens': (node_hits * node_length)[node_index].astype(np.float64),
+        '_in_node': (in_node * node_hits[node_index]).astype(np.float64),
+    })
+    if min_freq > 1:
+        df = df.filter(pl.col('collocate_frequency') >= min_freq)
+    
+    a = pl.col('collocate_frequency').cast(pl.Float64)
+    f_coll = pl.col('total_frequency').cast(pl.Float64)
+    f_node = pl.col('_node_hits')
+    c = pl.col('_window_tokens')
+    b = pl.max_horizontal(f_coll - a - pl.col('_in_node'), pl.lit(0.0))
+    d = float(n_tokens) - c - pl.col('_node_tokens')
+    
+    def g2_term(observed: pl.Expr, expected: pl.Expr) -> pl.Expr:
+        return pl.when(observed > 0).then(observed * (observed / expected).log()).otherwise(0.0)
+    
+    dice = 2 * a / (f_node + f_coll)
+    return df.select(
+        'node', 'collocate', 'collocate_frequency', 'total_frequency',
+        (float(n_tokens) * a / (f_node * f_coll)).log(2).alias('mutual_information'),
+        (2 * (g2_term(a, c * (a + b) / (c + d)) + g2_term(b, d * (a + b) / (c + d)))).alias('log_likelihood'),
+        ((a - c * f_coll / float(max(n_tokens, 1))) / a.sqrt()).alias('t_score'),
+        dice.alias('dice'),
+        (14 + dice.log(2)).alias('log_dice'),
+    )
+
+
 def get_collocations(corpus,
-                    node: str,
+                    node: Union[str, List[str]],
                     measure: str = 'MI',
                     window: int = 5,
                     min_freq: int = 5,
@@ -243,52 +1164,48 @@ def get_collocations(corpus,
     """
     Get collocation analysis results.
     
+    Passing a list of nodes scores all of them in one batched pass (see
+    collocation_table), with top_n applied per node.
+    
     Arguments:
-        corpus: Conc Corpus object
-        node: Target word
-        measure: Statistical measure ('MI', 'LLR', 'T')
+        corpus: Conc Corpus object or SubcorpusView
+        node: Target word or phrase, or a list of them
+        measure: Statistical measure to rank by ('MI', 'LLR', 'T', 'Dice', 'logDice')
         window: Context window size (words before/after)
         min_freq: Minimum collocation frequency
-        top_n: Return top N collocates
+        top_n: Return top N collocates (per node)
     
     Returns:
-        DataFrame with columns: collocate, collocate_freq, total_freq, MI, LLR, T_score
+        DataFrame with columns: collocate, collocate_frequency, total_frequency,
+        mutual_information, log_likelihood, t_score, dice, log_dice
+        (preceded by node when a list of nodes is given)
     
     Example:
         >>> coll_df = get_collocations(corpus, 'earthquake', measure='MI', top_n=50)
         >>> coll_df.to_csv('earthquake_collocations.csv', index=False)
+        >>> batch_df = get_collocations(corpus, ['climate', 'emissions'], measure='logDice', top_n=20)
     """
     try:
-        from conc.conc import Conc
-        
-        conc = Conc(corpus)
-        
-        # Get collocations
-        coll_result = conc.collocations(
-            node=node,
-            measure=measure,
-            window=window,
-            min_freq=min_freq
-        )
-        
-        # Convert to DataFrame
-        data = []
-        for item in coll_result.results:
-            data.append({
-                'collocate': item['collocate'],
-                'collocate_frequency': item['collocate_frequency'],
-                'total_frequency': item['frequency'],
-                'mutual_information': item.get('MI', 0),
-                'log_likelihood': item.get('LLR', 0),
-                't_score': item.get('T', 0)
-            })
+        if measure not in COLLOCATION_MEASURES:
+            raise ValueError(f"Unknown collocation measure {measure!r} (use one of {list(COLLOCATION_MEASURES)})")
         
-        df = pd.DataFrame(data)
+        nodes = [node] if isinstance(node, str) else list(node)
+        table = collocation_table(corpus, nodes, window=window, min_freq=min_freq)
         
+        # Order by node (in the order given), then by the measure, best first
+        order = {n: i for i, n in enumerate(nodes)}
+        table = table.with_columns(pl.col('node').replace_strict(order, return_dtype=pl.Int64).alias('_order'))
+        table = table.sort(['_order', COLLOCATION_MEASURES[measure]], descending=[False, True], nulls_last=True)
         if top_n:
-            df = df.head(top_n)
+            table = table.filter(pl.int_range(pl.len()).over('_order') < top_n)
+        table = table.drop('_order')
+        if isinstance(node, str):
+            table = table.drop('node')
+        
+        df = _to_pandas(table)
         
-        logger.info(f"Generated collocations for '{node}': {len(df)} collocates")
+        logger.info(f"Generated collocations for {', '.join(repr(n) for n in nodes[:5])}"
+                    f"{' ...' if len(nodes) > 5 else ''}: {len(df)} collocates")
         
         return df
         
@@ -297,76 +1214,358 @@ def get_collocations(corpus,
         return pd.DataFrame()
 
 
+# ============================================================================
+# Keyness
+# ============================================================================
+#
+# Keyness only needs each corpus' type -> frequency table and its word token
+# total. Whole corpora are read from vocab.parquet, which a .listcorpus
+# (a frequency list, e.g. the BNC) also provides, so a reference is never
+# loaded token by token; the measures are computed column-wise over the
+# joined vocabulary. The word frequency table of a whole corpus is saved next
+# to it (see corpus_store.py), so repeated runs against the same reference
+# read a ready-made table instead of filtering vocab.parquet again.
+
+# Save and reuse frequency tables (rebuilt when the corpus changes)
+CACHE_FREQUENCY_TABLES = True
+
+# get_keywords() measure -> column the results are ordered by
+KEYWORD_MEASURES = {
+    'LLR': 'log_likelihood',
+    'RR': 'relative_risk',
+    'LR': 'log_ratio',
+    '%DIFF': 'effect_size',
+}
+
+
+def _keyness_frequencies(corpus, where: Optional[pl.Expr] = None) -> pl.LazyFrame:
+    """
+    Lazy token, frequency table of a corpus' word types (case-insensitive,
+    punctuation and space tokens excluded).
+    
+    corpus may be a Corpus, ListCorpus or SubcorpusView, or the path of a
+    .corpus or .listcorpus directory. Whole corpora use the saved frequency
+    table (built from vocab.parquet on first use); only document selections
+    (a view or where=) are counted from the tokens.
+    """
+    path = Path(corpus) if isinstance(corpus, (str, Path)) else Path(corpus.corpus_path)
+    whole_corpus = where is None and not isinstance(corpus, SubcorpusView)
+    if whole_corpus and CACHE_FREQUENCY_TABLES:
+        table = load_frequency_table(path, build=(path / 'vocab.parquet').is_file())
+        if table is not None:
+            return table.lazy()
+    
+    if not (path / 'vocab.parquet').is_file():
+        raise FileNotFoundError(f"No vocab.parquet in {path} - keyness needs the corpus' frequency table")
+    
+    vocab = (
+        pl.scan_parquet(path / 'vocab.parquet')
+        .filter(pl.col('frequency_lower').is_not_null() & ~pl.col('is_punct') & ~pl.col('is_space'))
+    )
+    if isinstance(corpus, (str, Path)):
+        scan = CorpusScan(path) if where is not None else None
+    else:
+        where = _where(corpus, where)
+        scan = _scan(corpus) if where is not None else None
+    
+    if scan is not None:
+        counts = scan.frequencies(where=where)
+        vocab = vocab.select('token_id', 'token').join(counts, on='token_id', how='inner')
+    elif isinstance(corpus, SubcorpusView):
+        vocab = vocab.with_columns(pl.lit(pl.Series(corpus.frequencies())).gather(pl.col('token_id')).alias('frequency'))
+    else:
+        vocab = vocab.with_columns(pl.col('frequency_lower').alias('frequency'))
+    
+    return vocab.filter(pl.col('frequency') > 0).select('token', pl.col('frequency').cast(pl.Int64))
+
+
+def keyness_table(frequencies: pl.LazyFrame,
+                  target_total: int,
+                  reference_total: int,
+                  normalize_by: int = 10000) -> pl.LazyFrame:
+    """
+    Add keyness measures to a frame of token, frequency, frequency_reference.
+    
+    Measures follow Conc (and the UCREL log-likelihood wizard):
+    - log_likelihood: G2 = 2 * (a * ln(a / E1) + b * ln(b / E2)) with
+      E1 = c * (a + b) / (c + d) and E2 = d * (a + b) / (c + d)
+    - relative_risk: ratio of normalized frequencies
+    - log_ratio: log2 of relative_risk
+    - effect_size: %DIFF, the percentage difference of the normalized frequencies
+    
+    A frequency of 0 counts as half an occurrence in relative_risk,
+    log_ratio and effect_size, so they stay finite.
+    
+    Arguments:
+        frequencies: Frame with token, frequency, frequency_reference
+        target_total: Word tokens in the target corpus (c)
+        reference_total: Word tokens in the reference corpus (d)
+        normalize_by: Normalize frequencies per N tokens
+    
+    Returns:
+        LazyFrame with token, frequency, frequency_reference,
+        normalized_frequency, normalized_frequency_reference, relative_risk,
+        log_ratio, log_likelihood, effect_size
+    
+    Example:
+        >>> table = keyness_table(joined.lazy(), 250_000, 99_015_558).collect()
+    """
+    a, b = pl.col('frequency'), pl.col('frequency_reference')
+    c, d = float(max(target_total, 1)), float(max(reference_total, 1))
+    expected = (a + b) / (c + d)
+    
+    def g2_term(observed: pl.Expr, expected: pl.Expr) -> pl.Expr:
+        return pl.when(observed > 0).then(observed * (observed / expected).log()).otherwise(0.0)
+    
+    return (
+        frequencies
+        .with_columns(
+            (a / c * normalize_by).alias('normalized_frequency'),
+            (b / d * normalize_by).alias('normalized_frequency_reference'),
+            (2 * (g2_term(a, c * expected) + g2_term(b, d * expected))).alias('log_likelihood'),
+        )
+        .with_columns(
+            pl.when(a > 0).then(pl.col('normalized_frequency')).otherwise(0.5 * normalize_by / c).alias('_nf'),
+            pl.when(b > 0).then(pl.col('normalized_frequency_reference')).otherwise(0.5 * normalize_by / d).alias('_nf_reference'),
+        )
+        .with_columns(
+            (pl.col('_nf') / pl.col('_nf_reference')).alias('relative_risk'),
+            (pl.col('_nf').log(2) - pl.col('_nf_reference').log(2)).alias('log_ratio'),
+            ((pl.col('_nf') - pl.col('_nf_reference')) * 100 / pl.col('_nf_reference')).alias('effect_size'),
+        )
+        .select('token', 'frequency', 'frequency_reference', 'normalized_frequency',
+                'normalized_frequency_reference', 'relative_risk', 'log_ratio',
+                'log_likelihood', 'effect_size')
+    )
+
+
 def get_keywords(corpus,
                 reference_corpus,
                 measure: str = 'LLR',
                 min_freq: int = 5,
-                top_n: Optional[int] = None) -> pd.DataFrame:
+                top_n: Optional[int] = None,
+                normalize_by: int = 10000,
+                exclude_negative: bool = True,
+                where: Optional[pl.Expr] = None) -> pd.DataFrame:
     """
     Get keyword analysis comparing two corpora.
     
+    Only the type frequencies of the two corpora are used, so the reference
+    can be a frequency list (.listcorpus, e.g. the BNC) as well as a full
+    corpus, and is never loaded token by token.
+    
     Arguments:
-        corpus: Conc Corpus object (target)
-        reference_corpus: Conc Corpus object (reference)
-        measure: Statistical measure ('LLR', 'RR', 'MI')
+        corpus: Conc Corpus object or SubcorpusView (target)
+        reference_corpus: Conc Corpus, ListCorpus or SubcorpusView, or the
+                          path of a .corpus / .listcorpus directory (reference)
+        measure: Measure to rank keywords by ('LLR', 'RR', 'LR' for log
+                 ratio, '%DIFF' for effect size)
         min_freq: Minimum frequency in target corpus
         top_n: Return top N keywords
+        normalize_by: Normalize frequencies per N tokens
+        exclude_negative: Drop tokens relatively less frequent in the target
+        where: Optional predicate over the target's metadata.parquet columns
     
     Returns:
-        DataFrame with columns: keyword, freq_target, freq_ref, norm_target, 
-                               norm_ref, relative_risk, log_likelihood
+        DataFrame with columns: keyword, freq_target, freq_reference,
+                               normalized_target, normalized_reference,
+                               relative_risk, log_ratio, log_likelihood,
+                               effect_size
     
     Example:
         >>> target = Corpus().load('quake-stories.corpus')
-        >>> reference = Corpus().load('brown.corpus')
-        >>> kw_df = get_keywords(target, reference, top_n=100)
+        >>> kw_df = get_keywords(target, 'corpora/bnc.listcorpus', top_n=100)
         >>> kw_df.to_csv('keywords.csv', index=False)
     """
     try:
-        from conc.conc import Conc
+        return _keywords(corpus, reference_corpus, measure, min_freq, top_n,
+                         normalize_by, exclude_negative, where)
         
-        conc = Conc(corpus)
-        conc.set_reference_corpus(reference_corpus)
+    except Exception as e:
+        logger.error(f"Error generating keywords: {e}")
+        return pd.DataFrame()
+
+
+def _keywords(corpus,
+              reference_corpus,
+              measure: str = 'LLR',
+              min_freq: int = 5,
+              top_n: Optional[int] = None,
+              normalize_by: int = 10000,
+              exclude_negative: bool = True,
+              where: Optional[pl.Expr] = None) -> pd.DataFrame:
+    """get_keywords() without the error handling: failures raise instead of returning an empty result."""
+    if measure not in KEYWORD_MEASURES:
+        raise ValueError(f"Unknown keyness measure {measure!r} (use one of {list(KEYWORD_MEASURES)})")
+    
+    target = _keyness_frequencies(corpus, where).collect()
+    reference = _keyness_frequencies(reference_corpus).collect()
+    target_total = int(target['frequency'].sum())
+    reference_total = int(reference['frequency'].sum())
+    
+    if min_freq > 1:
+        target = target.filter(pl.col('frequency') >= min_freq)
+    
+    joined = (
+        target.lazy()
+        .join(reference.lazy().rename({'frequency': 'frequency_reference'}), on='token', how='left')
+        .with_columns(pl.col('frequency_reference').fill_null(0))
+    )
+    keywords = keyness_table(joined, target_total, reference_total, normalize_by)
+    if exclude_negative:
+        keywords = keywords.filter(pl.col('relative_risk') >= 1)
+    keywords = keywords.collect()
+    keywords = keywords[_top_k(keywords[KEYWORD_MEASURES[measure]].to_numpy(), top_n)]
+    
+    df = _to_pandas(keywords.select(
+        pl.col('token').alias('keyword'),
+        pl.col('frequency').alias('freq_target'),
+        pl.col('frequency_reference').alias('freq_reference'),
+        pl.col('normalized_frequency').alias('normalized_target'),
+        pl.col('normalized_frequency_reference').alias('normalized_reference'),
+        'relative_risk', 'log_ratio', 'log_likelihood', 'effect_size'
+    ))
+    
+    logger.info(f"Generated keywords: {len(df)} keywords "
+                f"({target_total:,} target vs {reference_total:,} reference word tokens)")
+    
+    return df
+
+
+def count_ngrams(corpus,
+                 n_values: Optional[List[int]] = None,
+                 min_freq: int = 5,
+                 exclude_punctuation: bool = True,
+                 normalize_by: int = 1000,
+                 top_n: Optional[int] = None,
+                 where: Optional[pl.Expr] = None) -> Dict[int, pd.DataFrame]:
+    """
+    Count n-grams for several values of n in one pass over the token stream.
+    
+    Works directly on the orth_index column of tokens.parquet. Punctuation
+    (corpus.json punct_tokens) and document boundaries are masked out before
+    counting, so n-grams never span punctuation or two documents. The token
+    array is processed in TOKEN_CHUNK_SIZE slices and partial counts are
+    merged, so working memory depends on the number of distinct n-grams
+    rather than on corpus size.
+    
+    With where set, n-grams are counted by a lazy query over tokens.parquet
+    that reads only the documents matching the metadata predicate.
+    
+    Arguments:
+        corpus: Conc Corpus object
+        n_values: Sizes of n-grams to count (e.g., [2, 3, 4, 5]; default [2, 3])
+        min_freq: Minimum frequency
+        exclude_punctuation: Exclude n-grams with punctuation
+        normalize_by: Normalize frequencies per N tokens (word tokens when
+                      exclude_punctuation is set, as in get_frequency_table)
+        top_n: Return top N n-grams for each n
+        where: Optional predicate over metadata.parquet columns
+               (e.g., pl.col('year') == 2019) to count matching documents only
+    
+    Returns:
+        Dictionary of n -> DataFrame with columns: ngram, frequency, normalized_frequency
+    
+    Example:
+        >>> ngrams = count_ngrams(corpus, n_values=[2, 3, 4, 5], top_n=100)
+        >>> ngrams[4].head()
+    """
+    n_values = n_values or [2, 3]
+    try:
+        return _ngram_tables(corpus, n_values, min_freq, exclude_punctuation,
+                             normalize_by, top_n, where)
         
-        # Get keywords
-        kw_result = conc.keywords(
-            measure=measure,
-            min_freq=min_freq
+    except Exception as e:
+        logger.error(f"Error generating n-grams: {e}")
+        return {n: pd.DataFrame() for n in n_values}
+
+
+def _ngram_tables(corpus,
+                  n_values: List[int],
+                  min_freq: int = 5,
+                  exclude_punctuation: bool = True,
+                  normalize_by: int = 1000,
+                  top_n: Optional[int] = None,
+                  where: Optional[pl.Expr] = None) -> Dict[int, pd.DataFrame]:
+    """count_ngrams() without the error handling: failures raise instead of returning an empty result."""
+    tokens = _vocab_tokens(corpus)
+    n_values = sorted(set(n_values))
+    
+    if where is not None:
+        scan = _scan(corpus)
+        where = _where(corpus, where)
+        metrics = scan.metrics(where=where).collect()
+        total_tokens = metrics['word_tokens' if exclude_punctuation else 'total_tokens'].item()
+        partial_counts = {
+            n: [scan.ngrams(n, where=where, exclude_punctuation=exclude_punctuation).collect()]
+            for n in n_values
+        }
+    else:
+        total_tokens = corpus.word_token_count if exclude_punctuation else corpus.token_count
+        partial_counts = _count_ngram_chunks(corpus, n_values, exclude_punctuation)
+    
+    results = {}
+    for n in n_values:
+        columns = [f't{k}' for k in range(n)]
+        counts = (
+            pl.concat(partial_counts.pop(n))
+            .group_by(columns)
+            .agg(pl.col('frequency').sum())
+            .filter(pl.col('frequency') >= min_freq)
         )
+        counts = counts[_top_k(counts['frequency'].to_numpy(), top_n)]
         
-        # Convert to DataFrame
-        data = []
-        for item in kw_result.results:
-            data.append({
-                'keyword': item['token'],
-                'freq_target': item['frequency'],
-                'freq_reference': item['frequency_reference'],
-                'normalized_target': item['normalized_frequency'],
-                'normalized_reference': item['normalized_frequency_reference'],
-                'relative_risk': item.get('RR', 0),
-                'log_likelihood': item.get('LLR', 0),
-                'effect_size': item.get('effect_size', 0)
-            })
-        
-        df = pd.DataFrame(data)
+        df = _to_pandas(counts.select(
+            pl.concat_str([pl.lit(tokens).gather(pl.col(f't{k}')) for k in range(n)], separator=' ').alias('ngram'),
+            pl.col('frequency'),
+            (pl.col('frequency') / max(total_tokens, 1) * normalize_by).alias('normalized_frequency')
+        ))
         
-        if top_n:
-            df = df.head(top_n)
+        results[n] = df
+        logger.info(f"Generated {n}-grams: {len(df)} n-grams")
+    
+    return results
+
+
+def _count_ngram_chunks(corpus, n_values: List[int], exclude_punctuation: bool) -> Dict[int, List[pl.DataFrame]]:
+    """Partial n-gram counts (t0..t{n-1}, frequency) for each TOKEN_CHUNK_SIZE slice."""
+    orth_index = _token_column(corpus, 'orth_index')
+    lookahead = max(n_values) - 1
+    partial_counts = {n: [] for n in n_values}
+    
+    for start in range(0, len(orth_index), TOKEN_CHUNK_SIZE):
+        stop = min(start + TOKEN_CHUNK_SIZE, len(orth_index))
         
-        logger.info(f"Generated keywords: {len(df)} keywords")
+        # The slice includes enough lookahead for n-grams that start
+        # before stop to be counted whole
+        window_stop = min(stop + lookahead, len(orth_index))
+        mask = _token_mask(corpus, start, window_stop, exclude_punctuation)
+        window = np.asarray(orth_index[start:window_stop])
         
-        return df
+        # Single pass: for every position, how many valid tokens follow it
+        # before the next masked position (punctuation or document boundary)
+        positions = np.arange(len(mask), dtype=np.int64)
+        next_masked = np.where(mask, len(mask), positions)
+        next_masked = np.minimum.accumulate(next_masked[::-1])[::-1]
+        run_length = (next_masked - positions)[:stop - start]
         
-    except Exception as e:
-        logger.error(f"Error generating keywords: {e}")
-        return pd.DataFrame()
+        for n in n_values:
+            starts = np.flatnonzero(run_length >= n)
+            partial_counts[n].append(
+                pl.DataFrame({f't{k}': window[starts + k] for k in range(n)})
+                .group_by([f't{k}' for k in range(n)])
+                .len(name='frequency')
+            )
+    
+    return partial_counts
 
 
 def get_ngrams(corpus,
               n: int = 2,
               min_freq: int = 5,
               exclude_punctuation: bool = True,
-              top_n: Optional[int] = None) -> pd.DataFrame:
+              top_n: Optional[int] = None,
+              where: Optional[pl.Expr] = None) -> pd.DataFrame:
     """
     Get n-gram frequency analysis.
     
@@ -376,6 +1575,7 @@ def get_ngrams(corpus,
         min_freq: Minimum frequency
         exclude_punctuation: Exclude n-grams with punctuation
         top_n: Return top N n-grams
+        where: Optional predicate over metadata.parquet columns
     
     Returns:
         DataFrame with columns: ngram, frequency, normalized_frequency
@@ -384,58 +1584,138 @@ def get_ngrams(corpus,
         >>> bigrams = get_ngrams(corpus, n=2, top_n=100)
         >>> trigrams = get_ngrams(corpus, n=3, top_n=100)
     """
-    try:
-        from conc.conc import Conc
-        
-        conc = Conc(corpus)
-        
-        # Get n-grams (using clusters function)
-        ngram_result = conc.clusters(
-            n=n,
-            min_freq=min_freq
-        )
-        
-        # Convert to DataFrame
-        data = []
-        for item in ngram_result.results:
-            ngram = ' '.join(item['cluster'])
+    return count_ngrams(corpus,
+                        n_values=[n],
+                        min_freq=min_freq,
+                        exclude_punctuation=exclude_punctuation,
+                        top_n=top_n,
+                        where=where)[n]
+
+
+def run_stages(stages: Dict[str, Tuple[Callable[[Dict[str, Any]], Any], List[str]]],
+               max_workers: Optional[int] = None) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """
+    Run analysis stages on a thread pool, respecting their dependencies.
+    
+    A stage is started as soon as every stage it depends on has finished, so
+    independent stages run concurrently and the total time is bounded by the
+    slowest chain of stages rather than the sum of all of them. A stage
+    fails if it raises or returns None; an empty table is a valid result.
+    The stages that depend on a failed stage are skipped. Start time and
+    duration are recorded for failed stages too.
+    
+    Each stage function is called with a dictionary holding the results of
+    the stages it depends on.
+    
+    Arguments:
+        stages: Mapping of stage name -> (function, list of stage names it depends on)
+        max_workers: Maximum number of stages to run at once (default: number of stages)
+    
+    Returns:
+        Tuple of (results by stage name, DataFrame timing log with columns:
+                  stage, depends_on, status, started, seconds)
+    
+    Example:
+        >>> results, timings = run_stages({
+        ...     'ngrams': (lambda deps: count_ngrams(corpus, n_values=[2, 3]), []),
+        ...     'bigrams': (lambda deps: deps['ngrams'][2].to_csv('bigrams.csv'), ['ngrams']),
+        ... })
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    
+    for name, (_, depends_on) in stages.items():
+        missing = [d for d in depends_on if d not in stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {missing}")
+    
+    results = {}
+    timings = {}
+    stage_times = {}
+    pending = dict(stages)
+    running = {}
+    start = time.perf_counter()
+    
+    def timed(name, fn, deps):
+        stage_start = time.perf_counter()
+        try:
+            return fn(deps)
+        finally:
+            stage_times[name] = (stage_start - start, time.perf_counter() - stage_start)
+    
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(stages), 1)) as executor:
+        while pending or running:
+            # Skip stages whose dependencies failed or were skipped
+            for name, (_, depends_on) in list(pending.items()):
+                if any(timings.get(d, {}).get('status') in ('failed', 'skipped') for d in depends_on):
+                    timings[name] = {'status': 'skipped', 'started': None, 'seconds': 0.0}
+                    logger.warning(f"Stage '{name}' skipped (dependency did not complete)")
+                    del pending[name]
             
-            # Skip if contains punctuation and excluding
-            if exclude_punctuation and any(not tok.isalnum() for tok in item['cluster']):
-                continue
+            # Start every stage whose dependencies are done
+            for name, (fn, depends_on) in list(pending.items()):
+                if all(timings.get(d, {}).get('status') == 'ok' for d in depends_on):
+                    deps = {d: results[d] for d in depends_on}
+                    running[executor.submit(timed, name, fn, deps)] = name
+                    del pending[name]
             
-            data.append({
-                'ngram': ngram,
-                'frequency': item['frequency'],
-                'normalized_frequency': item.get('normalized_frequency', 0)
-            })
-        
-        df = pd.DataFrame(data)
-        
-        if top_n:
-            df = df.head(top_n)
-        
-        logger.info(f"Generated {n}-grams: {len(df)} n-grams")
-        
-        return df
-        
-    except Exception as e:
-        logger.error(f"Error generating n-grams: {e}")
-        return pd.DataFrame()
+            if not running:
+                if pending:
+                    raise ValueError(f"Stage dependencies cannot be resolved (cycle?): {sorted(pending)}")
+                break
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                started, seconds = stage_times[name]
+                timings[name] = {'status': 'failed', 'started': started, 'seconds': seconds}
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Stage '{name}' failed: {e}")
+                    continue
+                if results[name] is None:
+                    logger.error(f"Stage '{name}' failed: no result")
+                    continue
+                timings[name]['status'] = 'ok'
+                logger.info(f"Stage '{name}' finished in {seconds:.3f}s")
+    
+    timings_df = pd.DataFrame([
+        {
+            'stage': name,
+            'depends_on': ' '.join(stages[name][1]),
+            **timings[name]
+        }
+        for name in stages
+    ])
+    
+    logger.info(f"Ran {len(stages)} stages in {time.perf_counter() - start:.3f}s "
+                f"(sum of stage times {timings_df['seconds'].sum():.3f}s)")
+    
+    return results, timings_df
 
 
 def export_full_analysis(corpus,
                         output_dir: str,
                         reference_corpus=None,
-                        top_n: int = 100):
+                        top_n: int = 100,
+                        max_workers: Optional[int] = None):
     """
     Export comprehensive corpus analysis to CSV files.
     
+    Independent stages (metrics, frequencies, n-grams, keywords) run
+    concurrently - see run_stages(). Bigrams and trigrams are counted
+    together in a single pass by count_ngrams(). The export fails (returns
+    False) if any stage raises; empty tables (e.g. no n-gram reaching
+    min_freq in a small corpus) are written as they are.
+    
     Arguments:
         corpus: Conc Corpus object
         output_dir: Directory to save CSV files
-        reference_corpus: Optional reference corpus for keyword analysis
+        reference_corpus: Optional reference corpus for keyword analysis (a corpus
+                          object or the path of a .corpus / .listcorpus directory)
         top_n: Number of top results to export
+        max_workers: Maximum number of stages to run at once (default: all)
     
     Creates files:
         - metrics.csv: Basic corpus metrics
@@ -443,12 +1723,12 @@ def export_full_analysis(corpus,
         - bigrams.csv: Top bigrams
         - trigrams.csv: Top trigrams
         - keywords.csv: Keywords vs reference (if provided)
+        - stage_timings.csv: Per-stage timing log
     
     Example:
         >>> export_full_analysis(corpus, 'analysis_output/', top_n=200)
     """
     try:
-        from pathlib import Path
         import json
         
         # Create output directory
@@ -457,38 +1737,51 @@ def export_full_analysis(corpus,
         
         logger.info(f"Exporting analysis to {output_dir}")
         
-        # 1. Basic metrics
-        metrics = get_basic_metrics(corpus)
-        metrics_df = pd.DataFrame([metrics])
-        metrics_df.to_csv(output_path / 'metrics.csv', index=False)
-        logger.info(f"Saved metrics.csv")
+        # Stages call the analyses without their error handling, so a failure
+        # raises (and fails the stage) instead of looking like an empty table
+        def export_metrics(deps):
+            metrics = _basic_metrics(corpus)
+            pd.DataFrame([metrics]).to_csv(output_path / 'metrics.csv', index=False)
+            
+            # Also save as JSON for easy reading
+            with open(output_path / 'metrics.json', 'w') as f:
+                json.dump(metrics, f, indent=2)
+            
+            logger.info(f"Saved metrics.csv")
+            return metrics
         
-        # Also save as JSON for easy reading
-        with open(output_path / 'metrics.json', 'w') as f:
-            json.dump(metrics, f, indent=2)
+        def export_csv(df: pd.DataFrame, filename: str, label: str) -> pd.DataFrame:
+            df.to_csv(output_path / filename, index=False)
+            logger.info(f"Saved {filename} ({len(df)} {label})")
+            return df
         
-        # 2. Frequency table
-        freq_df = get_frequency_table(corpus, exclude_punctuation=True, top_n=top_n)
-        freq_df.to_csv(output_path / 'frequencies.csv', index=False)
-        logger.info(f"Saved frequencies.csv ({len(freq_df)} tokens)")
+        stages = {
+            'metrics': (export_metrics, []),
+            'frequencies': (lambda deps: export_csv(
+                _frequency_table(corpus, exclude_punctuation=True, top_n=top_n),
+                'frequencies.csv', 'tokens'), []),
+            'ngrams': (lambda deps: _ngram_tables(corpus, n_values=[2, 3], top_n=top_n), []),
+            'bigrams': (lambda deps: export_csv(
+                deps['ngrams'][2], 'bigrams.csv', 'bigrams'), ['ngrams']),
+            'trigrams': (lambda deps: export_csv(
+                deps['ngrams'][3], 'trigrams.csv', 'trigrams'), ['ngrams']),
+        }
         
-        # 3. Bigrams
-        bigrams_df = get_ngrams(corpus, n=2, top_n=top_n)
-        bigrams_df.to_csv(output_path / 'bigrams.csv', index=False)
-        logger.info(f"Saved bigrams.csv ({len(bigrams_df)} bigrams)")
+        # Keywords (if reference provided)
+        if reference_corpus:
+            stages['keywords'] = (lambda deps: export_csv(
+                _keywords(corpus, reference_corpus, top_n=top_n),
+                'keywords.csv', 'keywords'), [])
         
-        # 4. Trigrams
-        trigrams_df = get_ngrams(corpus, n=3, top_n=top_n)
-        trigrams_df.to_csv(output_path / 'trigrams.csv', index=False)
-        logger.info(f"Saved trigrams.csv ({len(trigrams_df)} trigrams)")
+        _, timings_df = run_stages(stages, max_workers=max_workers)
+        timings_df.to_csv(output_path / 'stage_timings.csv', index=False)
         
-        # 5. Keywords (if reference provided)
-        if reference_corpus:
-            keywords_df = get_keywords(corpus, reference_corpus, top_n=top_n)
-            keywords_df.to_csv(output_path / 'keywords.csv', index=False)
-            logger.info(f"Saved keywords.csv ({len(keywords_df)} keywords)")
+        if (timings_df['status'] != 'ok').any():
+            logger.error(f"Export incomplete: {timings_df.loc[timings_df['status'] != 'ok', 'stage'].tolist()}")
+            return False
         
         logger.info(f"Analysis complete! Files saved to {output_dir}")
+        logger.info(f"Derived data cache: {derived_cache_info()}")
         
         return True
         
@@ -555,30 +1848,176 @@ def compare_corpora(corpus1, corpus2,
         return pd.DataFrame()
 
 
+def expand_corpus_paths(patterns: List[str]) -> List[str]:
+    """
+    Expand corpus paths and glob patterns into a list of .corpus directories.
+    
+    Arguments:
+        patterns: Paths or glob patterns (e.g., 'corpora/*.corpus')
+    
+    Returns:
+        Sorted list of unique directories that contain a corpus.json
+    
+    Example:
+        >>> expand_corpus_paths(['corpora/*.corpus'])
+        ['corpora/labour-nz-first-coalition.corpus', 'corpora/national-led.corpus', ...]
+    """
+    import glob
+    
+    paths = []
+    for pattern in patterns:
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            if (Path(match) / 'corpus.json').is_file():
+                paths.append(str(Path(match)))
+            else:
+                logger.warning(f"Skipping {match}: no corpus.json found")
+    
+    return sorted(set(paths))
+
+
+def _export_corpus_worker(corpus_path: str,
+                          output_dir: str,
+                          reference_path: Optional[str],
+                          top_n: int) -> Dict[str, Union[str, float, bool]]:
+    """Load one corpus and run export_full_analysis on it (runs in a worker process)."""
+    import time
+    from conc.corpus import Corpus
+    
+    timing = {
+        'corpus_path': corpus_path,
+        'output_dir': output_dir,
+        'load_seconds': 0.0,
+        'analysis_seconds': 0.0,
+        'total_seconds': 0.0,
+        'success': False
+    }
+    start = time.perf_counter()
+    
+    try:
+        corpus = Corpus().load(corpus_path)
+        timing['load_seconds'] = time.perf_counter() - start
+        
+        # The reference is passed as a path: keyness only reads its frequency
+        # table, and a .listcorpus cannot be loaded as a Corpus
+        analysis_start = time.perf_counter()
+        timing['success'] = export_full_analysis(corpus, output_dir, reference_path, top_n)
+        timing['analysis_seconds'] = time.perf_counter() - analysis_start
+        
+    except Exception as e:
+        logger.error(f"Error analysing {corpus_path}: {e}")
+    
+    timing['total_seconds'] = time.perf_counter() - start
+    return timing
+
+
+def export_corpora(corpus_paths: List[str],
+                   output_dir: str,
+                   reference_path: Optional[str] = None,
+                   top_n: int = 100,
+                   workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Run export_full_analysis over many corpora in parallel.
+    
+    Each corpus is loaded and analysed in its own worker process and written
+    to output_dir/<corpus-name>/. A per-corpus timing summary is saved to
+    output_dir/timings.csv.
+    
+    Arguments:
+        corpus_paths: Paths or glob patterns of .corpus directories
+        output_dir: Directory to save one sub-directory of CSV files per corpus
+        reference_path: Optional path to a reference .corpus or .listcorpus for keyword analysis
+        top_n: Number of top results to export
+        workers: Number of worker processes (default: number of CPUs)
+    
+    Returns:
+        DataFrame with columns: corpus_path, output_dir, load_seconds,
+                                analysis_seconds, total_seconds, success
+    
+    Example:
+        >>> timings = export_corpora(['corpora/*.corpus'], 'analysis_output/', workers=4)
+        >>> print(timings[['corpus_path', 'total_seconds']])
+    """
+    import os
+    import time
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    try:
+        paths = expand_corpus_paths(corpus_paths)
+        if not paths:
+            logger.error("No corpora found to analyse")
+            return pd.DataFrame()
+        
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+        logger.info(f"Analysing {len(paths)} corpora with {workers} worker(s)")
+        
+        start = time.perf_counter()
+        timings = []
+        # Spawn rather than fork: polars' thread pool does not survive a fork
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {
+                executor.submit(
+                    _export_corpus_worker,
+                    path,
+                    str(output_path / Path(path).name.replace('.corpus', '')),
+                    reference_path,
+                    top_n
+                ): path
+                for path in paths
+            }
+            for future in as_completed(futures):
+                timing = future.result()
+                timings.append(timing)
+                logger.info(f"Finished {timing['corpus_path']} in {timing['total_seconds']:.2f}s "
+                            f"({'ok' if timing['success'] else 'failed'})")
+        
+        timings_df = pd.DataFrame(timings).sort_values('corpus_path').reset_index(drop=True)
+        timings_df.to_csv(output_path / 'timings.csv', index=False)
+        
+        wall_clock = time.perf_counter() - start
+        logger.info(f"Batch complete: {len(paths)} corpora in {wall_clock:.2f}s wall-clock "
+                    f"({timings_df['total_seconds'].sum():.2f}s total corpus time)")
+        
+        return timings_df
+        
+    except Exception as e:
+        logger.error(f"Error in batch export: {e}")
+        return pd.DataFrame()
+
+
 # Command-line interface
 if __name__ == '__main__':
     import argparse
+    import glob
     from conc.corpus import Corpus
     
-    parser = argparse.ArgumentParser(description='Analyze a Conc corpus')
-    parser.add_argument('corpus_path', help='Path to .corpus directory')
+    parser = argparse.ArgumentParser(description='Analyze one or more Conc corpora')
+    parser.add_argument('corpus_path', nargs='+',
+                       help='Path to .corpus directory (several paths or a glob such as "corpora/*.corpus" run in batch mode)')
     parser.add_argument('--output', '-o', default='analysis_output/', 
                        help='Output directory for analysis files')
-    parser.add_argument('--reference', '-r', help='Path to reference .corpus for keyword analysis')
+    parser.add_argument('--reference', '-r', help='Path to reference .corpus or .listcorpus for keyword analysis')
     parser.add_argument('--top-n', '-n', type=int, default=100, 
                        help='Number of top results to export')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                       help='Worker processes for batch mode (default: number of CPUs)')
     
     args = parser.parse_args()
     
-    # Load corpus
-    logger.info(f"Loading corpus from {args.corpus_path}")
-    corpus = Corpus().load(args.corpus_path)
+    # Batch mode: several corpora (or a glob) fan out over a process pool
+    if len(args.corpus_path) > 1 or any(glob.has_magic(p) for p in args.corpus_path):
+        export_corpora(args.corpus_path, args.output, args.reference, args.top_n, args.workers)
+        raise SystemExit(0)
+    
+    corpus_path = args.corpus_path[0]
     
-    # Load reference if provided
-    reference = None
-    if args.reference:
-        logger.info(f"Loading reference corpus from {args.reference}")
-        reference = Corpus().load(args.reference)
+    # Load corpus
+    logger.info(f"Loading corpus from {corpus_path}")
+    corpus = Corpus().load(corpus_path)
     
-    # Run full analysis
-    export_full_analysis(corpus, args.output, reference, args.top_n)
+    # Run full analysis (the reference, if any, is read from its path by get_keywords)
+    export_full_analysis(corpus, args.output, args.reference, args.top_n)
@@ -4,31 +4,82 @@ Build RNZ Climate National and International Conc Corpora from CSV files
 from conc.corpus import Corpus
 from pathlib import Path
 import polars as pl
+import os
 import tempfile
 import shutil
 
+try:
+    from .corpus_build import build_corpus_from_frame, build_corpora_from_frames
+    from .corpus_dedupe import find_near_duplicates
+except ImportError:
+    from corpus_build import build_corpus_from_frame, build_corpora_from_frames
+    from corpus_dedupe import find_near_duplicates
+
 # Paths
 DATA_PATH = Path('D:/github/DIGI405/data_raw')
 CORPORA_PATH = Path('D:/github/DIGI405/corpora')
 
-# Load CSV files
-print("Loading CSV files...")
-national_df = pl.read_csv(DATA_PATH / 'rnz_climate_national.csv.gz')
-international_df = pl.read_csv(DATA_PATH / 'rnz_climate_international.csv.gz')
+# Document metadata carried into metadata.parquet (columns missing from a CSV are skipped)
+METADATA_COLUMNS = ['id', 'date', 'category']
+
+# Tokeniser processes per build (1 = tokenise in this process)
+BUILD_WORKERS = os.cpu_count() or 1
 
-print(f"National: {len(national_df):,} articles")
-print(f"International: {len(international_df):,} articles")
+# RNZ republishes and updates articles under new URLs. 'flag' records
+# near-duplicate clusters (dup_cluster, is_duplicate) in metadata.parquet,
+# 'drop' also leaves the later copies out of the corpus, None skips the check
+DEDUPE = 'flag'
+DEDUPE_THRESHOLD = 0.8
 
-def build_corpus_from_df(df, corpus_name, description):
-    """Build a Conc corpus from a dataframe with fulltext column"""
+def build_corpus_from_df(df, corpus_name, description, streaming=True, workers=BUILD_WORKERS,
+                         dedupe=DEDUPE, dedupe_threshold=DEDUPE_THRESHOLD):
+    """Build a Conc corpus from a dataframe with fulltext column
+    
+    With streaming=True (default) texts are fed straight from the dataframe
+    into spaCy and id/date/category are stored in metadata.parquet.
+    Documents are tokenised by `workers` processes in parallel.
+    Near-duplicate articles are flagged or dropped according to `dedupe`.
+    streaming=False uses the original route via temporary text files; with
+    dedupe='flag' the dup_cluster/is_duplicate columns are passed to Conc in
+    a metadata CSV alongside the files.
+    """
     print(f"\nBuilding {corpus_name}...")
     
+    if streaming:
+        print(f"Building corpus from {len(df):,} rows (this may take several minutes)...")
+        corpus = build_corpus_from_frame(
+            df,
+            str(CORPORA_PATH) + '/',
+            name=corpus_name,
+            description=description,
+            text_column='fulltext',
+            metadata_columns=METADATA_COLUMNS,
+            workers=workers,
+            dedupe=dedupe,
+            dedupe_threshold=dedupe_threshold
+        )
+        print(f"Corpus saved")
+        return corpus
+    
+    if dedupe not in (None, 'flag', 'drop'):
+        raise ValueError(f"dedupe must be 'flag' or 'drop', not '{dedupe}'")
+    
+    flag_columns = []
+    if dedupe:
+        clusters = find_near_duplicates(df['fulltext'].fill_null(''), threshold=dedupe_threshold)
+        df = df.with_columns(dup_cluster=clusters['dup_cluster'], is_duplicate=clusters['is_duplicate'])
+        if dedupe == 'drop':
+            df = df.filter(~pl.col('is_duplicate'))
+        else:
+            flag_columns = ['dup_cluster', 'is_duplicate']
+    
     # Create temporary directory for text files
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
         
         # Write each article to a separate text file
         print(f"Writing {len(df):,} text files...")
+        flags = []
         for i, row in enumerate(df.iter_rows(named=True)):
             if row['fulltext']:
                 # Use article ID if available, otherwise use index
@@ -36,6 +87,15 @@ def build_corpus_from_df(df, corpus_name, description):
                 filename = f"{article_id}.txt"
                 file_path = temp_path / filename
                 file_path.write_text(row['fulltext'], encoding='utf-8')
+                flags.append({'file': filename, **{col: row[col] for col in flag_columns}})
+        
+        # Duplicate flags go to Conc as a metadata CSV keyed on file name
+        metadata_options = {}
+        if flag_columns:
+            metadata_file = temp_path / 'metadata.csv'
+            pl.DataFrame(flags).write_csv(metadata_file)
+            metadata_options = {'metadata_file': str(metadata_file),
+                                'metadata_columns': list(flag_columns)}
         
         # Build corpus from text files
         print(f"Building corpus (this may take several minutes)...")
@@ -44,30 +104,49 @@ def build_corpus_from_df(df, corpus_name, description):
             description=description
         ).build_from_files(
             str(temp_path),
-            str(CORPORA_PATH) + '/'
+            str(CORPORA_PATH) + '/',
+            **metadata_options
         )
         
         print(f"Corpus saved")
         return corpus
 
-# Build national corpus
-national_corpus = build_corpus_from_df(
-    national_df,
-    corpus_name='RNZ Climate National',
-    description='Radio New Zealand climate coverage focusing on domestic New Zealand news (2008-2024)'
-)
+# Worker processes re-import this module, so the build only runs when the
+# script is executed directly
+if __name__ == '__main__':
+    # Load CSV files
+    print("Loading CSV files...")
+    national_df = pl.read_csv(DATA_PATH / 'rnz_climate_national.csv.gz')
+    international_df = pl.read_csv(DATA_PATH / 'rnz_climate_international.csv.gz')
+
+    print(f"National: {len(national_df):,} articles")
+    print(f"International: {len(international_df):,} articles")
 
-# Build international corpus  
-international_corpus = build_corpus_from_df(
-    international_df,
-    corpus_name='RNZ Climate International',
-    description='Radio New Zealand climate coverage focusing on international/world news (2008-2024)'
-)
+    # Build both corpora in one run with a shared vocabulary, so token ids
+    # can be compared between them directly (e.g. for keywords)
+    corpora = build_corpora_from_frames(
+        {
+            'RNZ Climate National': national_df,
+            'RNZ Climate International': international_df
+        },
+        str(CORPORA_PATH) + '/',
+        descriptions={
+            'RNZ Climate National': 'Radio New Zealand climate coverage focusing on domestic New Zealand news (2008-2024)',
+            'RNZ Climate International': 'Radio New Zealand climate coverage focusing on international/world news (2008-2024)'
+        },
+        text_column='fulltext',
+        metadata_columns=METADATA_COLUMNS,
+        workers=BUILD_WORKERS,
+        dedupe=DEDUPE,
+        dedupe_threshold=DEDUPE_THRESHOLD
+    )
+    national_corpus = corpora['RNZ Climate National']
+    international_corpus = corpora['RNZ Climate International']
 
-print("\n" + "="*60)
-print("Both corpora built successfully!")
-print("="*60)
-print(f"\nNational corpus:")
-national_corpus.summary()
-print(f"\nInternational corpus:")
-international_corpus.summary()
+    print("\n" + "="*60)
+    print("Both corpora built successfully!")
+    print("="*60)
+    print(f"\nNational corpus:")
+    national_corpus.summary()
+    print(f"\nInternational corpus:")
+    international_corpus.summary()
@@ -0,0 +1,862 @@
+"""
+corpus_build.py
+
+Purpose:
+    Build Conc corpora directly from in-memory data, without writing every
+    document to a temporary text file first.
+
+    - build_corpus_from_frame: tokenise the text column of a polars DataFrame
+      as a stream and store the chosen metadata columns (id, date, category,
+      ...) in metadata.parquet, one row per document in build order.
+    - build_corpus_from_files: the same for a folder of .txt files.
+    - build_corpus_from_parquet: the same for a Parquet file or a folder of
+      Parquet part files, read one part at a time so memory stays bounded.
+    - build_corpora_from_frames: several corpora in one run, sharing one
+      vocabulary so token ids are comparable across them.
+    - dedupe='flag' / 'drop' (frame builds): MinHash/LSH near-duplicate
+      detection (corpus_dedupe.py); cluster ids go into metadata.parquet.
+    - append_to_corpus: add new documents to an existing corpus, tokenising
+      only the new documents.
+    - Parallel builds (workers > 1): documents are split into shards that are
+      tokenised by separate processes; per-shard vocabularies are merged and
+      Conc assigns the global token ids, so the corpus is identical to a
+      serial build.
+
+Requirements:
+    pip install conc polars
+    python -m spacy download en_core_web_sm
+
+Usage:
+    from scripts.corpus_build import build_corpus_from_frame
+
+    df = pl.read_csv('data_raw/rnz_climate_national.csv.gz')
+    corpus = build_corpus_from_frame(
+        df, 'corpora/',
+        name='RNZ Climate National',
+        description='Radio New Zealand climate coverage',
+        text_column='fulltext',
+        metadata_columns=['id', 'date', 'category'],
+        workers=4
+    )
+
+Author: DIGI405 Course Materials
+Date: 2026-02-24
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+try:
+    from .corpus_store import SHARED_VOCAB_FILE
+    from .corpus_dedupe import DEDUPE_THRESHOLD, find_near_duplicates
+except ImportError:
+    from corpus_store import SHARED_VOCAB_FILE
+    from corpus_dedupe import DEDUPE_THRESHOLD, find_near_duplicates
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+# Texts are pulled from the DataFrame this many rows at a time, so only one
+# slice of Python strings exists alongside the (Arrow) DataFrame
+TEXT_BATCH_SIZE = 5000
+
+# Documents per shard in a parallel build
+SHARD_SIZE = 1000
+
+
+def _iter_texts(df: pl.DataFrame, text_column: str, batch_size: int = TEXT_BATCH_SIZE) -> Iterator[str]:
+    """Yield the values of text_column in row order, one slice at a time."""
+    for slice_df in df.select(text_column).iter_slices(n_rows=batch_size):
+        yield from slice_df.get_column(text_column).to_list()
+
+
+def _has_text(text_column: str) -> pl.Expr:
+    """Filter expression for rows with non-empty text."""
+    return pl.col(text_column).is_not_null() & (pl.col(text_column).str.len_chars() > 0)
+
+
+def _document_frame(df: pl.DataFrame, text_column: str, metadata_columns: Optional[List[str]]) -> pl.DataFrame:
+    """
+    Documents to build: rows with non-empty text, plus the metadata columns that exist.
+
+    A source_row column records each document's row in df. Missing metadata
+    columns are logged and left out rather than failing the build.
+    """
+    if text_column not in df.columns:
+        raise ValueError(f"Text column '{text_column}' not found (columns: {df.columns})")
+
+    metadata_columns = metadata_columns or []
+    missing = [c for c in metadata_columns if c not in df.columns]
+    if missing:
+        logger.warning(f"Metadata columns not found and skipped: {missing}")
+
+    columns = [c for c in metadata_columns if c in df.columns and c != text_column]
+    documents = df.with_row_index('source_row').select([text_column, 'source_row'] + columns).filter(
+        _has_text(text_column)
+    )
+
+    skipped = len(df) - len(documents)
+    if skipped:
+        logger.info(f"Skipping {skipped:,} rows with empty {text_column}")
+
+    return documents
+
+
+def _dedupe_documents(documents: pl.DataFrame, text_column: str,
+                      dedupe: Optional[str], threshold: float) -> pl.DataFrame:
+    """
+    Add dup_cluster / is_duplicate columns, and with dedupe='drop' remove the duplicates.
+
+    dup_cluster holds the source_row of the cluster's first document, which
+    is always kept, so cluster ids refer to rows present in the metadata.
+    """
+    if not dedupe:
+        return documents
+    if dedupe not in ('flag', 'drop'):
+        raise ValueError(f"dedupe must be 'flag' or 'drop', not '{dedupe}'")
+
+    clusters = find_near_duplicates(documents.get_column(text_column), threshold=threshold)
+    documents = documents.with_columns(
+        dup_cluster=documents.get_column('source_row').gather(clusters.get_column('dup_cluster')),
+        is_duplicate=clusters.get_column('is_duplicate')
+    )
+    if dedupe == 'drop':
+        documents = documents.filter(~pl.col('is_duplicate'))
+    return documents
+
+
+def build_corpus_from_frame(df: pl.DataFrame,
+                            save_path: Union[str, Path],
+                            name: str,
+                            description: str = '',
+                            text_column: str = 'text',
+                            metadata_columns: Optional[List[str]] = None,
+                            model: str = 'en_core_web_sm',
+                            spacy_batch_size: int = 1000,
+                            build_process_batch_size: int = 5000,
+                            workers: Optional[int] = None,
+                            shard_size: int = SHARD_SIZE,
+                            dedupe: Optional[str] = None,
+                            dedupe_threshold: float = DEDUPE_THRESHOLD):
+    """
+    Build a Conc corpus from a polars DataFrame, streaming texts into spaCy.
+
+    Equivalent to writing each row to a .txt file and calling
+    Corpus.build_from_files, but texts go straight from the DataFrame into
+    the tokenisation pipeline. Rows with empty text are skipped, and
+    metadata.parquet holds source_row (the row in df) and metadata_columns
+    for the remaining rows, in the same order as the documents.
+
+    With dedupe, near-duplicate documents (e.g., articles republished under
+    a new URL) are found before the build. metadata.parquet then gets a
+    dup_cluster column (source_row of the first document in the cluster)
+    and an is_duplicate column. 'flag' keeps every document; 'drop' keeps
+    only the first document of each cluster.
+
+    Arguments:
+        df: DataFrame with one document per row
+        save_path: Directory to create the .corpus directory in
+        name: Corpus name (also determines the directory name)
+        description: Corpus description
+        text_column: Column with document text
+        metadata_columns: Columns to store in metadata.parquet (e.g., ['id', 'date', 'category'])
+        model: spaCy model to tokenise with
+        spacy_batch_size: Batch size for spaCy's nlp.pipe
+        build_process_batch_size: Save the in-progress build to disk every N documents
+        workers: Number of tokeniser processes (default/1: tokenise in this process)
+        shard_size: Documents per shard when workers > 1
+        dedupe: None, 'flag' or 'drop' near-duplicate documents
+        dedupe_threshold: Jaccard similarity (of 5-word shingles) at which documents are near-duplicates
+
+    Returns:
+        The built Conc Corpus
+
+    Example:
+        >>> df = pl.read_csv('rnz_climate_national.csv.gz')
+        >>> corpus = build_corpus_from_frame(df, 'corpora/', 'RNZ Climate National',
+        ...                                  text_column='fulltext',
+        ...                                  metadata_columns=['id', 'date', 'category'])
+    """
+    from conc.corpus import Corpus
+
+    start_time = time.time()
+    documents = _document_frame(df, text_column, metadata_columns)
+    documents = _dedupe_documents(documents, text_column, dedupe, dedupe_threshold)
+
+    corpus = Corpus(name=name, description=description)
+    corpus._init_build_process(str(save_path))
+
+    # Conc numbers documents from 1 in metadata row order, so metadata is
+    # written in exactly the order the texts are fed to the pipeline
+    documents.drop(text_column).write_parquet(Path(corpus.corpus_path) / 'metadata.parquet')
+
+    logger.info(f"Building {name} from {len(documents):,} documents")
+    if workers and workers > 1:
+        _build_sharded([(corpus, _iter_texts(documents, text_column))],
+                       model=model, workers=workers, shard_size=shard_size,
+                       spacy_batch_size=spacy_batch_size)
+    else:
+        corpus._build(
+            save_path=str(save_path),
+            iterator=_iter_texts(documents, text_column),
+            model=model,
+            spacy_batch_size=spacy_batch_size,
+            build_process_batch_size=build_process_batch_size
+        )
+
+    logger.info(f"Built {corpus.corpus_path} in {time.time() - start_time:.1f}s")
+    return corpus
+
+
+def build_corpus_from_files(source_path: Union[str, Path],
+                            save_path: Union[str, Path],
+                            name: str,
+                            description: str = '',
+                            file_mask: str = '*.txt',
+                            encoding: str = 'utf-8',
+                            model: str = 'en_core_web_sm',
+                            workers: Optional[int] = None,
+                            shard_size: int = SHARD_SIZE):
+    """
+    Build a Conc corpus from a folder of text files, optionally in parallel.
+
+    Files are read in sorted name order and metadata.parquet has a 'file'
+    column, as with Corpus.build_from_files.
+
+    Arguments:
+        source_path: Folder with text files
+        save_path: Directory to create the .corpus directory in
+        name: Corpus name
+        description: Corpus description
+        file_mask: Glob for files to include
+        encoding: Encoding of the text files
+        model: spaCy model to tokenise with
+        workers: Number of tokeniser processes (default: os.cpu_count())
+        shard_size: Documents per shard when workers > 1
+
+    Returns:
+        The built Conc Corpus
+
+    Example:
+        >>> corpus = build_corpus_from_files('scraped_text/', 'corpora/', 'My Corpus', workers=8)
+    """
+    files = sorted(Path(source_path).glob(file_mask))
+    if not files:
+        raise FileNotFoundError(f"No files matching {file_mask} found in '{source_path}'")
+
+    df = pl.DataFrame({
+        'file': [f.name for f in files],
+        'text': [f.read_text(encoding=encoding) for f in files]
+    })
+    return build_corpus_from_frame(df, save_path, name, description,
+                                   text_column='text', metadata_columns=['file'],
+                                   model=model, workers=workers or os.cpu_count(),
+                                   shard_size=shard_size)
+
+
+def _parquet_parts(source: Union[str, Path]) -> List[Path]:
+    """A single Parquet file, or the sorted *.parquet part files in a folder."""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(source.glob('*.parquet'))
+    return [source] if source.exists() else []
+
+
+def build_corpus_from_parquet(source: Union[str, Path],
+                              save_path: Union[str, Path],
+                              name: str,
+                              description: str = '',
+                              text_column: str = 'text',
+                              metadata_columns: Optional[List[str]] = None,
+                              model: str = 'en_core_web_sm',
+                              spacy_batch_size: int = 1000,
+                              build_process_batch_size: int = 5000,
+                              workers: Optional[int] = None,
+                              shard_size: int = SHARD_SIZE):
+    """
+    Build a Conc corpus from a Parquet file or a folder of Parquet part files.
+
+    Unlike build_corpus_from_frame, the documents are never loaded all at
+    once. metadata.parquet is written with a streaming query, and texts are
+    read one part file at a time, so peak memory depends on the part size
+    rather than the corpus size. This is the natural consumer for a dataset
+    that was written in batches (e.g., by a scraper). source_row numbers
+    rows across all parts in sorted file order.
+
+    Arguments:
+        source: Parquet file, or folder whose *.parquet files are read in name order
+        save_path: Directory to create the .corpus directory in
+        name: Corpus name
+        description: Corpus description
+        text_column: Column with document text
+        metadata_columns: Columns to store in metadata.parquet
+        model: spaCy model to tokenise with
+        spacy_batch_size: Batch size for spaCy's nlp.pipe
+        build_process_batch_size: Save the in-progress build to disk every N documents
+        workers: Number of tokeniser processes (default/1: tokenise in this process)
+        shard_size: Documents per shard when workers > 1
+
+    Returns:
+        The built Conc Corpus
+
+    Example:
+        >>> corpus = build_corpus_from_parquet('scraped/', 'corpora/', 'Web Corpus',
+        ...                                    metadata_columns=['doc_id', 'url', 'title'])
+    """
+    from conc.corpus import Corpus
+
+    start_time = time.time()
+    parts = _parquet_parts(source)
+    if not parts:
+        raise FileNotFoundError(f"No Parquet files found at '{source}'")
+
+    scan = pl.scan_parquet(parts)
+    available = scan.collect_schema().names()
+    if text_column not in available:
+        raise ValueError(f"Text column '{text_column}' not found (columns: {available})")
+    metadata_columns = metadata_columns or []
+    missing = [c for c in metadata_columns if c not in available]
+    if missing:
+        logger.warning(f"Metadata columns not found and skipped: {missing}")
+    columns = [c for c in metadata_columns if c in available and c != text_column]
+
+    corpus = Corpus(name=name, description=description)
+    corpus._init_build_process(str(save_path))
+
+    # Same row order and filter as the texts below, without holding any text
+    scan.with_row_index('source_row').filter(_has_text(text_column)).select(
+        ['source_row'] + columns
+    ).sink_parquet(Path(corpus.corpus_path) / 'metadata.parquet')
+
+    def texts() -> Iterator[str]:
+        for part in parts:
+            documents = pl.read_parquet(part, columns=[text_column]).filter(_has_text(text_column))
+            yield from _iter_texts(documents, text_column)
+
+    logger.info(f"Building {name} from {len(parts):,} Parquet file(s)")
+    if workers and workers > 1:
+        _build_sharded([(corpus, texts())],
+                       model=model, workers=workers, shard_size=shard_size,
+                       spacy_batch_size=spacy_batch_size)
+    else:
+        corpus._build(
+            save_path=str(save_path),
+            iterator=texts(),
+            model=model,
+            spacy_batch_size=spacy_batch_size,
+            build_process_batch_size=build_process_batch_size
+        )
+
+    logger.info(f"Built {corpus.corpus_path} in {time.time() - start_time:.1f}s")
+    return corpus
+
+
+def build_corpora_from_frames(frames: Dict[str, pl.DataFrame],
+                              save_path: Union[str, Path],
+                              descriptions: Optional[Dict[str, str]] = None,
+                              text_column: str = 'text',
+                              metadata_columns: Optional[List[str]] = None,
+                              model: str = 'en_core_web_sm',
+                              workers: Optional[int] = None,
+                              shard_size: int = SHARD_SIZE,
+                              shared_vocab: bool = True,
+                              dedupe: Optional[str] = None,
+                              dedupe_threshold: float = DEDUPE_THRESHOLD) -> Dict[str, object]:
+    """
+    Build several Conc corpora in one run, optionally with a shared vocabulary.
+
+    All documents go through one pool of tokeniser processes. With
+    shared_vocab=True, every corpus gets the same vocab.parquet token ids
+    (the union of all their types, with each corpus' own frequencies), and
+    a shared_vocab.json marker records which corpora share them. Token ids
+    can then be compared across the corpora directly, e.g. when joining
+    frequencies for keyword analysis.
+
+    Arguments:
+        frames: Mapping of corpus name -> DataFrame with one document per row
+        save_path: Directory to create the .corpus directories in
+        descriptions: Optional mapping of corpus name -> description
+        text_column: Column with document text
+        metadata_columns: Columns to store in metadata.parquet
+        model: spaCy model to tokenise with
+        workers: Number of tokeniser processes (default: os.cpu_count())
+        shard_size: Documents per shard
+        shared_vocab: Give all corpora the same token ids
+        dedupe: None, 'flag' or 'drop' near-duplicates within each corpus (see build_corpus_from_frame)
+        dedupe_threshold: Jaccard similarity at which documents are near-duplicates
+
+    Returns:
+        Dictionary of corpus name -> built Conc Corpus
+
+    Example:
+        >>> corpora = build_corpora_from_frames(
+        ...     {'RNZ Climate National': national_df, 'RNZ Climate International': international_df},
+        ...     'corpora/', text_column='fulltext', metadata_columns=['id', 'date', 'category'])
+    """
+    from conc.corpus import Corpus
+
+    start_time = time.time()
+    descriptions = descriptions or {}
+    corpora = {}
+    builds = []
+
+    for name, df in frames.items():
+        documents = _document_frame(df, text_column, metadata_columns)
+        documents = _dedupe_documents(documents, text_column, dedupe, dedupe_threshold)
+        corpus = Corpus(name=name, description=descriptions.get(name, ''))
+        corpus._init_build_process(str(save_path))
+        documents.drop(text_column).write_parquet(Path(corpus.corpus_path) / 'metadata.parquet')
+        logger.info(f"Building {name} from {len(documents):,} documents")
+        corpora[name] = corpus
+        builds.append((corpus, _iter_texts(documents, text_column)))
+
+    vocabulary = _build_sharded(builds, model=model, workers=workers or os.cpu_count(),
+                                shard_size=shard_size)
+
+    if shared_vocab:
+        _share_vocabulary(list(corpora.values()), vocabulary)
+
+    logger.info(f"Built {len(corpora)} corpora in {time.time() - start_time:.1f}s")
+    return corpora
+
+
+# ============================================================================
+# Parallel (sharded) tokenisation
+# ============================================================================
+#
+# Each worker process tokenises a shard of consecutive documents with its own
+# spaCy pipeline and writes the token columns as spaCy hash ids in Conc's
+# build_*.parquet format.  spaCy hashes are the same in every process, so
+# the shards only need their vocabularies (hash -> string) merged into the
+# main pipeline's string store; Conc's _complete_build_process then assigns
+# global token ids and remaps orth_index/lower_index exactly as in a serial
+# build.
+
+_worker_nlp = None
+
+
+def _init_worker(model: str):
+    """Load the spaCy pipeline once per worker process, configured as Conc does."""
+    global _worker_nlp
+    from conc.corpus import Corpus
+
+    corpus = Corpus()
+    corpus._init_spacy_model(model)
+    _worker_nlp = corpus._nlp
+
+
+def _tokenise(nlp, texts: Iterator[str], first_document: int, spacy_batch_size: int):
+    """
+    Tokenise documents into spaCy hash id arrays, as Corpus._build does.
+
+    Documents are numbered from first_document, and an end-of-file token
+    follows each document.
+
+    Returns:
+        Tuple of (orth_index, lower_index, token2doc_index, has_spaces) lists
+        of arrays, and the vocabulary as a DataFrame of source_id (spaCy hash), token
+    """
+    from conc.core import EOF_TOKEN_STR
+    from spacy.attrs import LOWER, ORTH, SPACY
+
+    eof = np.array([nlp.vocab[EOF_TOKEN_STR].orth], dtype=np.uint64)
+    orth_index, lower_index, token2doc_index, has_spaces = [], [], [], []
+
+    for document, doc in enumerate(nlp.pipe(texts, batch_size=spacy_batch_size), start=first_document):
+        orth_index += [doc.to_array(ORTH), eof]
+        lower_index += [doc.to_array(LOWER), eof]
+        token2doc_index += [np.full(len(doc), document, dtype=np.int32), np.array([-1], dtype=np.int32)]
+        has_spaces += [doc.to_array(SPACY).astype(bool), np.array([False])]
+
+    hashes = np.unique(np.concatenate(orth_index + lower_index)) if orth_index else np.array([], dtype=np.uint64)
+    vocabulary = pl.DataFrame({
+        'source_id': pl.Series(hashes, dtype=pl.UInt64),
+        'token': pl.Series([nlp.vocab.strings[int(h)] for h in hashes], dtype=pl.String)
+    })
+    return (orth_index, lower_index, token2doc_index, has_spaces), vocabulary
+
+
+def _tokenise_shard(build_file: str, texts: List[str], first_document: int, spacy_batch_size: int) -> pl.DataFrame:
+    """
+    Tokenise one shard of documents and write it as a Conc build file.
+
+    Returns:
+        Shard vocabulary: DataFrame of source_id (spaCy hash), token
+    """
+    columns, vocabulary = _tokenise(_worker_nlp, texts, first_document, spacy_batch_size)
+    _write_build_file(build_file, *columns)
+    return vocabulary
+
+
+def _write_build_file(build_file: str, orth_index, lower_index, token2doc_index, has_spaces):
+    """Write token columns in the schema of Conc's build_*.parquet files."""
+    pl.DataFrame(
+        [np.concatenate(orth_index), np.concatenate(lower_index), np.concatenate(token2doc_index), np.concatenate(has_spaces)],
+        schema=[('orth_index', pl.UInt64), ('lower_index', pl.UInt64), ('token2doc_index', pl.Int32), ('has_spaces', pl.Boolean)]
+    ).write_parquet(build_file)
+
+
+def _build_file(corpus, number: int) -> str:
+    """Path of a build file; zero-padded so that name order is document order."""
+    return os.path.join(corpus.corpus_path, f'build_{number:06d}.parquet')
+
+
+def _build_sharded(builds: List[Tuple[object, Iterator[str]]],
+                   model: str = 'en_core_web_sm',
+                   workers: Optional[int] = None,
+                   shard_size: int = SHARD_SIZE,
+                   spacy_batch_size: int = 1000) -> pl.DataFrame:
+    """
+    Tokenise texts across worker processes and complete the Conc builds.
+
+    Several corpora can be built in one run: their shards go through the
+    same worker pool, so each worker loads the spaCy model only once.
+    Shards are submitted as texts are read, with at most two per worker in
+    flight, so memory use does not depend on the number of documents.
+
+    Arguments:
+        builds: List of (Conc Corpus after _init_build_process, texts in document order)
+        model: spaCy model to tokenise with
+        workers: Number of worker processes (default: os.cpu_count())
+        shard_size: Documents per shard
+        spacy_batch_size: Batch size for spaCy's nlp.pipe within a shard
+
+    Returns:
+        Vocabulary of all builds: DataFrame of source_id (spaCy hash), token
+    """
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    from conc.core import EOF_TOKEN_STR
+    from conc.corpus import INDEX_HEADER_LENGTH, NOT_DOC_TOKEN
+
+    start_time = time.time()
+    workers = workers or os.cpu_count() or 1
+
+    nlp = None
+    for corpus, _ in builds:
+        if nlp is None:
+            corpus._init_spacy_model(model)
+            nlp = corpus._nlp
+        corpus._nlp = nlp
+        corpus.SPACY_MODEL = model
+        corpus.SPACY_MODEL_VERSION = nlp.meta['version']
+        corpus.SPACY_EOF_TOKEN = nlp.vocab[EOF_TOKEN_STR].orth
+
+    # Index headers before the first and after the last document, as in Corpus._build
+    eof = nlp.vocab[EOF_TOKEN_STR].orth
+    header = (
+        [np.full(INDEX_HEADER_LENGTH, eof, dtype=np.uint64)],
+        [np.full(INDEX_HEADER_LENGTH, eof, dtype=np.uint64)],
+        [np.full(INDEX_HEADER_LENGTH, NOT_DOC_TOKEN, dtype=np.int32)],
+        [np.zeros(INDEX_HEADER_LENGTH, dtype=bool)]
+    )
+
+    shard_counts = [0] * len(builds)
+    document_counts = [0] * len(builds)
+
+    def shards():
+        for b, (corpus, texts) in enumerate(builds):
+            _write_build_file(_build_file(corpus, 0), *header)
+            texts = iter(texts)
+            while True:
+                shard_texts = list(islice(texts, shard_size))
+                if not shard_texts:
+                    break
+                shard_counts[b] += 1
+                yield _build_file(corpus, shard_counts[b]), shard_texts, document_counts[b] + 1
+                document_counts[b] += len(shard_texts)
+
+    vocabularies = []
+    running = set()
+
+    # Workers are spawned rather than forked: polars' thread pool does not
+    # survive a fork, and spawn is what Windows uses anyway
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker, initargs=(model,)) as executor:
+        for build_file, shard_texts, first_document in shards():
+            running.add(executor.submit(_tokenise_shard, build_file, shard_texts,
+                                        first_document, spacy_batch_size))
+            if len(running) >= 2 * workers:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                vocabularies += [future.result() for future in done]
+        vocabularies += [future.result() for future in running]
+
+    logger.info(f"Tokenised {sum(document_counts):,} documents in {sum(shard_counts)} shards "
+                f"with {workers} workers in {time.time() - start_time:.1f}s")
+
+    # Merge shard vocabularies into the main string store so Conc can
+    # resolve every hash when it builds each corpus' vocab
+    vocabulary = pl.concat(vocabularies).unique('source_id') if vocabularies else \
+        pl.DataFrame(schema={'source_id': pl.UInt64, 'token': pl.String})
+    for token in vocabulary['token']:
+        nlp.vocab.strings.add(token)
+
+    for (corpus, _), shards_written in zip(builds, shard_counts):
+        _write_build_file(_build_file(corpus, shards_written + 1), *header)
+        corpus._complete_build_process()
+        corpus.save_corpus_metadata()
+        corpus._init_corpus_dataframes()
+
+    logger.info(f"Parallel build time: {time.time() - start_time:.1f}s")
+    return vocabulary
+
+
+# ============================================================================
+# Shared vocabulary
+# ============================================================================
+#
+# Conc numbers token types per corpus (in spaCy hash order), so the same
+# token has different ids in two corpora.  _share_vocabulary renumbers the
+# corpora from a build run against the union of their types, using the same
+# hash order, and gives each corpus the full vocab table with its own
+# frequencies (null for types it does not contain).
+
+def _token_types(vocabulary: pl.DataFrame) -> pl.DataFrame:
+    """Add is_punct and is_space columns to a token_id, token frame, using Conc's rules."""
+    from conc.corpus import PUNCTUATION_STRINGS
+
+    return vocabulary.select(
+        pl.col('token_id').cast(pl.UInt32), 'token',
+        pl.col('token').map_elements(lambda t: t.strip(PUNCTUATION_STRINGS) == '', return_dtype=pl.Boolean).alias('is_punct'),
+        (pl.col('token').str.strip_chars() == '').alias('is_space')
+    )
+
+
+def _vocab_table(vocab: pl.DataFrame) -> pl.DataFrame:
+    """Add tokens_sort_order and rank and order columns as in the vocab.parquet Conc writes."""
+    return (
+        vocab
+        .sort(pl.col('token').str.to_lowercase()).with_row_index('tokens_sort_order', offset=1)
+        .sort('frequency_orth', descending=True, nulls_last=True).with_row_index('rank', offset=1)
+        .select('rank', 'tokens_sort_order', 'token_id', 'token', 'frequency_lower', 'frequency_orth', 'is_punct', 'is_space')
+    )
+
+
+def _share_vocabulary(corpora: List[object], vocabulary: pl.DataFrame):
+    """
+    Renumber built corpora so that they share one vocabulary.
+
+    Arguments:
+        corpora: Conc Corpus objects built from the texts in vocabulary
+        vocabulary: DataFrame of source_id (spaCy hash), token covering every corpus
+    """
+    from conc.core import EOF_TOKEN_STR
+
+    shared = _token_types(vocabulary.sort('source_id').with_row_index('token_id', offset=1))
+    vocab_id = hashlib.sha1(vocabulary['source_id'].sort().to_numpy().tobytes()).hexdigest()
+
+    punct_tokens = shared.filter(pl.col('is_punct'))['token_id'].to_list()
+    space_tokens = shared.filter(pl.col('is_space'))['token_id'].to_list()
+    eof_token = shared.filter(pl.col('token') == EOF_TOKEN_STR)['token_id'].item()
+
+    for corpus in corpora:
+        path = Path(corpus.corpus_path)
+        local = pl.read_parquet(path / 'vocab.parquet')
+
+        # Local token_id -> shared token_id (both are unique per token string)
+        mapping = local.select('token_id', 'token').join(
+            shared.select('token', pl.col('token_id').alias('shared_id')), on='token', how='left'
+        )
+        lookup = np.zeros(int(local['token_id'].max()) + 1, dtype=np.uint32)
+        lookup[mapping['token_id'].to_numpy()] = mapping['shared_id'].to_numpy()
+
+        for table in ('tokens', 'spaces'):
+            df = pl.read_parquet(path / f'{table}.parquet')
+            df.with_columns(
+                pl.Series('orth_index', lookup[df['orth_index'].to_numpy()], dtype=pl.UInt32),
+                pl.Series('lower_index', lookup[df['lower_index'].to_numpy()], dtype=pl.UInt32)
+            ).write_parquet(path / f'{table}.parquet')
+
+        vocab = _vocab_table(
+            shared.join(local.select('token', 'frequency_lower', 'frequency_orth'), on='token', how='left', maintain_order='left')
+        )
+        vocab.write_parquet(path / 'vocab.parquet')
+
+        corpus.EOF_TOKEN = eof_token
+        corpus.punct_tokens = punct_tokens
+        corpus.space_tokens = space_tokens
+        corpus.unique_word_tokens = vocab.filter(pl.col('frequency_lower').is_not_null() & ~pl.col('is_punct') & (pl.col('token_id') != eof_token)).height
+        corpus.save_corpus_metadata()
+        corpus._init_corpus_dataframes()
+
+        with open(path / SHARED_VOCAB_FILE, 'w') as f:
+            json.dump({
+                'vocab_id': vocab_id,
+                'unique_tokens': len(shared),
+                'corpora': [c.slug for c in corpora],
+                'date_created': corpus.date_created
+            }, f, indent=2)
+
+    logger.info(f"Shared vocabulary of {len(shared):,} types across {len(corpora)} corpora")
+
+
+# ============================================================================
+# Incremental append
+# ============================================================================
+
+def append_to_corpus(corpus_path: Union[str, Path],
+                     df: pl.DataFrame,
+                     text_column: str = 'text',
+                     metadata_columns: Optional[List[str]] = None,
+                     spacy_batch_size: int = 1000):
+    """
+    Append new documents to an existing .corpus without rebuilding it.
+
+    Only the new documents are tokenised. Their tokens are mapped onto the
+    existing vocab.parquet token ids, and new types get new ids at the end.
+    tokens.parquet gets the new tokens as an extra row group before the
+    closing index header, and puncts/spaces/metadata.parquet get new rows.
+    corpus.json counts and date_created are updated, so derived indexes
+    (postings, token arrays) are rebuilt on next use.
+
+    Parquet files cannot be extended in place, and Conc opens tokens.parquet
+    as a single file (it must be a file, not a folder of parts) whose last
+    rows are the closing index header, so the new tokens cannot go into a
+    separate part file. The token files are therefore rewritten by a
+    streaming copy, which re-encodes existing rows without tokenising them;
+    its time is logged separately so the cost stays visible.
+
+    Arguments:
+        corpus_path: Path to the .corpus directory
+        df: DataFrame with one new document per row
+        text_column: Column with document text
+        metadata_columns: Columns to add to metadata.parquet (as used in the original build)
+        spacy_batch_size: Batch size for spaCy's nlp.pipe
+
+    Returns:
+        The updated Conc Corpus
+
+    Example:
+        >>> new_articles = pl.read_csv('rnz_climate_national_2025-03-01.csv')
+        >>> corpus = append_to_corpus('corpora/rnz-climate-national.corpus', new_articles,
+        ...                           text_column='fulltext', metadata_columns=['id', 'date', 'category'])
+    """
+    from conc.core import EOF_TOKEN_STR
+    from conc.corpus import Corpus, INDEX_HEADER_LENGTH
+
+    start_time = time.time()
+    path = Path(corpus_path)
+    corpus = Corpus().load(str(path))
+
+    documents = _document_frame(df, text_column, metadata_columns)
+    if len(documents) == 0:
+        logger.info(f"No documents to append to {corpus.name}")
+        return corpus
+
+    (orth, lower, token2doc, has_spaces), new_vocabulary = _tokenise(
+        corpus._nlp, _iter_texts(documents, text_column), corpus.document_count + 1, spacy_batch_size)
+
+    # Map spaCy hashes to the corpus' token ids, numbering unseen types after the existing ones
+    vocab = pl.read_parquet(path / 'vocab.parquet')
+    known = new_vocabulary.join(vocab.select('token', 'token_id'), on='token', how='left')
+    unseen = (
+        known.filter(pl.col('token_id').is_null()).drop('token_id').sort('source_id')
+        .with_row_index('token_id', offset=int(vocab['token_id'].max()) + 1)
+    )
+    added = _token_types(unseen)
+    ids = pl.concat([
+        known.filter(pl.col('token_id').is_not_null()).select('source_id', pl.col('token_id').cast(pl.UInt32)),
+        unseen.select('source_id', pl.col('token_id').cast(pl.UInt32))
+    ])
+
+    new = pl.DataFrame({
+        'orth_index': np.concatenate(orth),
+        'lower_index': np.concatenate(lower),
+        'token2doc_index': np.concatenate(token2doc),
+        'has_spaces': np.concatenate(has_spaces)
+    }).with_columns(
+        pl.col('orth_index').replace_strict(ids['source_id'], ids['token_id'], return_dtype=pl.UInt32),
+        pl.col('lower_index').replace_strict(ids['source_id'], ids['token_id'], return_dtype=pl.UInt32)
+    )
+
+    punct_tokens = sorted(set(corpus.punct_tokens) | set(added.filter(pl.col('is_punct'))['token_id'].to_list()))
+    space_tokens = sorted(set(corpus.space_tokens) | set(added.filter(pl.col('is_space'))['token_id'].to_list()))
+
+    # Positions continue from the existing tokens, minus the closing index header;
+    # whitespace tokens are moved to spaces.parquet as in Conc's build
+    tokens_file = path / 'tokens.parquet'
+    base = pl.scan_parquet(tokens_file).select(pl.len()).collect().item() - INDEX_HEADER_LENGTH
+    new = new.with_columns(pl.col('lower_index').is_in(space_tokens).alias('is_space'))
+    spaces = (
+        new.with_row_index('position')
+        .filter(pl.col('is_space'))
+        .with_row_index('adjust_by')
+        .select((pl.col('position') - pl.col('adjust_by') + base).cast(pl.UInt32).alias('position'),
+                'orth_index', 'lower_index', 'token2doc_index', 'has_spaces')
+    )
+    new = new.filter(~pl.col('is_space')).drop('is_space')
+    puncts = (
+        new.with_row_index('position')
+        .filter(pl.col('lower_index').is_in(punct_tokens))
+        .select((pl.col('position') + base).cast(pl.UInt32).alias('position'))
+    )
+
+    rewrite_start = time.time()
+    existing = pl.scan_parquet(tokens_file)
+    header = existing.slice(base, INDEX_HEADER_LENGTH)
+    _replace_parquet(tokens_file, pl.concat([existing.slice(0, base), new.lazy(), header]))
+    for name, rows in (('puncts', puncts), ('spaces', spaces)):
+        _replace_parquet(path / f'{name}.parquet', pl.concat([pl.scan_parquet(path / f'{name}.parquet'), rows.lazy()]))
+    rewrite_seconds = time.time() - rewrite_start
+
+    metadata = documents.drop(text_column)
+    if (path / 'metadata.parquet').is_file():
+        metadata = pl.concat([pl.read_parquet(path / 'metadata.parquet'), metadata], how='diagonal_relaxed')
+    metadata.write_parquet(path / 'metadata.parquet')
+
+    # Frequencies of the new tokens (the end-of-file token is not counted, as in Conc)
+    eof_token = corpus.EOF_TOKEN
+    counts = {
+        column: new.filter(pl.col(column) != eof_token).group_by(pl.col(column).alias('token_id')).len(name=f'new_{column}')
+        for column in ('lower_index', 'orth_index')
+    }
+    vocab = (
+        pl.concat([vocab.select('token_id', 'token', 'frequency_lower', 'frequency_orth', 'is_punct', 'is_space'),
+                   added.select('token_id', 'token', pl.lit(None, pl.UInt32).alias('frequency_lower'),
+                                pl.lit(None, pl.UInt32).alias('frequency_orth'), 'is_punct', 'is_space')])
+        .join(counts['lower_index'], on='token_id', how='left')
+        .join(counts['orth_index'], on='token_id', how='left')
+        .with_columns(
+            (pl.col('frequency_lower').fill_null(0) + pl.col('new_lower_index').fill_null(0)).cast(pl.UInt32).alias('frequency_lower'),
+            (pl.col('frequency_orth').fill_null(0) + pl.col('new_orth_index').fill_null(0)).cast(pl.UInt32).alias('frequency_orth')
+        )
+        .with_columns(pl.col(c).replace(0, None) for c in ('frequency_lower', 'frequency_orth'))
+    )
+    vocab = _vocab_table(vocab)
+    vocab.write_parquet(path / 'vocab.parquet')
+
+    corpus.document_count += len(documents)
+    corpus.token_count += len(new) - len(documents)
+    corpus.punct_token_count += len(puncts)
+    corpus.space_token_count += len(spaces)
+    corpus.word_token_count = corpus.token_count - corpus.punct_token_count
+    corpus.unique_tokens = vocab.filter(pl.col('frequency_lower').is_not_null()).height
+    corpus.punct_tokens = punct_tokens
+    corpus.space_tokens = space_tokens
+    corpus.unique_word_tokens = corpus.unique_tokens - len(punct_tokens)
+    corpus.date_created = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())
+    corpus.save_corpus_metadata()
+    corpus._init_corpus_dataframes()
+
+    logger.info(f"Appended {len(documents):,} documents ({len(new) - len(documents):,} tokens, "
+                f"{len(added):,} new types) to {corpus.name} in {time.time() - start_time:.1f}s "
+                f"({rewrite_seconds:.2f}s rewriting {base:,} existing token rows)")
+    return corpus
+
+
+def _replace_parquet(path: Path, frame: pl.LazyFrame):
+    """Stream a LazyFrame (which may read path itself) to a temporary file, then replace path."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    frame.sink_parquet(tmp_path, maintain_order=True)
+    os.replace(tmp_path, path)
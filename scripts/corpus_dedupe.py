@@ -0,0 +1,284 @@
+"""
+corpus_dedupe.py
+
+Purpose:
+    Find near-duplicate documents (republished or lightly updated articles)
+    before they are built into a corpus, so they do not inflate frequencies
+    and keyness.
+
+    - minhash_signatures: MinHash signatures over word shingles, computed
+      with NumPy a batch of documents at a time.
+    - find_near_duplicates: locality-sensitive hashing (LSH) over the
+      signatures to find candidate pairs, which are verified against the
+      Jaccard threshold and grouped into clusters. Only documents that share
+      an LSH bucket are ever compared, so the cost grows roughly linearly
+      with the number of documents rather than quadratically.
+
+    corpus_build uses this for the dedupe option of build_corpus_from_frame
+    and build_corpora_from_frames.
+
+Requirements:
+    pip install numpy polars
+
+Usage:
+    from scripts.corpus_dedupe import find_near_duplicates
+
+    clusters = find_near_duplicates(df['fulltext'], threshold=0.8)
+    df = df.with_columns(clusters)   # dup_cluster, is_duplicate
+
+Author: DIGI405 Course Materials
+Date: 2026-02-24
+"""
+
+import logging
+from typing import Tuple
+
+import numpy as np
+import polars as pl
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+# Jaccard similarity (of word shingle sets) above which documents are near-duplicates
+DEDUPE_THRESHOLD = 0.8
+
+# Signature length; more permutations estimate Jaccard more accurately
+NUM_PERM = 128
+
+# Words per shingle
+SHINGLE_SIZE = 5
+
+# Documents hashed per batch, and permutations evaluated per block, which
+# together bound the size of the shingle x permutation working array
+DOCUMENT_BATCH_SIZE = 2000
+PERMUTATION_BLOCK = 16
+
+# LSH buckets up to this size are checked pair by pair; in larger buckets
+# (usually many exact copies) each document is checked against the bucket's
+# first document and its neighbour, so they stay linear
+ALL_PAIRS_BUCKET_SIZE = 32
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_EMPTY = np.iinfo(np.uint32).max
+
+
+# ============================================================================
+# MINHASH
+# ============================================================================
+
+def _permutations(num_perm: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Random (a, b) pairs for the hash family h(x) = a * x + b (mod 2**64), a odd."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def _shingles(doc: np.ndarray, words: np.ndarray, shingle_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash every run of shingle_size consecutive words within a document.
+
+    doc and words are parallel arrays (document number, word hash) in
+    document order. Shingles never span two documents; a document shorter
+    than shingle_size is represented by its individual words instead.
+    """
+    n = len(words)
+    k = min(shingle_size, n)
+    if k == 0:
+        return doc, words
+    shingles = words[:n - k + 1].copy()
+    for offset in range(1, k):
+        shingles = shingles * _MIX + words[offset:n - k + 1 + offset]
+    shingle_doc = doc[:n - k + 1]
+    valid = shingle_doc == doc[k - 1:]
+
+    # Documents with no complete shingle fall back to their words
+    counts = np.bincount(doc, minlength=int(doc.max()) + 1)
+    short = counts[doc] < k
+    return (np.concatenate([shingle_doc[valid], doc[short]]),
+            np.concatenate([shingles[valid], words[short]]))
+
+
+def minhash_signatures(texts: pl.Series,
+                       num_perm: int = NUM_PERM,
+                       shingle_size: int = SHINGLE_SIZE,
+                       seed: int = 1,
+                       batch_size: int = DOCUMENT_BATCH_SIZE) -> np.ndarray:
+    """
+    MinHash signature of each text's set of lowercased word shingles.
+
+    The fraction of positions at which two signatures agree estimates the
+    Jaccard similarity of the two documents' shingle sets.
+
+    Arguments:
+        texts: Document texts
+        num_perm: Signature length
+        shingle_size: Words per shingle
+        seed: Seed for the hash permutations (same seed, comparable signatures)
+        batch_size: Documents hashed at a time
+
+    Returns:
+        uint32 array of shape (len(texts), num_perm); documents without any
+        words get a row of 2**32 - 1
+
+    Example:
+        >>> sig = minhash_signatures(df['fulltext'])
+        >>> (sig[0] == sig[1]).mean()   # estimated Jaccard similarity of documents 0 and 1
+    """
+    a, b = _permutations(num_perm, seed)
+    signatures = np.full((len(texts), num_perm), _EMPTY, dtype=np.uint32)
+
+    for start in range(0, len(texts), batch_size):
+        words = (
+            texts.slice(start, batch_size).to_frame('text').with_row_index('doc')
+            .select('doc', pl.col('text').str.to_lowercase().str.extract_all(r'\w+').alias('word'))
+            .explode('word')
+            .drop_nulls('word')
+            .select('doc', pl.col('word').hash(seed=seed).alias('hash'))
+        )
+        if words.height == 0:
+            continue
+        doc, shingles = _shingles(words['doc'].to_numpy().astype(np.int64),
+                                  words['hash'].to_numpy(), shingle_size)
+        order = np.argsort(doc, kind='stable')
+        doc, shingles = doc[order], shingles[order]
+        starts = np.flatnonzero(np.r_[True, doc[1:] != doc[:-1]])
+        rows = start + doc[starts]
+
+        for p in range(0, num_perm, PERMUTATION_BLOCK):
+            block = slice(p, p + PERMUTATION_BLOCK)
+            # Top 32 bits of each permuted hash; minimum per document
+            hashed = (shingles[:, None] * a[None, block] + b[None, block]) >> np.uint64(32)
+            signatures[rows, block] = np.minimum.reduceat(hashed, starts, axis=0).astype(np.uint32)
+
+    return signatures
+
+
+# ============================================================================
+# LOCALITY-SENSITIVE HASHING
+# ============================================================================
+
+def _lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Choose (bands, rows) for LSH.
+
+    A pair with Jaccard similarity s shares at least one band with
+    probability 1 - (1 - s**rows)**bands, which rises steeply around
+    (1 / bands) ** (1 / rows). Candidates are verified afterwards, so the
+    steepest curve whose midpoint is still at or below the threshold is
+    used: few false negatives, and few candidates to check.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def _bucket_pairs(bucket: np.ndarray) -> np.ndarray:
+    """
+    Candidate pairs (row indices into bucket) of documents with the same bucket value.
+
+    Every pair is returned for buckets of up to ALL_PAIRS_BUCKET_SIZE
+    documents, so a dissimilar document that sorts between two duplicates
+    cannot keep them apart. In larger buckets each document is paired with
+    the bucket's first document and with the next one.
+    """
+    order = np.argsort(bucket, kind='stable')
+    sorted_bucket = bucket[order]
+    starts = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+    sizes = np.diff(np.r_[starts, len(bucket)])
+
+    pairs = [np.empty((0, 2), dtype=np.int64)]
+    for size in np.unique(sizes[(sizes > 1) & (sizes <= ALL_PAIRS_BUCKET_SIZE)]):
+        first, second = np.triu_indices(size, 1)
+        offsets = starts[sizes == size][:, None]
+        pairs.append(np.stack([(offsets + first).ravel(), (offsets + second).ravel()], axis=1))
+
+    large = sizes > ALL_PAIRS_BUCKET_SIZE
+    if large.any():
+        bucket_of = np.repeat(np.arange(len(starts)), sizes)
+        members = np.flatnonzero(large[bucket_of])
+        bucket_start = starts[bucket_of[members]]
+        star = members != bucket_start
+        pairs.append(np.stack([bucket_start[star], members[star]], axis=1))
+        chain = members[:-1][bucket_of[members[1:]] == bucket_of[members[:-1]]]
+        pairs.append(np.stack([chain, chain + 1], axis=1))
+
+    return np.sort(order[np.concatenate(pairs)], axis=1)
+
+
+def _components(n: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Label the connected components of a graph by their smallest node."""
+    labels = np.arange(n)
+    while True:
+        previous = labels.copy()
+        smallest = np.minimum(labels[left], labels[right])
+        np.minimum.at(labels, left, smallest)
+        np.minimum.at(labels, right, smallest)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def find_near_duplicates(texts: pl.Series,
+                         threshold: float = DEDUPE_THRESHOLD,
+                         num_perm: int = NUM_PERM,
+                         shingle_size: int = SHINGLE_SIZE,
+                         seed: int = 1) -> pl.DataFrame:
+    """
+    Group near-duplicate texts into clusters with MinHash and LSH.
+
+    Documents whose estimated Jaccard similarity (over word shingles) is
+    at least `threshold` are linked, and linked documents form a cluster
+    (single linkage). Each cluster is represented by its first document,
+    so keeping only rows where is_duplicate is False keeps the earliest
+    version of every article.
+
+    Arguments:
+        texts: Document texts
+        threshold: Minimum Jaccard similarity for two documents to be near-duplicates
+        num_perm: MinHash signature length
+        shingle_size: Words per shingle
+        seed: Seed for the MinHash permutations
+
+    Returns:
+        DataFrame with one row per text:
+        - dup_cluster: row number of the cluster's first document
+        - is_duplicate: True for every document except the first in its cluster
+
+    Example:
+        >>> clusters = find_near_duplicates(df['fulltext'], threshold=0.8)
+        >>> deduplicated = df.filter(~clusters['is_duplicate'])
+    """
+    n = len(texts)
+    signatures = minhash_signatures(texts, num_perm=num_perm, shingle_size=shingle_size, seed=seed)
+    has_words = signatures[:, 0] != _EMPTY
+    bands, rows = _lsh_bands(num_perm, threshold)
+
+    candidates = []
+    documents = np.flatnonzero(has_words)
+    for band in range(bands):
+        bucket = np.zeros(len(documents), dtype=np.uint64)
+        for column in signatures[documents, band * rows:(band + 1) * rows].T:
+            bucket = bucket * _MIX + column.astype(np.uint64)
+        candidates.append(documents[_bucket_pairs(bucket)])
+
+    pairs = np.unique(np.concatenate(candidates), axis=0) if candidates else np.empty((0, 2), dtype=np.int64)
+    if len(pairs):
+        similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+        pairs = pairs[similarity >= threshold]
+
+    labels = _components(n, pairs[:, 0], pairs[:, 1])
+    is_duplicate = labels != np.arange(n)
+    logger.info(f"Near-duplicates: {int(is_duplicate.sum()):,} of {n:,} documents "
+                f"in {len(np.unique(labels[is_duplicate])):,} clusters "
+                f"(threshold {threshold}, {bands} bands x {rows} rows, {len(pairs):,} verified pairs)")
+
+    return pl.DataFrame({
+        'dup_cluster': pl.Series(labels, dtype=pl.UInt32),
+        'is_duplicate': is_duplicate,
+    })
@@ -0,0 +1,661 @@
+"""
+corpus_store.py
+
+Purpose:
+    Build and load derived files that are stored alongside a Conc .corpus
+    directory to speed up analysis. Every derived file records the corpus.json
+    date_created and token_count it was built from and is rebuilt when the
+    corpus changes.
+
+    - Postings index: token id -> sorted token positions, so node lookups
+      (concordances, collocations) cost O(hits) instead of a full scan.
+    - Token arrays: orth_index, lower_index and token2doc_index as compact,
+      memory-mapped .npy files, so analysis works on corpora larger than RAM.
+    - Frequency table: word type -> frequency, so keyword analysis against a
+      reference corpus (.corpus or .listcorpus) skips counting it again.
+
+    Also provides CorpusScan, a lazy (polars scan_parquet) view of a corpus
+    that reads only the columns and rows each analysis needs, and pushes
+    metadata.parquet predicates (year, category, ...) down into the scan.
+    Corpora built together with a shared vocabulary (see corpus_build.py)
+    are recognised by shared_vocab_id().
+
+Requirements:
+    pip install numpy polars
+
+Usage:
+    from scripts.corpus_store import build_postings, load_postings
+
+    postings = load_postings('corpora/national-led.corpus', build=True)
+    positions = postings.positions(token_id)
+
+    orth_index = load_token_array('corpora/national-led.corpus', 'orth_index', build=True)
+
+    frequencies = load_frequency_table('corpora/national-led.corpus', build=True)
+
+    # Or from the command line, for every corpus at once
+    python scripts/corpus_store.py postings "corpora/*.corpus"
+    python scripts/corpus_store.py arrays "corpora/*.corpus"
+    python scripts/corpus_store.py frequencies "corpora/*.corpus" "corpora/*.listcorpus"
+
+Author: DIGI405 Course Materials
+Date: 2026-02-24
+"""
+
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+# Written by corpus_build.build_corpora_from_frames for corpora that share token ids
+SHARED_VOCAB_FILE = 'shared_vocab.json'
+
+# One index per token column, e.g. postings_lower_index.json
+POSTINGS_OFFSETS_FILE = 'postings_{column}_offsets.npy'
+POSTINGS_POSITIONS_FILE = 'postings_{column}_positions.npy'
+POSTINGS_MANIFEST_FILE = 'postings_{column}.json'
+
+
+def read_corpus_json(corpus_path: Union[str, Path]) -> Dict:
+    """Read corpus.json from a .corpus directory (listcorpus.json from a .listcorpus)."""
+    info_path = Path(corpus_path) / 'corpus.json'
+    if not info_path.is_file() and (Path(corpus_path) / 'listcorpus.json').is_file():
+        info_path = Path(corpus_path) / 'listcorpus.json'
+    with open(info_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _corpus_version(corpus_path: Union[str, Path]) -> Dict[str, Union[str, int]]:
+    """The corpus.json fields a derived file is checked against."""
+    info = read_corpus_json(corpus_path)
+    return {
+        'date_created': info.get('date_created'),
+        'token_count': info.get('token_count'),
+        'conc_version': info.get('conc_version')
+    }
+
+
+def _is_current(corpus_path: Union[str, Path], manifest_file: str, **expected) -> bool:
+    """Check a derived file's manifest against corpus.json (and any extra expected fields)."""
+    manifest_path = Path(corpus_path) / manifest_file
+    if not manifest_path.is_file():
+        return False
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    expected = {**_corpus_version(corpus_path), **expected}
+    return all(manifest.get(k) == v for k, v in expected.items())
+
+
+@contextmanager
+def _atomic_path(path: Path):
+    """
+    Yield a temporary path next to `path`, renamed to `path` if the block succeeds.
+
+    Every call gets its own uniquely named file, so processes building the
+    same derived file at the same time never write into each other's output.
+    """
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f'{path.name}.', suffix='.tmp', delete=False) as f:
+        tmp_path = Path(f.name)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _write_manifest(corpus_path: Union[str, Path], manifest_file: str, **fields):
+    """Write a derived file's manifest (written last, so it only exists for complete builds)."""
+    manifest = {**_corpus_version(corpus_path), **fields}
+    with _atomic_path(Path(corpus_path) / manifest_file) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+
+def _save_npy(path: Path, array: np.ndarray):
+    """Save an array atomically (write to a temporary file, then rename)."""
+    with _atomic_path(path) as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+
+
+def shared_vocab_id(corpus_path: Union[str, Path]) -> Optional[str]:
+    """
+    Identifier of the shared vocabulary a corpus was built with, or None.
+
+    Two corpora with the same id use the same token ids for the same
+    tokens. The marker is ignored if the corpus was rebuilt since.
+    """
+    path = Path(corpus_path) / SHARED_VOCAB_FILE
+    if not path.is_file():
+        return None
+    try:
+        with open(path) as f:
+            marker = json.load(f)
+        if marker.get('date_created') != read_corpus_json(corpus_path).get('date_created'):
+            return None
+        return marker.get('vocab_id')
+    except (OSError, ValueError):
+        return None
+
+
+# ============================================================================
+# Postings index
+# ============================================================================
+
+class Postings:
+    """
+    Inverted positional index for one token column of a corpus.
+
+    The positions of token id t are positions[offsets[t]:offsets[t + 1]],
+    in corpus order. Both arrays are memory-mapped, so loading the index is
+    instant and only the postings that are looked up are read from disk.
+    """
+
+    def __init__(self, offsets: np.ndarray, positions: np.ndarray, column: str):
+        self.offsets = offsets
+        self.positions_ = positions
+        self.column = column
+
+    def positions(self, token_id: int) -> np.ndarray:
+        """Token positions of token_id, in corpus order (empty if unknown)."""
+        if token_id < 0 or token_id + 1 >= len(self.offsets):
+            return self.positions_[:0]
+        return self.positions_[self.offsets[token_id]:self.offsets[token_id + 1]]
+
+    def frequency(self, token_id: int) -> int:
+        """Number of positions for token_id."""
+        if token_id < 0 or token_id + 1 >= len(self.offsets):
+            return 0
+        return int(self.offsets[token_id + 1] - self.offsets[token_id])
+
+
+def postings_is_current(corpus_path: Union[str, Path], column: str = 'lower_index') -> bool:
+    """
+    Check whether a postings index exists and matches corpus.json.
+
+    Arguments:
+        corpus_path: Path to .corpus directory
+        column: Token column the index was built from
+
+    Returns:
+        True if the index can be used, False if it is missing or stale
+    """
+    return _is_current(corpus_path, POSTINGS_MANIFEST_FILE.format(column=column), column=column)
+
+
+def build_postings(corpus_path: Union[str, Path], column: str = 'lower_index') -> Path:
+    """
+    Build the postings index for a corpus and save it next to the parquet files.
+
+    Creates postings_<column>_offsets.npy, postings_<column>_positions.npy
+    and postings_<column>.json in the .corpus directory, so indexes of
+    different columns can exist side by side.
+
+    Arguments:
+        corpus_path: Path to .corpus directory
+        column: Token column to index ('lower_index' for case-insensitive
+                lookups, 'orth_index' for case-sensitive ones)
+
+    Returns:
+        Path to the corpus directory
+
+    Example:
+        >>> build_postings('corpora/national-led.corpus')
+    """
+    corpus_path = Path(corpus_path)
+    logger.info(f"Building postings index for {corpus_path.name} ({column})")
+
+    token_ids = load_token_array(corpus_path, column)
+    if token_ids is None:
+        token_ids = pl.scan_parquet(corpus_path / 'tokens.parquet').select(column).collect().to_series().to_numpy()
+
+    # Stable sort keeps positions of each token in corpus order
+    position_dtype = np.uint32 if len(token_ids) < np.iinfo(np.uint32).max else np.uint64
+    positions = np.argsort(token_ids, kind='stable').astype(position_dtype)
+    counts = np.bincount(token_ids)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    _save_npy(corpus_path / POSTINGS_OFFSETS_FILE.format(column=column), offsets)
+    _save_npy(corpus_path / POSTINGS_POSITIONS_FILE.format(column=column), positions)
+    _write_manifest(corpus_path, POSTINGS_MANIFEST_FILE.format(column=column), column=column)
+
+    logger.info(f"Saved postings index: {len(positions):,} positions, {len(counts):,} token ids")
+
+    return corpus_path
+
+
+def load_postings(corpus_path: Union[str, Path],
+                  column: str = 'lower_index',
+                  build: bool = False) -> Optional[Postings]:
+    """
+    Load the postings index for a corpus.
+
+    Arguments:
+        corpus_path: Path to .corpus directory
+        column: Token column the index was built from
+        build: Build (or rebuild) the index if it is missing or stale
+
+    Returns:
+        Postings object, or None if no current index is available
+
+    Example:
+        >>> postings = load_postings('corpora/national-led.corpus', build=True)
+        >>> postings.frequency(token_id)
+    """
+    corpus_path = Path(corpus_path)
+
+    try:
+        if not postings_is_current(corpus_path, column):
+            if not build:
+                return None
+            build_postings(corpus_path, column)
+
+        return Postings(
+            np.load(corpus_path / POSTINGS_OFFSETS_FILE.format(column=column), mmap_mode='r'),
+            np.load(corpus_path / POSTINGS_POSITIONS_FILE.format(column=column), mmap_mode='r'),
+            column
+        )
+
+    except Exception as e:
+        logger.warning(f"Postings index unavailable for {corpus_path.name}: {e}")
+        return None
+
+
+# ============================================================================
+# Memory-mapped token arrays
+# ============================================================================
+
+TOKEN_ARRAYS_DIR = 'token_arrays'
+TOKEN_ARRAYS_MANIFEST_FILE = f'{TOKEN_ARRAYS_DIR}/manifest.json'
+TOKEN_ARRAY_COLUMNS = ['orth_index', 'lower_index', 'token2doc_index']
+
+# Rows converted per step, so conversion memory does not grow with corpus size
+CONVERT_CHUNK_SIZE = 5_000_000
+
+
+def _compact_dtype(min_value: int, max_value: int) -> np.dtype:
+    """Smallest integer dtype that holds values in [min_value, max_value]."""
+    candidates = [np.uint8, np.uint16, np.uint32, np.uint64] if min_value >= 0 else [np.int8, np.int16, np.int32, np.int64]
+    for dtype in candidates:
+        info = np.iinfo(dtype)
+        if info.min <= min_value and max_value <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def token_arrays_are_current(corpus_path: Union[str, Path]) -> bool:
+    """
+    Check whether memory-mapped token arrays exist and match corpus.json.
+
+    Arguments:
+        corpus_path: Path to .corpus directory
+
+    Returns:
+        True if the arrays can be used, False if they are missing or stale
+    """
+    return _is_current(corpus_path, TOKEN_ARRAYS_MANIFEST_FILE, columns=TOKEN_ARRAY_COLUMNS)
+
+
+def build_token_arrays(corpus_path: Union[str, Path],
+                       chunk_size: int = CONVERT_CHUNK_SIZE) -> Path:
+    """
+    Convert tokens.parquet into memory-mappable .npy arrays, one per column.
+
+    The arrays are written to <corpus>/token_arrays/ using the smallest integer
+    type that fits (e.g. uint16 token ids for small vocabularies, int16 document
+    ids for corpora with fewer than 32K documents). The parquet file is read in
+    chunks of chunk_size rows, so conversion needs a constant amount of memory.
+
+    Arguments:
+        corpus_path: Path to .corpus directory
+        chunk_size: Rows converted per step
+
+    Returns:
+        Path to the token_arrays directory
+
+    Example:
+        >>> build_token_arrays('corpora/national-led.corpus')
+    """
+    corpus_path = Path(corpus_path)
+    arrays_path = corpus_path / TOKEN_ARRAYS_DIR
+    arrays_path.mkdir(exist_ok=True)
+
+    tokens = pl.scan_parquet(corpus_path / 'tokens.parquet')
+    bounds = tokens.select(
+        pl.len().alias('rows'),
+        *[pl.col(c).min().alias(f'{c}_min') for c in TOKEN_ARRAY_COLUMNS],
+        *[pl.col(c).max().alias(f'{c}_max') for c in TOKEN_ARRAY_COLUMNS]
+    ).collect().row(0, named=True)
+    rows = bounds['rows']
+
+    logger.info(f"Converting {rows:,} tokens of {corpus_path.name} to memory-mapped arrays")
+
+    dtypes = {}
+    for column in TOKEN_ARRAY_COLUMNS:
+        dtype = _compact_dtype(bounds[f'{column}_min'], bounds[f'{column}_max'])
+        dtypes[column] = dtype.name
+        with _atomic_path(arrays_path / f'{column}.npy') as tmp_path:
+            array = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=(rows,))
+
+            for start in range(0, rows, chunk_size):
+                chunk = tokens.select(column).slice(start, chunk_size).collect().to_series().to_numpy()
+                array[start:start + len(chunk)] = chunk
+
+            array.flush()
+            del array
+
+    _write_manifest(corpus_path, TOKEN_ARRAYS_MANIFEST_FILE, columns=TOKEN_ARRAY_COLUMNS, dtypes=dtypes, rows=rows)
+
+    logger.info(f"Saved token arrays: {dtypes}")
+
+    return arrays_path
+
+
+def load_token_array(corpus_path: Union[str, Path],
+                     column: str,
+                     build: bool = False) -> Optional[np.ndarray]:
+    """
+    Memory-map one token column (orth_index, lower_index or token2doc_index).
+
+    Nothing is read into RAM until the returned array is accessed, and only
+    the parts that are accessed are paged in.
+
+    Arguments:
+        corpus_path: Path to .corpus directory
+        column: Token column to map
+        build: Build (or rebuild) the arrays if they are missing or stale
+
+    Returns:
+        Read-only memory-mapped array, or None if no current arrays are available
+
+    Example:
+        >>> orth_index = load_token_array('corpora/national-led.corpus', 'orth_index', build=True)
+    """
+    corpus_path = Path(corpus_path)
+
+    if column not in TOKEN_ARRAY_COLUMNS:
+        return None
+
+    try:
+        if not token_arrays_are_current(corpus_path):
+            if not build:
+                return None
+            build_token_arrays(corpus_path)
+
+        return np.load(corpus_path / TOKEN_ARRAYS_DIR / f'{column}.npy', mmap_mode='r')
+
+    except Exception as e:
+        logger.warning(f"Token arrays unavailable for {corpus_path.name}: {e}")
+        return None
+
+
+# ============================================================================
+# Frequency tables
+# ============================================================================
+
+FREQUENCY_TABLE_FILE = 'frequency_table.parquet'
+FREQUENCY_TABLE_MANIFEST_FILE = 'frequency_table.json'
+
+# Bumped when the table layout or counting rules change, so old tables are rebuilt
+FREQUENCY_TABLE_FORMAT = 1
+
+
+def frequency_table_is_current(corpus_path: Union[str, Path]) -> bool:
+    """
+    Check whether a frequency table exists and matches corpus.json (or listcorpus.json).
+
+    Arguments:
+        corpus_path: Path to .corpus or .listcorpus directory
+
+    Returns:
+        True if the table can be used, False if it is missing or stale
+    """
+    return _is_current(corpus_path, FREQUENCY_TABLE_MANIFEST_FILE, format=FREQUENCY_TABLE_FORMAT)
+
+
+def build_frequency_table(corpus_path: Union[str, Path]) -> Path:
+    """
+    Build the word frequency table of a corpus and save it next to vocab.parquet.
+
+    The table has one row per word type (case-insensitive, punctuation and
+    space tokens excluded) with columns token, frequency, most frequent
+    first. Only vocab.parquet is read, so this works for .listcorpus
+    frequency lists as well as full corpora.
+
+    Arguments:
+        corpus_path: Path to .corpus or .listcorpus directory
+
+    Returns:
+        Path to the corpus directory
+
+    Example:
+        >>> build_frequency_table('corpora/national-led.corpus')
+    """
+    corpus_path = Path(corpus_path)
+    logger.info(f"Building frequency table for {corpus_path.name}")
+
+    table = (
+        pl.scan_parquet(corpus_path / 'vocab.parquet')
+        .filter(pl.col('frequency_lower').is_not_null() & (pl.col('frequency_lower') > 0) &
+                ~pl.col('is_punct') & ~pl.col('is_space'))
+        .select('token', pl.col('frequency_lower').cast(pl.Int64).alias('frequency'))
+        .sort(['frequency', 'token'], descending=[True, False])
+        .collect()
+    )
+
+    with _atomic_path(corpus_path / FREQUENCY_TABLE_FILE) as tmp_path:
+        table.write_parquet(tmp_path)
+    word_tokens = int(table['frequency'].sum())
+    _write_manifest(corpus_path, FREQUENCY_TABLE_MANIFEST_FILE, format=FREQUENCY_TABLE_FORMAT,
+                    word_token_count=word_tokens, types=table.height)
+
+    logger.info(f"Saved frequency table: {table.height:,} types, {word_tokens:,} word tokens")
+
+    return corpus_path
+
+
+def load_frequency_table(corpus_path: Union[str, Path], build: bool = False) -> Optional[pl.DataFrame]:
+    """
+    Load the word frequency table of a corpus.
+
+    Arguments:
+        corpus_path: Path to .corpus or .listcorpus directory
+        build: Build (or rebuild) the table if it is missing or stale
+
+    Returns:
+        DataFrame with token, frequency, or None if no current table is available
+
+    Example:
+        >>> reference = load_frequency_table('corpora/national-led.corpus', build=True)
+        >>> reference['frequency'].sum()   # word tokens
+    """
+    corpus_path = Path(corpus_path)
+
+    try:
+        if not frequency_table_is_current(corpus_path):
+            if not build:
+                return None
+            build_frequency_table(corpus_path)
+
+        return pl.read_parquet(corpus_path / FREQUENCY_TABLE_FILE)
+
+    except Exception as e:
+        logger.warning(f"Frequency table unavailable for {corpus_path.name}: {e}")
+        return None
+
+
+# ============================================================================
+# Lazy, column-projected corpus scans
+# ============================================================================
+
+# Token columns each analysis reads from tokens.parquet - nothing else is loaded
+ANALYSIS_COLUMNS = {
+    'metrics': ['lower_index', 'token2doc_index'],
+    'frequencies': ['lower_index', 'token2doc_index'],
+    'ngrams': ['orth_index', 'token2doc_index'],
+    'keywords': ['lower_index', 'token2doc_index'],
+}
+
+
+class CorpusScan:
+    """
+    Lazy access to a .corpus directory built on pl.scan_parquet.
+
+    Each analysis method returns a single polars LazyFrame. Only the token
+    columns declared in ANALYSIS_COLUMNS are read, an optional row range
+    (start, stop) over tokens.parquet is pushed into the scan, and an optional
+    predicate over metadata.parquet (e.g. pl.col('year') == 2019) restricts
+    the query to matching documents. Nothing is read until .collect().
+
+    Example:
+        >>> scan = CorpusScan('corpora/rnz-climate.corpus')
+        >>> scan.frequencies(where=pl.col('year') == 2019).collect()
+        >>> scan.ngrams(2, where=pl.col('category') == 'Articles').collect()
+    """
+
+    def __init__(self, corpus_path: Union[str, Path]):
+        self.corpus_path = Path(corpus_path)
+        self.info = read_corpus_json(self.corpus_path)
+        self.punct_tokens = self.info.get('punct_tokens') or []
+
+    def documents(self, where: Optional[pl.Expr] = None) -> pl.LazyFrame:
+        """
+        Scan metadata.parquet with a 'document' column matching token2doc_index.
+
+        Documents are numbered from 1 in metadata row order, as in the build.
+        """
+        metadata = pl.scan_parquet(self.corpus_path / 'metadata.parquet').with_row_index('document', offset=1)
+        if where is not None:
+            metadata = metadata.filter(where)
+        return metadata
+
+    def tokens(self,
+               analysis: str,
+               rows: Optional[Tuple[int, int]] = None,
+               where: Optional[pl.Expr] = None) -> pl.LazyFrame:
+        """
+        Scan the token columns an analysis needs, restricted to a row range and/or documents.
+
+        Arguments:
+            analysis: Key of ANALYSIS_COLUMNS ('metrics', 'frequencies', 'ngrams', 'keywords')
+            rows: Optional (start, stop) token row range
+            where: Optional predicate over metadata.parquet columns
+        """
+        tokens = pl.scan_parquet(self.corpus_path / 'tokens.parquet').select(ANALYSIS_COLUMNS[analysis])
+        if rows is not None:
+            start, stop = rows
+            tokens = tokens.slice(start, max(stop - start, 0))
+
+        tokens = tokens.filter(pl.col('token2doc_index') >= 0)
+        if where is not None:
+            tokens = tokens.join(
+                self.documents(where).select(pl.col('document').cast(pl.Int32)),
+                left_on='token2doc_index', right_on='document', how='semi'
+            )
+        return tokens
+
+    def metrics(self,
+                rows: Optional[Tuple[int, int]] = None,
+                where: Optional[pl.Expr] = None) -> pl.LazyFrame:
+        """One-row frame with num_documents, total_tokens, word_tokens and total_types."""
+        return self.tokens('metrics', rows, where).select(
+            pl.col('token2doc_index').n_unique().alias('num_documents'),
+            pl.len().alias('total_tokens'),
+            (~pl.col('lower_index').is_in(self.punct_tokens)).sum().alias('word_tokens'),
+            pl.col('lower_index').filter(~pl.col('lower_index').is_in(self.punct_tokens)).n_unique().alias('total_types')
+        )
+
+    def frequencies(self,
+                    rows: Optional[Tuple[int, int]] = None,
+                    where: Optional[pl.Expr] = None,
+                    exclude_punctuation: bool = True) -> pl.LazyFrame:
+        """Frame of token_id, frequency (case-insensitive, from lower_index)."""
+        tokens = self.tokens('frequencies', rows, where)
+        if exclude_punctuation:
+            tokens = tokens.filter(~pl.col('lower_index').is_in(self.punct_tokens))
+        return tokens.group_by(pl.col('lower_index').alias('token_id')).len(name='frequency')
+
+    def ngrams(self,
+               n: int,
+               rows: Optional[Tuple[int, int]] = None,
+               where: Optional[pl.Expr] = None,
+               exclude_punctuation: bool = True) -> pl.LazyFrame:
+        """Frame of t0..t{n-1} (orth_index token ids), frequency for n-grams within one document."""
+        tokens = self.tokens('ngrams', rows, where)
+        valid = pl.col('token2doc_index') >= 0
+        if exclude_punctuation:
+            valid = valid & ~pl.col('orth_index').is_in(self.punct_tokens)
+        tokens = tokens.with_columns(valid.alias('valid'))
+
+        columns = [f't{k}' for k in range(n)]
+        return (
+            tokens
+            .with_columns(
+                *[pl.col('orth_index').shift(-k).alias(f't{k}') for k in range(n)],
+                pl.all_horizontal(
+                    [pl.col('valid').shift(-k).fill_null(False) for k in range(n)] +
+                    [pl.col('token2doc_index').shift(-k) == pl.col('token2doc_index') for k in range(1, n)]
+                ).alias('is_ngram')
+            )
+            .filter(pl.col('is_ngram'))
+            .group_by(columns)
+            .len(name='frequency')
+        )
+
+
+# Command-line interface
+if __name__ == '__main__':
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(description='Build derived index files for Conc corpora')
+    parser.add_argument('index', choices=['postings', 'arrays', 'frequencies'],
+                       help='Index to build: postings (token positions), arrays (memory-mapped token arrays) '
+                            'or frequencies (word frequency table, also for .listcorpus directories)')
+    parser.add_argument('corpus_path', nargs='+', help='Path(s) or glob(s) of .corpus (or .listcorpus) directories')
+    parser.add_argument('--column', default='lower_index', choices=['lower_index', 'orth_index'],
+                       help='Token column to index (default: lower_index)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the index is current')
+
+    args = parser.parse_args()
+
+    for pattern in args.corpus_path:
+        for path in sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]:
+            is_listcorpus = (Path(path) / 'listcorpus.json').is_file()
+            if not (Path(path) / 'corpus.json').is_file() and not (args.index == 'frequencies' and is_listcorpus):
+                logger.warning(f"Skipping {path}: no corpus.json found")
+                continue
+            if args.index == 'frequencies':
+                if not (Path(path) / 'vocab.parquet').is_file():
+                    logger.warning(f"Skipping {path}: no vocab.parquet found")
+                elif args.force or not frequency_table_is_current(path):
+                    build_frequency_table(path)
+                else:
+                    logger.info(f"Frequency table for {path} is current")
+            elif args.index == 'arrays':
+                if args.force or not token_arrays_are_current(path):
+                    build_token_arrays(path)
+                else:
+                    logger.info(f"Token arrays for {path} are current")
+            elif args.force or not postings_is_current(path, args.column):
+                build_postings(path, args.column)
+            else:
+                logger.info(f"Postings index for {path} is current")
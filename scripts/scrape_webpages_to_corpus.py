@@ -6,7 +6,7 @@ Purpose:
     to extract only the text content.
 
 Requirements:
-    pip install beautifulsoup4 requests newspaper3k lxml pandas conc
+    pip install beautifulsoup4 requests newspaper3k lxml pandas polars conc
 
 Usage Examples:
     # Example 1: Scrape single page
@@ -18,18 +18,36 @@ Usage Examples:
     # Example 3: Build corpus after scraping
     python scrape_webpages_to_corpus.py --build-corpus --name "My Corpus" --output articles/
 
+    # Example 4: Fetch with 16 workers, at most one request every 2 seconds per host
+    python scrape_webpages_to_corpus.py --urls-file urls.txt --output articles/ --workers 16 --delay 2.0
+
+    # Example 5: Cache pages on disk; rerunning after a crash resumes where it stopped
+    python scrape_webpages_to_corpus.py --urls-file urls.txt --csv web.csv --cache-dir .scrape_cache/
+
+    # Example 6: Stream pages into Parquet batches and build a corpus (bounded memory)
+    python scrape_webpages_to_corpus.py --urls-file urls.txt --parquet scraped/ --build-corpus --name "Web"
+
 Author: DIGI405 Course Materials
 Date: 2026-02-24
 """
 
 from bs4 import BeautifulSoup
 import requests
+from requests.adapters import HTTPAdapter
 import argparse
+import hashlib
+import json
+import multiprocessing
 import os
+import queue
+import threading
 import time
 import pandas as pd
+import polars as pl
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 import logging
 
 # Configure logging
@@ -39,46 +57,509 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+DEFAULT_WORKERS = 8
+
+
+# ============================================================================
+# POLITE CONCURRENT FETCHING
+# ============================================================================
+
+class HostRateLimiter:
+    """
+    Token-bucket rate limiter with one bucket per host.
+
+    Each host earns one request token every `delay` seconds and can hold up
+    to `burst` tokens, so requests to different sites never wait on each
+    other while any single site sees at most one request per `delay` seconds
+    once its burst is used up. Safe to share between threads.
+
+    Arguments:
+        delay: Seconds between requests to the same host (0 disables limiting)
+        burst: Number of requests a host may receive back to back
+    """
+
+    def __init__(self, delay: float = 1.0, burst: int = 1):
+        self.delay = max(delay, 0.0)
+        self.burst = max(burst, 1)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """
+        Block until the URL's host has a free token.
+
+        Arguments:
+            url: URL about to be requested
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.delay == 0:
+            return 0.0
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) / self.delay)
+            # Reserve the token now (the bucket may go negative) so waiting
+            # threads are served in arrival order without holding the lock
+            tokens -= 1
+            self._buckets[host] = (tokens, now)
+        wait_time = -tokens * self.delay if tokens < 0 else 0.0
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+
+def create_session(pool_size: int = DEFAULT_WORKERS) -> requests.Session:
+    """
+    Create a requests session whose connection pool is shared by all workers.
+
+    Arguments:
+        pool_size: Maximum number of pooled connections per host
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(pool_connections=max(pool_size, 10), pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _interleave_by_host(urls: List[str]) -> List[int]:
+    """Order URL indices round-robin across hosts so no single site clogs the workers."""
+    by_host: Dict[str, List[int]] = {}
+    for i, url in enumerate(urls):
+        by_host.setdefault(urlparse(url).netloc.lower(), []).append(i)
+    queues = list(by_host.values())
+    order = []
+    for depth in range(max((len(q) for q in queues), default=0)):
+        order.extend(q[depth] for q in queues if depth < len(q))
+    return order
+
+
+def fetch_concurrently(urls: List[str],
+                       task: Callable[[int, str, requests.Session], Any],
+                       max_workers: int = DEFAULT_WORKERS,
+                       delay: float = 1.0,
+                       burst: int = 1,
+                       session: Optional[requests.Session] = None) -> Iterator[Tuple[int, Any]]:
+    """
+    Run `task` over many URLs on a thread pool, politely.
+
+    At most `max_workers` requests are in flight at once, all sharing one
+    pooled session, and each host is rate limited by its own token bucket
+    instead of a global sleep between every request. URLs are scheduled
+    round-robin across hosts, and results are yielded as they complete.
+
+    Arguments:
+        urls: URLs to process
+        task: Function called as task(index, url, session) in a worker thread
+        max_workers: Global cap on concurrent requests
+        delay: Seconds between requests to the same host
+        burst: Requests a host may receive back to back
+        session: Session to reuse (default: a new pooled session)
+
+    Returns:
+        Iterator of (index, result) pairs in completion order
+
+    Example:
+        >>> for i, text in fetch_concurrently(urls, lambda i, url, s: s.get(url).text):
+        ...     print(urls[i], len(text))
+    """
+    max_workers = max(max_workers, 1)
+    limiter = HostRateLimiter(delay=delay, burst=burst)
+    own_session = session is None
+    if own_session:
+        session = create_session(max_workers)
+
+    def run(i: int, url: str) -> Any:
+        limiter.acquire(url)
+        return task(i, url, session)
+
+    order = iter(_interleave_by_host(urls))
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Keep a bounded number of queued futures so huge URL lists do
+            # not materialise every pending task up front
+            pending = {}
+            for i in order:
+                pending[executor.submit(run, i, urls[i])] = i
+                if len(pending) >= 2 * max_workers:
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+                    next_i = next(order, None)
+                    if next_i is not None:
+                        pending[executor.submit(run, next_i, urls[next_i])] = next_i
+    finally:
+        if own_session:
+            session.close()
+
+
+# ============================================================================
+# HTTP CACHE AND CHECKPOINTS
+# ============================================================================
+
+class PageCache:
+    """
+    On-disk HTTP cache for scraped pages.
+
+    Each URL is stored under the SHA-256 of the URL as a body file plus a
+    small JSON sidecar holding the validators (ETag / Last-Modified) and
+    encoding. Cached pages are revalidated with a conditional request, so an
+    unchanged page costs a 304 response instead of a full download. Writes
+    are atomic, so the cache can be shared between worker threads and
+    survives interrupted runs.
+
+    Arguments:
+        cache_dir: Directory to store cached pages in (created if missing)
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{key}.body', self.cache_dir / f'{key}.json'
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        tmp_path = path.with_name(f'{path.name}.{threading.get_ident()}.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def fetch(self, url: str, session: Optional[requests.Session] = None,
+              timeout: float = 30) -> requests.Response:
+        """
+        Fetch a URL, revalidating any cached copy with a conditional request.
+
+        Arguments:
+            url: URL to fetch
+            session: Session to fetch with (default: a one-off request)
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response with the page body; `from_cache` is True when the cached
+            copy was still valid (the server answered 304 Not Modified)
+        """
+        body_path, meta_path = self._paths(url)
+        headers = dict(DEFAULT_HEADERS)
+        meta = None
+        if body_path.exists() and meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            except ValueError:
+                meta = None
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = (session or requests).get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and meta:
+            response.status_code = 200
+            response._content = body_path.read_bytes()
+            response.encoding = meta.get('encoding')
+            response.from_cache = True
+            return response
+
+        response.raise_for_status()
+        response.from_cache = False
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            # Pages without validators can never be revalidated, so skip them
+            self._write(body_path, response.content)
+            self._write(meta_path, json.dumps({
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'encoding': response.encoding,
+                'fetched': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }).encode('utf-8'))
+        return response
+
+
+class ScrapeJournal:
+    """
+    Append-only JSONL checkpoint of completed URLs.
+
+    Every finished URL is written and flushed as soon as it completes, so a
+    run that dies part way through loses at most the pages in flight.
+    Reopening the same journal loads the completed URLs so they can be
+    skipped. A truncated final line from a crash is ignored. A run that
+    completes every URL discards the journal, so the next run fetches (and
+    revalidates) everything instead of skipping it.
+
+    Arguments:
+        path: Journal file path
+        resume: Load existing entries (False starts a fresh journal)
+    """
+
+    def __init__(self, path: str, resume: bool = True):
+        self.path = Path(path)
+        self.completed: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if resume and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.completed[entry['url']] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.completed
+
+    def record(self, url: str, entry: Dict[str, Any]):
+        """Mark a URL as completed, storing `entry` alongside it."""
+        entry = dict(entry, url=url)
+        with self._lock:
+            self.completed[url] = entry
+            self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def discard(self):
+        """Close and delete the journal (the run it checkpointed is complete)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def _fetch_page(url: str, session: Optional[requests.Session] = None,
+                cache: Optional[PageCache] = None) -> requests.Response:
+    """Fetch a URL through the page cache if one is given, raising on HTTP errors."""
+    if cache is not None:
+        return cache.fetch(url, session)
+    response = (session or requests).get(url, headers=DEFAULT_HEADERS, timeout=30)
+    response.raise_for_status()
+    return response
+
+
+# ============================================================================
+# HTML TEXT EXTRACTION
+# ============================================================================
+
+DEFAULT_REMOVE_ELEMENTS = ['script', 'style', 'nav', 'footer', 'header', 'aside', 'noscript']
+
+# Elements whose content is never page text (BeautifulSoup's get_text skips them too)
+NON_TEXT_ELEMENTS = {'script', 'style', 'template'}
+
+
+def _clean_text(chunks: Iterator[str]) -> str:
+    """Join text nodes into one line: strip every line, drop empty ones, join with spaces."""
+    lines = (line.strip() for chunk in chunks for line in chunk.splitlines())
+    return ' '.join(line for line in lines if line)
+
+
+def extract_with_bs4(html: Union[str, bytes],
+                     remove_elements: Optional[List[str]] = None,
+                     selector: Optional[str] = None,
+                     selector_type: str = 'tag') -> Tuple[str, Optional[str]]:
+    """
+    Extract (title, text) with BeautifulSoup and the standard library parser.
+
+    Works without any compiled dependencies, but is the slowest backend:
+    each removed tag type is a separate find_all pass over the tree.
+
+    Arguments:
+        html: Page source
+        remove_elements: Tags to drop with their content (default: DEFAULT_REMOVE_ELEMENTS)
+        selector: Only extract text from the first element matching this tag, class or id
+        selector_type: 'tag', 'class', or 'id'
+
+    Returns:
+        Tuple of (title, text); text is None if `selector` matched nothing
+    """
+    if remove_elements is None:
+        remove_elements = DEFAULT_REMOVE_ELEMENTS
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.find('title')
+    title = title.get_text() if title else ''
+    
+    for element in soup(remove_elements):
+        element.decompose()
+    
+    root = soup
+    if selector:
+        if selector_type == 'class':
+            root = soup.find(class_=selector)
+        elif selector_type == 'id':
+            root = soup.find(id=selector)
+        else:  # tag
+            root = soup.find(selector)
+        if root is None:
+            return title, None
+    
+    return title, _clean_text([root.get_text(separator=' ', strip=True)])
+
+
+def extract_with_lxml(html: Union[str, bytes],
+                      remove_elements: Optional[List[str]] = None,
+                      selector: Optional[str] = None,
+                      selector_type: str = 'tag') -> Tuple[str, Optional[str]]:
+    """
+    Extract (title, text) with lxml in a single walk over the parsed tree.
+
+    Removed elements are skipped during the walk (their tail text is kept)
+    rather than deleted from the tree, and comments are ignored, so the text
+    matches extract_with_bs4 at a fraction of the cost.
+
+    Arguments:
+        html: Page source (bytes are decoded using the page's declared charset)
+        remove_elements: Tags to skip with their content (default: DEFAULT_REMOVE_ELEMENTS)
+        selector: Only extract text from the first element matching this tag, class or id
+        selector_type: 'tag', 'class', or 'id'
+
+    Returns:
+        Tuple of (title, text); text is None if `selector` matched nothing
+    """
+    import lxml.etree
+    import lxml.html
+    
+    skip = set(DEFAULT_REMOVE_ELEMENTS if remove_elements is None else remove_elements)
+    if isinstance(html, str):
+        # lxml rejects str input that carries an XML encoding declaration
+        html = html.encode('utf-8')
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+    else:
+        parser = lxml.html.HTMLParser()
+    try:
+        root = lxml.html.document_fromstring(html, parser=parser)
+    except lxml.etree.ParserError:
+        return '', None if selector else ''
+    
+    title = root.find('.//title')
+    title = title.text_content() if title is not None else ''
+    
+    if selector:
+        if selector_type == 'class':
+            matches = root.xpath('//*[contains(concat(" ", normalize-space(@class), " "), $cls)]',
+                                 cls=f' {selector} ')
+        elif selector_type == 'id':
+            matches = root.xpath('//*[@id=$id]', id=selector)
+        else:  # tag
+            matches = root.xpath('//*[local-name()=$tag]', tag=selector)
+        matches = [m for m in matches if not any(a.tag in skip for a in m.iterancestors())]
+        if not matches or matches[0].tag in skip:
+            return title, None
+        root = matches[0]
+    
+    skip |= NON_TEXT_ELEMENTS
+    chunks = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            chunks.append(node)
+            continue
+        if node.text:
+            chunks.append(node.text)
+        # Children are pushed in reverse so they pop in document order, each
+        # followed by its tail text (which belongs to the parent)
+        for child in reversed(node):
+            if child.tail:
+                stack.append(child.tail)
+            if isinstance(child.tag, str) and child.tag not in skip:
+                stack.append(child)
+    return title, _clean_text(chunks)
+
+
+# Extraction backends by name; register_extractor adds more
+EXTRACTORS: Dict[str, Callable[..., Tuple[str, Optional[str]]]] = {
+    'bs4': extract_with_bs4,
+    'lxml': extract_with_lxml,
+}
+
+try:
+    import lxml.html  # noqa: F401
+    DEFAULT_EXTRACTOR = 'lxml'
+except ImportError:
+    DEFAULT_EXTRACTOR = 'bs4'
+
+
+def register_extractor(name: str, extractor: Callable[..., Tuple[str, Optional[str]]]):
+    """
+    Add an extraction backend.
+
+    Arguments:
+        name: Name to select the backend by (e.g., extractor='trafilatura')
+        extractor: Function called as extractor(html, remove_elements, selector,
+                   selector_type) that returns (title, text), with text None
+                   when the selector matched nothing
+    """
+    EXTRACTORS[name] = extractor
+
+
+def extract_text(html: Union[str, bytes],
+                 remove_elements: Optional[List[str]] = None,
+                 selector: Optional[str] = None,
+                 selector_type: str = 'tag',
+                 extractor: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """
+    Extract the title and clean text from a page with the chosen backend.
+
+    Arguments:
+        html: Page source
+        remove_elements: Tags to drop with their content (default: DEFAULT_REMOVE_ELEMENTS)
+        selector: Only extract text from the first element matching this tag, class or id
+        selector_type: 'tag', 'class', or 'id'
+        extractor: Backend name from EXTRACTORS (default: lxml if installed, else bs4)
+
+    Returns:
+        Tuple of (title, text); text is None if `selector` matched nothing
+
+    Example:
+        >>> title, text = extract_text(response.content, extractor='lxml')
+    """
+    name = extractor or DEFAULT_EXTRACTOR
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor '{name}' (available: {sorted(EXTRACTORS)})")
+    return EXTRACTORS[name](html, remove_elements, selector, selector_type)
+
 
 def scrape_webpage_to_text(url: str, output_file: str, 
-                           remove_elements: Optional[List[str]] = None) -> Optional[str]:
+                           remove_elements: Optional[List[str]] = None,
+                           session: Optional[requests.Session] = None,
+                           cache: Optional[PageCache] = None,
+                           extractor: Optional[str] = None) -> Optional[str]:
     """
     Scrape a webpage and save only the text content, removing HTML formatting.
     
     Arguments:
         url: URL of the webpage to scrape
         output_file: Path where to save the extracted text
-        remove_elements: List of HTML tags to remove (default: script, style, nav, footer, header, aside)
+        remove_elements: List of HTML tags to remove (default: script, style, nav, footer, header, aside, noscript)
+        session: Pooled session to fetch with (default: a one-off request)
+        cache: On-disk page cache to revalidate against (default: no cache)
+        extractor: Extraction backend, 'lxml' or 'bs4' (default: lxml if installed)
     
     Returns:
         Extracted text content, or None if failed
     """
-    if remove_elements is None:
-        remove_elements = ['script', 'style', 'nav', 'footer', 'header', 'aside', 'noscript']
-    
     try:
         # Fetch the webpage
         logger.info(f"Fetching {url}")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        response = _fetch_page(url, session, cache)
         
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove unwanted elements
-        for element_type in remove_elements:
-            for element in soup.find_all(element_type):
-                element.decompose()
-        
-        # Extract text
-        text = soup.get_text(separator=' ', strip=True)
-        
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        text = ' '.join(line for line in lines if line)
+        # Remove unwanted elements and extract clean text
+        _, text = extract_text(response.text, remove_elements, extractor=extractor)
         
         # Create output directory if needed
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
@@ -97,7 +578,10 @@ def scrape_webpage_to_text(url: str, output_file: str,
 
 def scrape_with_css_selector(url: str, output_file: str, 
                              selector: str = 'article',
-                             selector_type: str = 'tag') -> Optional[str]:
+                             selector_type: str = 'tag',
+                             session: Optional[requests.Session] = None,
+                             cache: Optional[PageCache] = None,
+                             extractor: Optional[str] = None) -> Optional[str]:
     """
     Extract text from specific parts of the page using CSS selectors.
     
@@ -106,31 +590,21 @@ def scrape_with_css_selector(url: str, output_file: str,
         output_file: Path where to save extracted text
         selector: CSS selector, class name, or ID to target
         selector_type: 'tag', 'class', or 'id'
+        session: Pooled session to fetch with (default: a one-off request)
+        cache: On-disk page cache to revalidate against (default: no cache)
+        extractor: Extraction backend, 'lxml' or 'bs4' (default: lxml if installed)
     
     Returns:
         Extracted text, or None if failed
     """
     try:
         logger.info(f"Fetching {url} with selector: {selector}")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        response = _fetch_page(url, session, cache)
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find content based on selector type
-        if selector_type == 'class':
-            main_content = soup.find(class_=selector)
-        elif selector_type == 'id':
-            main_content = soup.find(id=selector)
-        else:  # tag
-            main_content = soup.find(selector)
+        # Find content based on selector type (nothing inside it is removed)
+        _, text = extract_text(response.text, [], selector, selector_type, extractor=extractor)
         
-        if main_content:
-            text = main_content.get_text(separator=' ', strip=True)
-            
+        if text is not None:
             # Create output directory if needed
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
@@ -195,79 +669,419 @@ def scrape_news_article(url: str, output_file: str) -> Optional[str]:
         return None
 
 
+def _page_record(i: int, url: str, html: str, extractor: Optional[str] = None) -> Dict[str, str]:
+    """Extract the CSV row (doc_id, url, title, text) for one fetched page."""
+    # Remove unwanted elements, extract text and title
+    title, text = extract_text(html, extractor=extractor)
+    
+    # Create document ID from URL
+    doc_id = url.split('/')[-1] or f'doc_{i:04d}'
+    
+    return {
+        'doc_id': doc_id,
+        'url': url,
+        'title': title,
+        'text': text
+    }
+
+
+def _decode_page(content: bytes, charset: Optional[str]) -> Union[str, bytes]:
+    """
+    Decode a fetched page for extraction.
+
+    Uses the charset from the Content-Type header if there was one, then
+    UTF-8; otherwise the bytes are passed on so the parser can read the
+    page's own <meta charset> declaration.
+    """
+    if charset:
+        try:
+            return content.decode(charset, errors='replace')
+        except LookupError:
+            pass
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content
+
+
+def _extract_page(i: int, url: str, content: bytes, charset: Optional[str],
+                  extractor: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """Decode and extract one fetched page into its CSV row, or None if it fails."""
+    try:
+        return _page_record(i, url, _decode_page(content, charset), extractor)
+    except Exception as e:
+        logger.error(f"Error extracting {url}: {e}")
+        return None
+
+
 def scrape_urls_to_csv(urls: List[str], output_csv: str, 
-                       delay: float = 1.0) -> pd.DataFrame:
+                       delay: float = 1.0,
+                       max_workers: int = DEFAULT_WORKERS,
+                       burst: int = 1,
+                       cache_dir: Optional[str] = None,
+                       journal_path: Optional[str] = None,
+                       resume: bool = True,
+                       extractor: Optional[str] = None,
+                       extract_workers: Optional[int] = None) -> pd.DataFrame:
     """
     Scrape multiple URLs and save to CSV with metadata.
     
+    URLs are fetched concurrently over a shared connection pool. Politeness
+    is enforced per host, so a list spread across many sites finishes much
+    faster than fetching one URL at a time, while each site still sees at
+    most one request per `delay` seconds. Fetched pages are handed to a
+    separate pool of extraction processes, so parsing never holds up the
+    network (see _scrape_pipeline).
+    
+    Each completed page is checkpointed to a journal as soon as it is
+    scraped. If a run dies part way through, rerunning the same command
+    skips the completed URLs and carries on. Failed URLs are retried. The
+    journal is deleted once every URL has been scraped, so resuming only
+    applies to unfinished runs and a normal rerun revalidates cached pages.
+    
     Arguments:
         urls: List of URLs to scrape
         output_csv: Path to save CSV file
-        delay: Delay in seconds between requests (be polite to servers)
+        delay: Delay in seconds between requests to the same host (be polite to servers)
+        max_workers: Maximum number of requests in flight at once
+        burst: Requests a host may receive back to back before `delay` applies
+        cache_dir: Directory for the on-disk page cache (default: no cache)
+        journal_path: Checkpoint journal (default: `<output_csv>.journal.jsonl`)
+        resume: Skip URLs in the journal of an unfinished run (False rescrapes everything)
+        extractor: Extraction backend, 'lxml' or 'bs4' (default: lxml if installed)
+        extract_workers: Extraction processes (default: os.cpu_count(); 1 extracts in a thread)
     
     Returns:
-        DataFrame with scraped data
+        DataFrame with scraped data, in the same order as `urls`
     """
-    data = []
+    data: List[Optional[Dict[str, str]]] = [None] * len(urls)
+    cache = PageCache(cache_dir) if cache_dir else None
+    journal = ScrapeJournal(journal_path or f'{output_csv}.journal.jsonl', resume=resume)
     
+    # Reuse rows checkpointed by an earlier run
+    columns = ['doc_id', 'url', 'title', 'text']
+    todo = []
     for i, url in enumerate(urls):
-        logger.info(f"Scraping {i+1}/{len(urls)}: {url}")
-        
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-                element.decompose()
-            
-            # Extract text
-            text = soup.get_text(separator=' ', strip=True)
-            lines = (line.strip() for line in text.splitlines())
-            text = ' '.join(line for line in lines if line)
-            
-            # Extract title
-            title = soup.find('title')
-            title = title.get_text() if title else ''
-            
-            # Create document ID from URL
-            doc_id = url.split('/')[-1] or f'doc_{i:04d}'
-            
-            data.append({
-                'doc_id': doc_id,
-                'url': url,
-                'title': title,
-                'text': text
-            })
-            
-            # Be polite - don't overwhelm the server
-            if i < len(urls) - 1:
-                time.sleep(delay)
-                
-        except Exception as e:
-            logger.error(f"Error scraping {url}: {e}")
-            data.append({
+        if url in journal:
+            data[i] = {col: journal.completed[url].get(col, '') for col in columns}
+        else:
+            todo.append(i)
+    if len(todo) < len(urls):
+        logger.info(f"Resuming: {len(urls) - len(todo)} URLs already scraped")
+    
+    results = _scrape_pipeline(urls, todo, cache=cache, extractor=extractor,
+                               max_workers=max_workers, extract_workers=extract_workers,
+                               delay=delay, burst=burst)
+    failed = 0
+    try:
+        for done, (i, record) in enumerate(results, start=1):
+            logger.info(f"Scraped {done}/{len(todo)}: {urls[i]}")
+            if record is not None:
+                journal.record(urls[i], record)
+            else:
+                failed += 1
+            data[i] = record or {
                 'doc_id': f'error_{i:04d}',
-                'url': url,
+                'url': urls[i],
                 'title': '',
                 'text': ''
-            })
+            }
+    finally:
+        results.close()
+        journal.close()
     
     # Create DataFrame
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(data, columns=columns)
     
     # Save to CSV
     df.to_csv(output_csv, index=False, encoding='utf-8')
     logger.info(f"Saved {len(df)} documents to {output_csv}")
     
+    # Keep the checkpoint only while URLs are outstanding
+    if failed:
+        logger.info(f"{failed} URLs failed; rerun to retry them ({journal.path} keeps the completed ones)")
+    else:
+        journal.discard()
+    
     return df
 
 
+# ============================================================================
+# STREAMING SCRAPE PIPELINE
+# ============================================================================
+
+# Scraped pages per Parquet part file, and the size of the queues between
+# pipeline stages. Together these bound memory, whatever the number of URLs.
+PARQUET_BATCH_SIZE = 500
+QUEUE_SIZE = 64
+
+# HTML parsing is CPU bound, so extraction gets one process per core by default
+EXTRACT_WORKERS = os.cpu_count() or 1
+
+_STAGE_DONE = object()
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event):
+    """Put onto a bounded queue, giving up if the pipeline has been stopped."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(q: queue.Queue, stop: threading.Event) -> Any:
+    """Take from a queue, returning the end-of-stage marker if the pipeline has been stopped."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _STAGE_DONE
+
+
+def _report_throughput(stage: str, pages: int, n_bytes: int, seconds: float):
+    """Log a pipeline stage's throughput in pages/s and MB/s."""
+    seconds = max(seconds, 1e-9)
+    logger.info(f"{stage}: {pages:,} pages, {n_bytes / 2**20:.1f} MB in {seconds:.1f}s "
+                f"({pages / seconds:.1f} pages/s, {n_bytes / 2**20 / seconds:.2f} MB/s)")
+
+
+def _scrape_pipeline(urls: List[str],
+                     indices: List[int],
+                     cache: Optional[PageCache] = None,
+                     extractor: Optional[str] = None,
+                     max_workers: int = DEFAULT_WORKERS,
+                     extract_workers: Optional[int] = None,
+                     delay: float = 1.0,
+                     burst: int = 1,
+                     queue_size: int = QUEUE_SIZE,
+                     stats: Optional[Dict[str, float]] = None) -> Iterator[Tuple[int, Optional[Dict[str, str]]]]:
+    """
+    Fetch and extract urls[i] for each i in indices, as a two-stage pipeline.
+
+    Fetch threads (fetch_concurrently: pooled, rate limited per host) only
+    download. They pass the raw bytes over a bounded queue to the extract
+    stage, which farms parsing out to a process pool of `extract_workers`.
+    Network I/O and CPU-bound parsing therefore overlap instead of taking
+    turns, and each stage can be sized on its own. With extract_workers=1,
+    pages are extracted in a single background thread instead.
+
+    Each stage's throughput (pages/s, MB/s) is logged at the end and added
+    to `stats` (fetched, fetch_mb, fetch_seconds, extracted, extract_seconds).
+
+    Returns:
+        Iterator of (index, record) in completion order; record is None for
+        pages that failed to fetch or extract
+    """
+    extract_workers = extract_workers or EXTRACT_WORKERS
+    stats = {} if stats is None else stats
+    pages: queue.Queue = queue.Queue(maxsize=queue_size)
+    records: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    counts = {'fetched': 0, 'fetch_bytes': 0, 'fetch_seconds': 0.0,
+              'extracted': 0, 'extract_bytes': 0, 'extract_seconds': 0.0}
+
+    def fetch(j: int, url: str, session: requests.Session) -> Optional[Tuple[bytes, Optional[str]]]:
+        try:
+            response = _fetch_page(url, session, cache)
+            has_charset = 'charset' in response.headers.get('Content-Type', '').lower()
+            return response.content, response.encoding if has_charset else None
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {e}")
+            return None
+
+    def fetch_stage():
+        start = time.perf_counter()
+        try:
+            for j, page in fetch_concurrently([urls[i] for i in indices], fetch,
+                                              max_workers=max_workers, delay=delay, burst=burst):
+                if stop.is_set():
+                    break
+                if page is not None:
+                    counts['fetched'] += 1
+                    counts['fetch_bytes'] += len(page[0])
+                _put(pages, (indices[j], page), stop)
+        except Exception as e:
+            logger.error(f"Fetch stage failed: {e}")
+        finally:
+            counts['fetch_seconds'] = time.perf_counter() - start
+            _put(pages, _STAGE_DONE, stop)
+
+    def emit(i: int, record: Optional[Dict[str, str]], n_bytes: int):
+        if record is not None:
+            counts['extracted'] += 1
+            counts['extract_bytes'] += n_bytes
+        _put(records, (i, record), stop)
+
+    def extract_stage():
+        start = time.perf_counter()
+        executor = None
+        pending = {}
+        try:
+            if extract_workers > 1:
+                executor = ProcessPoolExecutor(max_workers=extract_workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+            while True:
+                item = _get(pages, stop)
+                if item is _STAGE_DONE:
+                    break
+                i, page = item
+                if page is None:
+                    _put(records, (i, None), stop)
+                elif executor is None:
+                    emit(i, _extract_page(i, urls[i], page[0], page[1], extractor), len(page[0]))
+                else:
+                    future = executor.submit(_extract_page, i, urls[i], page[0], page[1], extractor)
+                    pending[future] = (i, len(page[0]))
+                    # Bounded hand-off: wait for a result before taking more pages
+                    if len(pending) >= 2 * extract_workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            i, n_bytes = pending.pop(future)
+                            emit(i, future.result(), n_bytes)
+            for future in list(pending):
+                i, n_bytes = pending.pop(future)
+                emit(i, future.result(), n_bytes)
+        except Exception as e:
+            logger.error(f"Extract stage failed: {e}")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            counts['extract_seconds'] = time.perf_counter() - start
+            _put(records, _STAGE_DONE, stop)
+
+    threads = [threading.Thread(target=fetch_stage, daemon=True),
+               threading.Thread(target=extract_stage, daemon=True)]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            item = records.get()
+            if item is _STAGE_DONE:
+                break
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        _report_throughput('Fetch', counts['fetched'], counts['fetch_bytes'], counts['fetch_seconds'])
+        _report_throughput(f'Extract ({extract_workers} workers)', counts['extracted'],
+                           counts['extract_bytes'], counts['extract_seconds'])
+        stats.update({
+            'fetched': counts['fetched'],
+            'fetch_mb': counts['fetch_bytes'] / 2**20,
+            'fetch_seconds': counts['fetch_seconds'],
+            'extracted': counts['extracted'],
+            'extract_seconds': counts['extract_seconds'],
+        })
+
+
+def _write_part(records: List[Dict[str, str]], output_dir: Path, number: int) -> Path:
+    """Write one batch of scraped pages as part-NNNNN.parquet (atomically)."""
+    path = output_dir / f'part-{number:05d}.parquet'
+    tmp_path = path.with_suffix('.parquet.tmp')
+    pl.DataFrame(records, schema={'doc_id': pl.String, 'url': pl.String,
+                                  'title': pl.String, 'text': pl.String}).write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def scrape_urls_to_parquet(urls: List[str], output_dir: str,
+                           delay: float = 1.0,
+                           max_workers: int = DEFAULT_WORKERS,
+                           burst: int = 1,
+                           batch_size: int = PARQUET_BATCH_SIZE,
+                           queue_size: int = QUEUE_SIZE,
+                           cache_dir: Optional[str] = None,
+                           resume: bool = True,
+                           extractor: Optional[str] = None,
+                           extract_workers: Optional[int] = None) -> Dict[str, float]:
+    """
+    Scrape URLs into a folder of Parquet part files with bounded memory.
+
+    A three-stage pipeline, connected by bounded queues:
+    fetch (thread pool, rate limited per host) -> extract (process pool,
+    text and title) -> sink (appends batches of `batch_size` pages as
+    part-NNNNN.parquet).
+    When a stage falls behind, the stages feeding it block, so peak memory
+    depends on the batch and queue sizes, not on the number of URLs. The
+    folder can be built into a corpus directly with build_corpus_from_scraped_parquet.
+
+    Part files are written atomically and act as the checkpoint: with
+    `resume`, URLs already present in the folder are skipped. Failed URLs
+    are logged and left out, so a rerun retries them.
+
+    Arguments:
+        urls: List of URLs to scrape
+        output_dir: Folder for the Parquet part files
+        delay: Delay in seconds between requests to the same host
+        max_workers: Maximum number of requests in flight at once
+        burst: Requests a host may receive back to back before `delay` applies
+        batch_size: Pages per Parquet part file
+        queue_size: Capacity of each queue between stages
+        cache_dir: Directory for the on-disk page cache (default: no cache)
+        resume: Skip URLs already in output_dir (False clears it first)
+        extractor: Extraction backend, 'lxml' or 'bs4' (default: lxml if installed)
+        extract_workers: Extraction processes (default: os.cpu_count(); 1 extracts in a thread)
+
+    Returns:
+        Dictionary of counts (scraped, failed, skipped, parts) and stage
+        throughput (fetched, fetch_mb, fetch_seconds, extracted, extract_seconds)
+
+    Example:
+        >>> stats = scrape_urls_to_parquet(urls, 'scraped/', max_workers=16)
+        >>> corpus = build_corpus_from_scraped_parquet('scraped/', 'My Corpus', 'Web pages', './corpora/')
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    parts = sorted(output_path.glob('part-*.parquet'))
+    if not resume:
+        for part in parts:
+            part.unlink()
+        parts = []
+
+    done_urls = set()
+    if parts:
+        done_urls = set(pl.scan_parquet(parts).select('url').collect().get_column('url').to_list())
+    todo = [i for i, url in enumerate(urls) if url not in done_urls]
+    stats: Dict[str, float] = {'scraped': 0, 'failed': 0, 'skipped': len(urls) - len(todo), 'parts': 0}
+    if stats['skipped']:
+        logger.info(f"Resuming: {stats['skipped']} URLs already in {output_dir}")
+    next_part = int(parts[-1].stem.split('-')[1]) + 1 if parts else 0
+
+    cache = PageCache(cache_dir) if cache_dir else None
+    results = _scrape_pipeline(urls, todo, cache=cache, extractor=extractor,
+                               max_workers=max_workers, extract_workers=extract_workers,
+                               delay=delay, burst=burst, queue_size=queue_size, stats=stats)
+
+    # Sink: runs in this thread and flushes a part file every batch_size pages
+    batch: List[Dict[str, str]] = []
+    try:
+        for _, record in results:
+            if record is None:
+                stats['failed'] += 1
+                continue
+            batch.append(record)
+            stats['scraped'] += 1
+            if len(batch) >= batch_size:
+                _write_part(batch, output_path, next_part)
+                next_part += 1
+                stats['parts'] += 1
+                batch = []
+                logger.info(f"Scraped {stats['scraped'] + stats['failed']}/{len(todo)} URLs")
+        if batch:
+            _write_part(batch, output_path, next_part)
+            stats['parts'] += 1
+    finally:
+        results.close()
+
+    logger.info(f"Saved {stats['scraped']} pages in {stats['parts']} part files to {output_dir} "
+                f"({stats['failed']} failed, {stats['skipped']} skipped)")
+    return stats
+
+
 def build_corpus_from_texts(text_dir: str, corpus_name: str, 
                            corpus_description: str, save_path: str):
     """
@@ -305,21 +1119,45 @@ def build_corpus_from_texts(text_dir: str, corpus_name: str,
 
 
 def build_corpus_from_csv(csv_file: str, corpus_name: str,
-                         corpus_description: str, save_path: str):
+                         corpus_description: str, save_path: str,
+                         dedupe: Optional[str] = None,
+                         dedupe_threshold: float = 0.8):
     """
     Build a Conc corpus from CSV file.
     
+    With dedupe, near-duplicate pages (the same article under several URLs)
+    are found with MinHash/LSH before the build; metadata.parquet records
+    doc_id, url, title, dup_cluster and is_duplicate for every document.
+    
     Arguments:
         csv_file: Path to CSV file with 'doc_id' and 'text' columns
         corpus_name: Name for the corpus
         corpus_description: Description of the corpus
         save_path: Directory where to save the .corpus
+        dedupe: None, 'flag' (record clusters) or 'drop' (keep the first page of each cluster)
+        dedupe_threshold: Jaccard similarity at which pages are near-duplicates
     """
     try:
         from conc.corpus import Corpus
         
         logger.info(f"Building corpus '{corpus_name}' from {csv_file}")
         
+        if dedupe:
+            try:
+                from .corpus_build import build_corpus_from_frame
+            except ImportError:
+                from corpus_build import build_corpus_from_frame
+            
+            corpus = build_corpus_from_frame(pl.read_csv(csv_file), save_path, corpus_name,
+                                             corpus_description, text_column='text',
+                                             metadata_columns=['doc_id', 'url', 'title'],
+                                             dedupe=dedupe, dedupe_threshold=dedupe_threshold)
+            
+            logger.info(f"Corpus built successfully!")
+            logger.info(f"Total tokens: {corpus.token_count:,}")
+            logger.info(f"Documents: {corpus.document_count}")
+            return corpus
+        
         corpus = Corpus(
             name=corpus_name,
             description=corpus_description
@@ -340,6 +1178,46 @@ def build_corpus_from_csv(csv_file: str, corpus_name: str,
         return None
 
 
+def build_corpus_from_scraped_parquet(parquet_dir: str, corpus_name: str,
+                                      corpus_description: str, save_path: str):
+    """
+    Build a Conc corpus from the Parquet part files written by scrape_urls_to_parquet.
+    
+    Texts are streamed one part file at a time; doc_id, url and title are
+    kept in the corpus metadata.
+    
+    Arguments:
+        parquet_dir: Folder with part-NNNNN.parquet files
+        corpus_name: Name for the corpus
+        corpus_description: Description of the corpus
+        save_path: Directory where to save the .corpus
+    """
+    try:
+        try:
+            from .corpus_build import build_corpus_from_parquet
+        except ImportError:
+            from corpus_build import build_corpus_from_parquet
+        
+        logger.info(f"Building corpus '{corpus_name}' from {parquet_dir}")
+        
+        corpus = build_corpus_from_parquet(parquet_dir, save_path, corpus_name, corpus_description,
+                                           text_column='text',
+                                           metadata_columns=['doc_id', 'url', 'title'])
+        
+        logger.info(f"Corpus built successfully!")
+        logger.info(f"Total tokens: {corpus.token_count:,}")
+        logger.info(f"Documents: {corpus.document_count}")
+        
+        return corpus
+        
+    except ImportError:
+        logger.error("conc library not installed. Install with: pip install conc")
+        return None
+    except Exception as e:
+        logger.error(f"Error building corpus: {e}")
+        return None
+
+
 def main():
     """Command line interface"""
     parser = argparse.ArgumentParser(
@@ -365,11 +1243,31 @@ Examples:
     parser.add_argument('--urls-file', type=str, help='File with URLs (one per line)')
     parser.add_argument('--output', type=str, required=True, help='Output directory for text files')
     parser.add_argument('--csv', type=str, help='Save to CSV instead of text files')
+    parser.add_argument('--parquet', type=str,
+                       help='Stream pages into Parquet part files in this folder instead of text files')
+    parser.add_argument('--batch-size', type=int, default=PARQUET_BATCH_SIZE,
+                       help=f'Pages per Parquet part file (default: {PARQUET_BATCH_SIZE})')
     parser.add_argument('--selector', type=str, help='CSS selector for content extraction')
     parser.add_argument('--selector-type', type=str, choices=['tag', 'class', 'id'], 
                        default='tag', help='Type of selector')
     parser.add_argument('--delay', type=float, default=1.0, 
-                       help='Delay between requests in seconds (default: 1.0)')
+                       help='Delay between requests to the same host in seconds (default: 1.0)')
+    parser.add_argument('--burst', type=int, default=1,
+                       help='Requests a host may receive back to back (default: 1)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help=f'Maximum concurrent requests across all hosts (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--extractor', type=str, choices=sorted(EXTRACTORS), default=DEFAULT_EXTRACTOR,
+                       help=f'HTML text extraction backend (default: {DEFAULT_EXTRACTOR})')
+    parser.add_argument('--extract-workers', type=int, default=EXTRACT_WORKERS,
+                       help=f'HTML extraction processes for --csv/--parquet (default: {EXTRACT_WORKERS})')
+    parser.add_argument('--cache-dir', type=str,
+                       help='Directory for an on-disk HTTP cache (revalidated with ETag/Last-Modified)')
+    parser.add_argument('--no-resume', action='store_true',
+                       help='Ignore the checkpoint journal and rescrape every URL')
+    parser.add_argument('--dedupe', type=str, choices=['flag', 'drop'],
+                       help='Flag or drop near-duplicate pages when building a corpus from --csv')
+    parser.add_argument('--dedupe-threshold', type=float, default=0.8,
+                       help='Jaccard similarity at which pages are near-duplicates (default: 0.8)')
     parser.add_argument('--build-corpus', action='store_true', 
                        help='Build a Conc corpus after scraping')
     parser.add_argument('--name', type=str, default='Web Corpus', 
@@ -391,30 +1289,69 @@ Examples:
     
     if not urls:
         parser.error("Must provide either --url or --urls-file")
+    if args.dedupe and not args.csv:
+        parser.error("--dedupe is only supported with --csv")
     
     logger.info(f"Found {len(urls)} URLs to scrape")
     
-    # Scrape to CSV or text files
-    if args.csv:
-        df = scrape_urls_to_csv(urls, args.csv, delay=args.delay)
+    # Scrape to Parquet, CSV or text files
+    if args.parquet:
+        scrape_urls_to_parquet(urls, args.parquet, delay=args.delay,
+                               max_workers=args.workers, burst=args.burst,
+                               batch_size=args.batch_size, cache_dir=args.cache_dir,
+                               resume=not args.no_resume, extractor=args.extractor,
+                               extract_workers=args.extract_workers)
         
         if args.build_corpus:
-            build_corpus_from_csv(args.csv, args.name, args.description, args.corpus_path)
+            build_corpus_from_scraped_parquet(args.parquet, args.name, args.description, args.corpus_path)
+    elif args.csv:
+        df = scrape_urls_to_csv(urls, args.csv, delay=args.delay,
+                                max_workers=args.workers, burst=args.burst,
+                                cache_dir=args.cache_dir, resume=not args.no_resume,
+                                extractor=args.extractor, extract_workers=args.extract_workers)
+        
+        if args.build_corpus:
+            build_corpus_from_csv(args.csv, args.name, args.description, args.corpus_path,
+                                  dedupe=args.dedupe, dedupe_threshold=args.dedupe_threshold)
     else:
         # Scrape to individual text files
         os.makedirs(args.output, exist_ok=True)
+        cache = PageCache(args.cache_dir) if args.cache_dir else None
+        journal = ScrapeJournal(os.path.join(args.output, '.scrape_journal.jsonl'),
+                                resume=not args.no_resume)
+        todo = [i for i, url in enumerate(urls) if url not in journal]
+        if len(todo) < len(urls):
+            logger.info(f"Resuming: {len(urls) - len(todo)} URLs already scraped")
         
-        for i, url in enumerate(urls):
-            output_file = os.path.join(args.output, f"doc_{i:04d}.txt")
+        def scrape_to_file(j: int, url: str, session: requests.Session) -> Optional[str]:
+            output_file = os.path.join(args.output, f"doc_{todo[j]:04d}.txt")
             
             if args.selector:
-                scrape_with_css_selector(url, output_file, args.selector, args.selector_type)
+                text = scrape_with_css_selector(url, output_file, args.selector,
+                                                args.selector_type, session=session, cache=cache,
+                                                extractor=args.extractor)
             else:
-                scrape_webpage_to_text(url, output_file)
-            
-            # Be polite
-            if i < len(urls) - 1:
-                time.sleep(args.delay)
+                text = scrape_webpage_to_text(url, output_file, session=session, cache=cache,
+                                              extractor=args.extractor)
+            if text is not None:
+                journal.record(url, {'file': output_file})
+            return text
+        
+        # Be polite: requests run concurrently but are rate limited per host
+        failed = 0
+        try:
+            for _, text in fetch_concurrently([urls[i] for i in todo], scrape_to_file,
+                                              max_workers=args.workers,
+                                              delay=args.delay, burst=args.burst):
+                failed += text is None
+        finally:
+            journal.close()
+        
+        # Keep the checkpoint only while URLs are outstanding
+        if failed:
+            logger.info(f"{failed} URLs failed; rerun to retry them ({journal.path} keeps the completed ones)")
+        else:
+            journal.discard()
         
         if args.build_corpus:
             build_corpus_from_texts(args.output, args.name, args.description, args.corpus_path)
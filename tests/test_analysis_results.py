@@ -0,0 +1,119 @@
+"""
+Tests that the analysis functions in scripts/analyze_corpus.py (which work
+on the corpus files directly) give the same results as Conc itself, on a
+tiny corpus built with scripts/corpus_build.py.
+
+Run with: python -m pytest tests/
+"""
+
+import sys
+from pathlib import Path
+
+import polars as pl
+import pytest
+from conc.conc import Conc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from analyze_corpus import count_ngrams, get_collocations, get_concordance, get_frequency_table, get_keywords
+from corpus_build import build_corpus_from_frame
+
+TARGET_TEXTS = [
+    "Climate change is a serious problem. The government said climate change policy would change.",
+    "The government announced a new climate policy on Monday, and farmers said the policy was unfair.",
+    "New Zealand farmers worry about climate change. Farmers said the government must act on climate change.",
+    "The climate change minister met farmers in New Zealand; the minister said emissions must fall.",
+    "Emissions from farming are a large share of New Zealand emissions, the minister said.",
+    "The government said emissions would fall, but critics said the climate policy was weak.",
+]
+
+REFERENCE_TEXTS = [
+    "The council said the new road would open on Monday.",
+    "Residents said the road was too busy, and the council must act.",
+    "The minister said the budget would fall short of what the council asked for.",
+    "Critics said the council policy on roads was weak and unfair to residents.",
+]
+
+PAGE_SIZE = 10000
+
+
+@pytest.fixture(scope='module')
+def corpora(tmp_path_factory):
+    save_path = str(tmp_path_factory.mktemp('corpora'))
+    target = build_corpus_from_frame(pl.DataFrame({'text': TARGET_TEXTS}), save_path, 'Target', workers=1)
+    reference = build_corpus_from_frame(pl.DataFrame({'text': REFERENCE_TEXTS}), save_path, 'Reference', workers=1)
+    return target, reference
+
+
+def _rows(df, key, columns) -> dict:
+    """Map key -> tuple of columns, for comparing result tables whose ties may be ordered differently."""
+    if isinstance(df, pl.DataFrame):
+        df = df.to_pandas()
+    return {row[key]: tuple(row[c] for c in columns) for row in df.to_dict('records')}
+
+
+def _assert_same_rows(ours: dict, expected: dict):
+    assert ours.keys() == expected.keys()
+    for key, values in ours.items():
+        assert values == pytest.approx(expected[key]), key
+
+
+def test_frequencies_match_conc(corpora):
+    target, _ = corpora
+    ours = get_frequency_table(target, normalize_by=10000)
+    expected = Conc(target).frequencies(normalize_by=10000, page_size=PAGE_SIZE).to_frame()
+
+    assert len(ours) == len(expected)
+    _assert_same_rows(_rows(ours, 'token', ['frequency', 'normalized_frequency']),
+                      _rows(expected, 'token', ['frequency', 'normalized_frequency']))
+
+
+@pytest.mark.parametrize('n', [2, 3])
+def test_ngrams_match_conc(corpora, n):
+    target, _ = corpora
+    ours = count_ngrams(target, n_values=[n], min_freq=1, normalize_by=10000)[n]
+    expected = Conc(target).ngram_frequencies(ngram_length=n, case_sensitive=True, normalize_by=10000,
+                                              page_size=PAGE_SIZE).to_frame()
+
+    assert len(ours) == len(expected)
+    _assert_same_rows(_rows(ours, 'ngram', ['frequency', 'normalized_frequency']),
+                      _rows(expected, 'ngram', ['frequency', 'normalized_frequency']))
+
+
+def test_keywords_match_conc(corpora):
+    target, reference = corpora
+    ours = get_keywords(target, reference, min_freq=1, normalize_by=10000)
+    analysis = Conc(target)
+    analysis.set_reference_corpus(reference)
+    expected = analysis.keywords(min_frequency=1, normalize_by=10000, page_size=PAGE_SIZE).to_frame()
+
+    assert len(ours) == len(expected)
+    _assert_same_rows(
+        _rows(ours, 'keyword', ['freq_target', 'freq_reference', 'relative_risk', 'log_ratio', 'log_likelihood']),
+        _rows(expected, 'token', ['frequency', 'frequency_reference', 'relative_risk', 'log_ratio', 'log_likelihood']))
+
+
+@pytest.mark.parametrize('node', ['climate', 'said'])
+def test_collocations_match_conc(corpora, node):
+    target, _ = corpora
+    ours = get_collocations(target, node, measure='MI', window=5, min_freq=1)
+    expected = Conc(target).collocates(node, effect_size_measure='mutual_information', context_length=5,
+                                       min_collocate_frequency=1, page_size=PAGE_SIZE).to_frame()
+
+    assert len(ours) == len(expected)
+    _assert_same_rows(
+        _rows(ours, 'collocate', ['collocate_frequency', 'total_frequency', 'mutual_information', 'log_likelihood']),
+        _rows(expected, 'token', ['collocate_frequency', 'frequency', 'mutual_information', 'log_likelihood']))
+
+
+@pytest.mark.parametrize('query', ['climate', 'farmers'])
+def test_concordance_matches_conc(corpora, query):
+    target, _ = corpora
+    ours = get_concordance(target, query, context_length=3)
+    expected = Conc(target).concordance(query, context_length=3, page_size=PAGE_SIZE).to_frame()
+
+    assert len(ours) == len(expected) > 0
+    assert ours['document'].is_monotonic_increasing
+    lines = {(r['document'], r['left_context'].strip(), r['node'], r['right_context'].strip())
+             for r in ours.to_dict('records')}
+    expected_lines = {(r['doc_id'], r['left'].strip(), r['node'], r['right'].strip()) for r in expected.to_dicts()}
+    assert lines == expected_lines
@@ -0,0 +1,178 @@
+"""
+Tests for scripts/corpus_build.py and scripts/corpus_dedupe.py on a tiny
+corpus: sharded builds match a serial build, appending matches a full
+rebuild, shared vocabularies give the same token ids, and near-duplicate
+documents are clustered.
+
+Run with: python -m pytest tests/
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from corpus_build import append_to_corpus, build_corpora_from_frames, build_corpus_from_frame
+from corpus_dedupe import ALL_PAIRS_BUCKET_SIZE, _bucket_pairs, _components, find_near_duplicates
+from corpus_store import shared_vocab_id
+
+TEXTS = [
+    "Climate change is a serious problem. The government said climate change policy would change.",
+    "The government announced a new climate policy on Monday, and farmers said the policy was unfair.",
+    "New Zealand farmers worry about climate change. Farmers said the government must act on climate change.",
+    "The climate change minister met farmers in New Zealand; the minister said emissions must fall.",
+    "Emissions from farming are a large share of New Zealand emissions, the minister said.",
+    "The government said emissions would fall, but critics said the climate policy was weak.",
+]
+
+CORPUS_FILES = ['tokens', 'vocab', 'puncts', 'spaces', 'metadata']
+
+
+def _documents() -> pl.DataFrame:
+    return pl.DataFrame({'text': TEXTS, 'id': list(range(len(TEXTS)))})
+
+
+@pytest.fixture
+def documents() -> pl.DataFrame:
+    return _documents()
+
+
+@pytest.fixture(scope='module')
+def serial_corpus(tmp_path_factory):
+    return build_corpus_from_frame(_documents(), str(tmp_path_factory.mktemp('serial')), 'Tiny',
+                                   metadata_columns=['id'], workers=1)
+
+
+def _read(corpus, file: str) -> pl.DataFrame:
+    return pl.read_parquet(f'{corpus.corpus_path}/{file}.parquet')
+
+
+def _corpus_json(corpus) -> dict:
+    with open(f'{corpus.corpus_path}/corpus.json') as f:
+        info = json.load(f)
+    info.pop('date_created')
+    return info
+
+
+def _token_strings(corpus) -> pl.DataFrame:
+    """tokens.parquet with token ids replaced by their strings, so corpora with different ids can be compared."""
+    vocab = _read(corpus, 'vocab').select('token_id', 'token')
+    tokens = _read(corpus, 'tokens').with_row_index('position')
+    for column in ('orth_index', 'lower_index'):
+        tokens = tokens.join(vocab.rename({'token_id': column, 'token': f'{column}_token'}), on=column, how='left')
+    return tokens.sort('position').select('orth_index_token', 'lower_index_token', 'token2doc_index', 'has_spaces')
+
+
+def _type_frequencies(corpus) -> pl.DataFrame:
+    return _read(corpus, 'vocab').select('token', 'frequency_lower', 'frequency_orth', 'is_punct', 'is_space').sort('token')
+
+
+def test_sharded_build_matches_serial_build(serial_corpus, documents, tmp_path):
+    sharded = build_corpus_from_frame(documents, str(tmp_path), 'Tiny', metadata_columns=['id'],
+                                      workers=2, shard_size=2)
+
+    for file in CORPUS_FILES:
+        assert _read(sharded, file).equals(_read(serial_corpus, file)), file
+    assert _corpus_json(sharded) == _corpus_json(serial_corpus)
+
+
+def test_append_matches_full_rebuild(serial_corpus, documents, tmp_path):
+    partial = build_corpus_from_frame(documents.head(4), str(tmp_path), 'Tiny', metadata_columns=['id'], workers=1)
+    appended = append_to_corpus(partial.corpus_path, documents.tail(2), metadata_columns=['id'])
+
+    # Token ids differ (types new to the appended documents get ids at the end), so compare strings
+    assert _token_strings(appended).equals(_token_strings(serial_corpus))
+    assert _type_frequencies(appended).equals(_type_frequencies(serial_corpus))
+    for file in ('puncts', 'spaces'):
+        assert _read(appended, file).equals(_read(serial_corpus, file)), file
+    # source_row numbers rows within each appended frame
+    assert _read(appended, 'metadata').drop('source_row').equals(_read(serial_corpus, 'metadata').drop('source_row'))
+
+    appended_info, serial_info = _corpus_json(appended), _corpus_json(serial_corpus)
+    for key in ('document_count', 'token_count', 'word_token_count', 'unique_tokens', 'unique_word_tokens'):
+        assert appended_info[key] == serial_info[key], key
+
+
+def test_shared_vocab_gives_same_token_ids(documents, tmp_path):
+    frames = {'First': documents.head(3), 'Second': documents.tail(3)}
+    corpora = build_corpora_from_frames(frames, str(tmp_path / 'shared'), workers=1)
+    separate = {name: build_corpus_from_frame(df, str(tmp_path / 'separate'), name, workers=1)
+                for name, df in frames.items()}
+
+    first, second = corpora['First'], corpora['Second']
+    assert shared_vocab_id(first.corpus_path) is not None
+    assert shared_vocab_id(first.corpus_path) == shared_vocab_id(second.corpus_path)
+    assert shared_vocab_id(separate['First'].corpus_path) is None
+
+    ids = _read(first, 'vocab').select('token_id', 'token').sort('token_id')
+    assert ids.equals(_read(second, 'vocab').select('token_id', 'token').sort('token_id'))
+    assert ids.get_column('token_id').is_unique().all()
+
+    # Each corpus keeps its own text and frequencies
+    for name, corpus in corpora.items():
+        assert _token_strings(corpus).equals(_token_strings(separate[name])), name
+        occurring = pl.col('frequency_orth').is_not_null()
+        assert _type_frequencies(corpus).filter(occurring).equals(
+            _type_frequencies(separate[name]).filter(occurring)), name
+
+
+# ============================================================================
+# NEAR-DUPLICATES
+# ============================================================================
+
+def _article(rng: random.Random, length: int = 80) -> str:
+    words = ['council', 'road', 'budget', 'minister', 'farmers', 'climate', 'emissions', 'policy', 'said',
+             'would', 'new', 'plan', 'water', 'housing', 'report', 'week', 'local', 'government', 'costs', 'rates']
+    return ' '.join(rng.choice(words) for _ in range(length))
+
+
+@pytest.fixture
+def articles() -> list:
+    rng = random.Random(4)
+    first, second, third = _article(rng), _article(rng), _article(rng)
+    edited = first.rsplit(' ', 1)[0] + ' yesterday'
+    return [first, second, first, third, edited, second, '']
+
+
+def test_near_duplicates_are_clustered_with_first_document(articles):
+    clusters = find_near_duplicates(pl.Series(articles))
+
+    assert clusters['dup_cluster'].to_list() == [0, 1, 0, 3, 0, 1, 6]
+    assert clusters['is_duplicate'].to_list() == [False, False, True, False, True, True, False]
+
+
+def test_build_flags_and_drops_near_duplicates(articles, tmp_path):
+    documents = pl.DataFrame({'text': articles[:6]})
+
+    flagged = build_corpus_from_frame(documents, str(tmp_path), 'Flagged', dedupe='flag', workers=1)
+    metadata = _read(flagged, 'metadata')
+    assert metadata['dup_cluster'].to_list() == [0, 1, 0, 3, 0, 1]
+    assert metadata['is_duplicate'].to_list() == [False, False, True, False, True, True]
+
+    dropped = build_corpus_from_frame(documents, str(tmp_path), 'Dropped', dedupe='drop', workers=1)
+    assert _read(dropped, 'metadata')['source_row'].to_list() == [0, 1, 3]
+    assert _corpus_json(dropped)['document_count'] == 3
+
+
+def test_small_buckets_pair_every_document():
+    bucket = np.array([5, 7, 5, 9, 5, 7], dtype=np.uint64)
+
+    pairs = {tuple(pair) for pair in _bucket_pairs(bucket).tolist()}
+
+    assert pairs == {(0, 2), (0, 4), (2, 4), (1, 5)}
+
+
+def test_large_buckets_stay_connected():
+    size = ALL_PAIRS_BUCKET_SIZE * 2
+    bucket = np.tile(np.array([3, 8], dtype=np.uint64), size)
+
+    pairs = _bucket_pairs(bucket)
+    labels = _components(len(bucket), pairs[:, 0], pairs[:, 1])
+
+    assert len(pairs) < size * (size - 1)
+    assert labels.tolist() == [i % 2 for i in range(len(bucket))]
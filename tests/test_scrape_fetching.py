@@ -0,0 +1,145 @@
+"""
+Tests for polite concurrent fetching, conditional revalidation and resumable
+scrapes in scripts/scrape_webpages_to_corpus.py, run against local
+http.server stand-ins (one per port, so each port is a separate host).
+
+Run with: python -m pytest tests/
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from scrape_webpages_to_corpus import PageCache, create_session, fetch_concurrently, scrape_urls_to_csv
+
+ETAG = '"v1"'
+PAGE = b'<html><head><title>Test page</title></head><body><p>Some page text.</p></body></html>'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves PAGE with an ETag, answers If-None-Match with 304, and fails /flaky once."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append({
+                'path': self.path,
+                'time': time.monotonic(),
+                'if_none_match': self.headers.get('If-None-Match'),
+            })
+            hits = sum(1 for r in server.requests if r['path'] == self.path)
+
+        if self.path == '/flaky' and hits == 1:
+            self.send_response(500)
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.lock = threading.Lock()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def servers():
+    running = [_start_server(), _start_server()]
+    yield running
+    for server in running:
+        server.shutdown()
+        server.server_close()
+
+
+def test_requests_to_each_host_are_spaced_by_delay(servers):
+    delay = 0.3
+    urls = [f'{server.url}/page/{i}' for server in servers for i in range(4)]
+
+    start = time.monotonic()
+    results = dict(fetch_concurrently(urls, lambda i, url, session: session.get(url, timeout=5).status_code,
+                                      max_workers=4, delay=delay, burst=1))
+    elapsed = time.monotonic() - start
+
+    assert sorted(results) == list(range(len(urls)))
+    assert set(results.values()) == {200}
+    for server in servers:
+        times = sorted(r['time'] for r in server.requests)
+        assert len(times) == 4
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert min(gaps) >= delay * 0.9
+    # Hosts are limited independently, so the two hosts are fetched in parallel
+    first_requests = [min(r['time'] for r in server.requests) for server in servers]
+    assert abs(first_requests[0] - first_requests[1]) < delay / 2
+    assert elapsed < 2 * 3 * delay
+
+
+def test_cached_page_is_revalidated_with_if_none_match(servers, tmp_path):
+    server = servers[0]
+    url = f'{server.url}/page/cached'
+    cache = PageCache(str(tmp_path / 'cache'))
+    session = create_session(1)
+
+    first = cache.fetch(url, session)
+    second = cache.fetch(url, session)
+
+    assert [r['if_none_match'] for r in server.requests] == [None, ETAG]
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.status_code == 200
+    assert second.content == first.content == PAGE
+
+
+def test_rerun_skips_completed_urls_and_retries_failed_ones(servers, tmp_path):
+    server = servers[0]
+    urls = [f'{server.url}/page/ok', f'{server.url}/flaky']
+    output_csv = str(tmp_path / 'scraped.csv')
+
+    first = scrape_urls_to_csv(urls, output_csv, delay=0, max_workers=2, extract_workers=1)
+    assert first['text'].tolist() == ['Test page Some page text.', '']
+    assert first['doc_id'].iloc[1].startswith('error_')
+
+    assert Path(f'{output_csv}.journal.jsonl').exists()
+
+    second = scrape_urls_to_csv(urls, output_csv, delay=0, max_workers=2, extract_workers=1)
+    assert second['text'].tolist() == ['Test page Some page text.'] * 2
+    paths = [r['path'] for r in server.requests]
+    assert paths.count('/page/ok') == 1
+    assert paths.count('/flaky') == 2
+    assert not Path(f'{output_csv}.journal.jsonl').exists()
+
+
+def test_rerun_after_complete_run_revalidates_cached_pages(servers, tmp_path):
+    server = servers[0]
+    urls = [f'{server.url}/page/a', f'{server.url}/page/b']
+    output_csv = str(tmp_path / 'scraped.csv')
+    cache_dir = str(tmp_path / 'cache')
+
+    first = scrape_urls_to_csv(urls, output_csv, delay=0, cache_dir=cache_dir, extract_workers=1)
+    assert not Path(f'{output_csv}.journal.jsonl').exists()
+
+    second = scrape_urls_to_csv(urls, output_csv, delay=0, cache_dir=cache_dir, extract_workers=1)
+    assert second.equals(first)
+    revalidations = [r['path'] for r in server.requests if r['if_none_match'] == ETAG]
+    assert sorted(revalidations) == ['/page/a', '/page/b']